@@ -1,593 +1,35 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-from a2_support import *
+from game_logic import *
 
 import tkinter as tk
 import tkinter.messagebox
-from tkinter import filedialog
-
-import PIL
-from PIL import ImageTk, Image
+import os
 import time
+from collections import deque
 
+from assets import shared_cache
+from chunked_world import WORLD_MOVES
+from fov import FieldOfView
+from game_clock import GameClock
+from level_editor import LevelEditor
+from pathfinding import RouteCache
+from scores import SCORES_FILE, ScoreStore, decode_replay, encode_replay
+from simulation import FixedTimestep
+import tracing
 
-class GameLogic:
-    """
-    GameLogic contains all the game information and how the game should play out. By default,
-    GameLogic should be constructed with ​GameLogic(dungeon_name=”game1.txt”)​.
-    """
-
-    def __init__(self, dungeon_name="game1.txt"):
-        """Constructor of the GameLogic class.
-
-        Parameters:
-            dungeon_name (str): The name of the level.
-        """
-
-        self._dungeon = load_game(dungeon_name)
-        self._dungeon_size = len(self._dungeon)
-
-        # you need to implement the Player class first.
-        self._player = Player(GAME_LEVELS[dungeon_name])
-
-        # you need to implement the init_game_information() method for this.
-        self._game_information = self.init_game_information()
-
-        self._win = False
-
-    def get_positions(self, entity):
-        """ Returns a list of tuples containing all positions of a given Entity
-             type.
-
-        Parameters:
-            entity (str): the id of an entity.
-
-        Returns:
-            )list<tuple<int, int>>): Returns a list of tuples representing the 
-            positions of a given entity id.
-        """
-
-        positions = []
-        for row, line in enumerate(self._dungeon):
-            for col, char in enumerate(line):
-                if char == entity:
-                    positions.append((row, col))
-
-        return positions
-
-    def get_dungeon_size(self) -> int:
-        '''
-        Returns:
-            int: Return the width of the dungeon as an integer.
-        '''
-        return self._dungeon_size
-
-    def init_game_information(self) -> dict:
-        """
-        This method should return a dictionary containing the position and the corresponding Entity as the
-        keys and values respectively. This method also sets the Player’s position. At the start of the
-        game this method should be called to find the position of all entities within the current dungeon.
-
-        Returns:
-            d(dict<tuple<int, int>): Return a dictionary containing the position and the corresponding Entity.
-        """
-        d = {}
-        wall = Wall()
-        door = Door()
-        move_increase = MoveIncrease()
-        key = Key()
-
-        list_player = self.get_positions(PLAYER)
-        self._player.set_position(list_player[0])
-
-        list_key = self.get_positions(KEY)
-        if list_key:
-            d[list_key[0]] = key
-
-        list_door = self.get_positions(DOOR)
-        d[list_door[0]] = door
-
-        list_wall = self.get_positions(WALL)
-        for i in list_wall:
-            d[i] = wall
-
-        list_move_increase = self.get_positions(MOVE_INCREASE)
-        for i in list_move_increase:
-            d[i] = move_increase
-
-        return d
-
-    def get_game_information(self) -> dict:
-        """
-        Returns a dictionary containing the position and the corresponding Entity, as the keys and values, for the
-        current dungeon.
-
-        Returns:
-            d(dict<tuple<int, int>): Return a dictionary containing the position and the corresponding Entity.
-        """
-        d = {}
-        wall = Wall()
-        door = Door()
-        move_increase = MoveIncrease()
-        key = Key()
-
-        list_key = self.get_positions(KEY)
-        if list_key:
-            d[list_key[0]] = key
-
-        list_door = self.get_positions(DOOR)
-        d[list_door[0]] = door
-
-        list_wall = self.get_positions(WALL)
-        for i in list_wall:
-            d[i] = wall
-
-        list_move_increase = self.get_positions(MOVE_INCREASE)
-        for i in list_move_increase:
-            d[i] = move_increase
-
-        return d
-
-    def get_player(self):
-        """
-        This method returns the Player object within the game.
-
-        Returns:
-            Player: Return Player object within the game.
-        """
-        return self._player
-
-    def get_entity(self, position):
-        """
-        Returns an Entity at a given position in the dungeon. Entity in the given direction or if the position is off
-        map then this function should return None
-
-        Parameters:
-            position(tuple<int,int>): Position of the Entity to be returned.
-
-        Returns:
-            Entity or None: Return the Entity in the given direction.
-
-        """
-        d = self.get_game_information()
-        if position in d:
-            return d[position]
-        else:
-            return None
-
-    def get_entity_in_direction(self, direction):
-        """
-        Returns an Entity in the given direction of the Player’s position. If there is no Entity in the given direction
-        or if the direction is off map then this function should return None.
-
-        Parameters:
-            direction(str): Direction of the Player’s position.
-
-        Returns:
-            Entity: Return the Entity at the given direction.
-
-        """
-        new_position = self.new_position(direction)
-        return self.get_entity(new_position)
-
-    def collision_check(self, direction) -> bool:
-        """
-        Returns ​False​ if a player can travel in the given direction, they won’t collide. ​True, they will collide,
-        otherwise
-
-        Parameters:
-            direction(str):The given direction of the player to travel.
-
-        Returns:
-            bool: Return ​False​ if a player can travel in the given direction. ​True, they will collide.
-        """
-        entity = self.get_entity_in_direction(direction)
-        if entity:
-            return not entity.can_collide()
-        else:
-            return False
-
-    def new_position(self, direction) -> tuple:
-        """
-        Returns a tuple of integers that represents the new position given the direction.
-
-        Parameters:
-            direction(str):Given the direction to be updated.
-
-        Returns:
-            new_position(tuple<int,int>): Return the new position given the direction.
-        """
-        dx, dy = DIRECTIONS[direction]
-        x, y = self._player.get_position()
-        new_position = (x + dx, y + dy)
-        return new_position
-
-    def move_player(self, direction) -> None:
-        """
-        Update the Player’s position to place them one position in the given direction.
-
-        Parameters:
-            direction(str): New position of the player.
-        """
-        new_position = self.new_position(direction)
-        self._player.set_position(new_position)
-
-    def check_game_over(self) -> bool:
-        """
-        Return True if the game has been ​lost and False otherwise.
-
-        Returns:
-            bool: Return True if the game has been ​lost and False otherwise.
-        """
-        if self._player.moves_remaining() == 0:
-            return True
-        else:
-            return False
-
-    def set_win(self, win) -> None:
-        """
-        Set the game’s win state to be True or False.
-
-        Parameters:
-            win(bool): The game’s win state to be True or False.
-        """
-        self._win = win
-
-    def won(self) -> bool:
-        """
-        Return game’s win state.
-
-        Returns:
-            bool:Return game’s win state.
-        """
-        return self._win
-
-
-class Entity:
-    """
-    Each Entity has an id, and can either be collided with (two entities can be in the same position)
-    or not (two entities cannot be in the same position.) The collidable attribute should be set to
-    True for an Entity upon creation. Entity should be constructed with Entity().
-    """
-
-    def __init__(self):
-        """
-        Constructor of the Entity class.
-        """
-        self.id = 'Entity'
-        self.collidable = True
-
-    def get_id(self) -> str:
-        """
-        Returns a string that represents the Entity’s ID.
-
-        Returns:
-            self.id(str): Returns a string that represents the Entity’s ID.
-        """
-        return self.id
-
-    def set_collide(self, collidable: bool):
-        """
-        Set the collision state for the Entity to be True
-
-        Parameters:
-            collidable(bool): The collision state for the Entity.
-        """
-        self.collidable = collidable
-
-    def can_collide(self) -> bool:
-        """
-        Returns True if the Entity can be collided with (another Entity can share the position that this one is in)
-        and False otherwise.
-
-        Returns:
-            bool: Returns True if the Entity can be collided with and False otherwise.
-        """
-        return self.collidable
-
-    def __str__(self) -> str:
-        """
-        Returns the string representation of the Entity. e.g. "Entity('Entity')"
-
-        Returns:
-            s(str): Return the string representation of the Entity.
-        """
-        s = "Entity('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
-
-
-class Wall(Entity):
-    """
-    A Wall is a special type of an Entity within the game.
-    The Wall Entity cannot be collided with. Wall should be constructed with Wall().
-    """
-
-    def __init__(self):
-        """
-        Constructor of the Wall class.
-        """
-        self.id = WALL
-        self.collidable = False
-
-    def __str__(self) -> str:
-        """
-        Returns the string representation of the Wall. e.g. "Wall('#')"
-
-        Returns:
-            s(str): Return the string representation of the Wall.
-        """
-        s = "Wall('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
-
-
-class Item(Entity):
-    """
-    An Item is a special type of an Entity within the game. This is an abstract class.
-    By default the Item Entity can be collided with. Item should be constructed with Item().
-    """
-
-    def __str__(self) -> str:
-        """
-        Returns the string representation of the Wall. e.g. "Item('Entity')"
-
-        Returns:
-            s(str): Return the string representation of the Wall.
-        """
-        s = "Item('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
-
-    def on_hit(self, game: GameLogic):
-        """
-        This function should raise the NotImplementedError.
-
-        Parameters:
-            game(GameLogic): The game.
-        """
-        raise NotImplementedError
-
-
-
-class Key(Item):
-    """
-    A Key is a special type of Item within the game.
-    The Key Item can be collided with. Key should be constructed with Key().
-    """
-
-    def __init__(self):
-        """
-        Constructor of the Key class.
-        """
-        self.id = KEY
-        self.collidable = True
-
-    def __str__(self) -> str:
-        """
-        Returns the string representation of the Key. e.g. "Key('K')"
-
-        Returns:
-            s(str): Return the string representation of the Key.
-        """
-        s = "Key('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
 
-    def on_hit(self, game: GameLogic) -> None:
-        """
-        When the player takes the Key the Key should be added to the Player’s inventory. The Key should then be
-        removed from the dungeon once it’s in the Player’s inventory.
-
-        Parameters:
-            game(GameLogic): The game.
-        """
-        player = game.get_player()
-        player.add_item(self)
-        i, j = game.get_positions(KEY)[0]
-        game._dungeon[i][j] = SPACE
-
-
-class MoveIncrease(Item):
+def photo_image(image):
     """
-    MoveIncrease is a special type of Item within the game. The MoveIncrease Item can be collided with. MoveIncrease
-    should be constructed with MoveIncrease(moves=5: int) where moves describe how many extra moves the Player will be
-    granted when they collect this Item, the default value should be 5.
-    """
-
-    def __init__(self, moves=5):
-        """
-        Constructor of the MoveIncrease class.
-
-        Parameters:
-            moves(int): moves describe how many extra moves the Player will be granted when they collect this Item.
-        """
-        self.id = MOVE_INCREASE
-        self.collidable = True
-        self.moves = moves
-
-    def __str__(self) -> str:
-        """
-        Returns the string representation of the MoveIncrease. e.g. "MoveIncrease('M')"
-
-        Returns:
-            s(str): Return the string representation of the MoveIncrease.
-        """
-        s = "MoveIncrease('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
-
-    def on_hit(self, game) -> None:
-        """
-        When the player hits the MoveIncrease (M) item the number of moves for the player increases and the M item is
-        removed from the game. These actions are implemented via the on_hit method. Specifically, extra moves should
-        be granted to the Player and the M item should be removed from the game.
-
-        Parameters:
-            game(GameLogic): The game.
-        """
-        game.get_player().change_move_count(self.moves)
-        i, j = game.get_positions(MOVE_INCREASE)[0]
-        game._dungeon[i][j] = SPACE
+    Converts a PIL image into an image tkinter can draw. PIL is imported on first use so the rectangles mode
+    (TASK_ONE) never loads it.
 
-
-class Door(Entity):
-    """
-    A Door is a special type of an Entity within the game. The Door Entity can be collided with (The Player should be
-    able to share its position with the Door when the Player enters the Door.) Door should be constructed with Door().
+    Parameters
+        image: PIL image
     """
-
-    def __init__(self):
-        """
-        Constructor of the Door class.
-        """
-        self.id = DOOR
-        self.collidable = True
-
-    def __str__(self) -> str:
-        """
-        Returns the string representation of the Door. e.g. "Door('D')"
-
-        Returns:
-            s(str): Return the string representation of the Door.
-        """
-        s = "Door('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
-
-    def on_hit(self, game: GameLogic) -> None:
-        '''t'''
-        player = game.get_player()
-        inventory = player.get_inventory()
-        if inventory:
-            game.set_win(True)
-        else:
-            print("You don't have the key!")
-
-
-
-class Player(Entity):
-    """
-    A Player is a special type of an Entity within the game. The Player Entity can be collided with. The Player
-    should be constructed with Player(move_count: int) where moves represents how many moves a Player can have for
-    the given dungeon they are in (see GAME_LEVELS).
-    """
-
-    def __init__(self, move_count):
-        """
-        Constructor of the Player class.
-
-        Parameters:
-            move_count(int): moves represents how many moves a Player can have for the given dungeon they are in.
-        """
-        self.id = PLAYER
-        self.collidable = True
-        self.move_count = move_count
-        self.position = None
-        self.inventory = []
-
-    def set_position(self, position):
-        """
-        Sets the position of the Player.
-
-        Parameters
-            position(tuple<int, int>): The position of the Player.
-        """
-        self.position = position
-
-    def get_position(self) -> tuple:
-        """
-        Returns a tuple of ints representing the position of the Player. If the Player’s position hasn’t been set yet
-        then this method should return None.
-
-        Returns:
-            self.position(tuple<int, int>): Returns a tuple of ints representing the position of the Player.
-        """
-        return self.position
-
-    def change_move_count(self, number):
-        """
-        Add the number to the Player’s move count.
-
-        Parameters
-            number(int): number to be added to the Player’s move count.
-        """
-        self.move_count += number
-
-    def moves_remaining(self) -> int:
-        """
-        Returns an int representing how many moves the Player has left before they reach the maximum move count.
-
-        Returns: self.move_count(int): Returns an int representing how many moves the Player has left before they
-        reach the maximum move count.
-        """
-        return self.move_count
-
-    def add_item(self, item):
-        """
-        Adds the item to the Player’s Inventory.
-
-        Parameters:
-            item(Entity): the item to be added to the Player’s Inventory.
-        """
-        self.inventory.append(item)
-
-    def get_inventory(self) -> list:
-        """
-        Returns a list that represents the Player’s inventory. If the Player has nothing in their inventory then an
-        empty list should be returned.
-
-        Returns:
-            self.inventory(list<Entity>): Returns a list that represents the Player’s inventory.
-        """
-        return self.inventory
-
-    def __str__(self) -> str:
-        """
-        Returns the ​string representation of the Player​. e.g. "Player('O')"
-
-        Returns:
-            s(str): Returns the ​string representation of the Player
-        """
-        s = "Player('" + self.id + "')"
-        return s
-
-    def __repr__(self) -> str:
-        """
-        Same as str(self).
-        """
-        return self.__str__()
+    from PIL import ImageTk
+    return ImageTk.PhotoImage(image)
 
 
 class AbstractGrid(tk.Canvas): 
@@ -610,7 +52,23 @@ class AbstractGrid(tk.Canvas):
         self.height = height
         self.dx = self.width / self.cols
         self.dy = self.height / self.rows
-        super(AbstractGrid, self).__init__(master, **kwargs)
+        super(AbstractGrid, self).__init__(master, width=width, height=height, **kwargs)
+
+    def resize(self, width, height):
+        """
+        Changes the size of the grid. What is already drawn is moved and stretched to fit instead of drawn again.
+        Returns True once everything drawn is shown at its new size.
+
+        Parameters
+            width
+            height
+        """
+        self.scale('all', 0, 0, width / self.width, height / self.height)
+        self.width = width
+        self.height = height
+        self.dx = self.width / self.cols
+        self.dy = self.height / self.rows
+        return True
     
     def get_bbox(self, position):
         """
@@ -661,6 +119,48 @@ class AbstractGrid(tk.Canvas):
         lbl_pos = self.get_position_center(position)
         self.create_text(lbl_pos, text = text)
 
+    def cell_tag(self, position):
+        """
+        Returns the canvas tag of the items drawn in the cell at the given (row, col) position.
+
+        Parameters
+            position: (row, col)
+        """
+        return 'cell%d_%d' % position
+
+    def clear_cell(self, position):
+        """
+        Removes everything drawn in the cell at the given (row, col) position.
+
+        Parameters
+            position: (row, col)
+        """
+        self.delete(self.cell_tag(position))
+
+    def shift(self, tag, old_position, new_position):
+        """
+        Moves the items with a tag from one cell to another.
+
+        Parameters
+            tag: the tag of the items
+            old_position: (row, col) the items are drawn in
+            new_position: (row, col) to move them to
+        """
+        x1, y1 = self.get_position_center(old_position)
+        x2, y2 = self.get_position_center(new_position)
+        self.move(tag, x2 - x1, y2 - y1)
+
+
+# The colour and label of each dungeon character drawn in the rectangles mode (TASK_ONE).
+CELL_STYLES = {
+    WALL: ("#a9a9a9", None),
+    KEY: ("yellow", "Trash"),
+    MOVE_INCREASE: ("orange", "Banana"),
+    DOOR: ("red", "Nest"),
+    ENEMY: ("purple", "Fox"),
+}
+FLOOR_COLOUR = "#d3d3d3"
+
 
 class DungeonMap(AbstractGrid):
     def __init__(self, master, size, width=600, **kwargs):
@@ -673,53 +173,76 @@ class DungeonMap(AbstractGrid):
             width
             kwargs
         """
-        super(DungeonMap, self).__init__(master, size, size, width, width, **kwargs)
-    
-    def draw_grid(self, dungeon, player_position):
+        super(DungeonMap, self).__init__(master, size, size, width, width, **kwargs)
+    
+    def draw_grid(self, dungeon, player_position):
+        """
+        Draws the dungeon on the DungeonMap based on dungeon, and draws the player at the specified (row, col) position.
+
+        Parameters
+            dungeon
+            player_position: the specified (row, col) position which player at
+        """
+        self.delete('all')
+        for row, line in enumerate(dungeon):
+            for col, char in enumerate(line):
+                if char in CELL_STYLES:
+                    self.draw_cell((row, col), char)
+        self.draw_player(player_position)
+
+    def draw_cell(self, position, char):
+        """
+        Redraws the cell at the given (row, col) position, leaving the rest of the map untouched.
+
+        Parameters
+            position: (row, col)
+            char: the dungeon character to draw in the cell
+        """
+        tag = self.cell_tag(position)
+        self.delete(tag)
+        if char in CELL_STYLES:
+            fill, text = CELL_STYLES[char]
+            self.create_rectangle(self.get_bbox(position), fill = fill, tags=tag)
+            if text:
+                self.create_text(self.get_position_center(position), text = text, tags=tag)
+        elif char == SPACE:
+            # Only needed when the fog of war hides the background; normally empty cells are not drawn.
+            self.create_rectangle(self.get_bbox(position), fill = FLOOR_COLOUR, outline = '', tags=tag)
+        self.tag_raise('player')
+
+    def draw_player(self, position):
+        """
+        Draws the player at the given (row, col) position.
+
+        Parameters
+            position: (row, col)
+        """
+        self.delete('player')
+        self.create_rectangle(self.get_bbox(position), fill = "#00fa9a", tags='player')
+        self.create_text(self.get_position_center(position), text = "Ibis", tags='player')
+
+    def draw_enemy(self, position, tags):
         """
-        Draws the dungeon on the DungeonMap based on dungeon, and draws the player at the specified (row, col) position.
+        Draws an enemy at the given (row, col) position.
 
         Parameters
-            dungeon
-            player_position: the specified (row, col) position which player at
+            position: (row, col)
+            tags: the canvas tags of the enemy's items
         """
-        wall_pos = []
-        key_pos = []
-        moveincrease_pos = []
-        door_pos = []
-        for row, line in enumerate(dungeon):
-            for col, char in enumerate(line):
-                if char == WALL:
-                    wall_pos.append((row, col))
-                elif char == KEY:
-                    key_pos.append((row, col))
-                elif char == MOVE_INCREASE:
-                    moveincrease_pos.append((row, col))
-                elif char == DOOR:
-                    door_pos.append((row, col))
-
-        bbox_player = self.get_bbox(player_position)
-        self.create_rectangle(bbox_player, fill = "#00fa9a")
-        self.annotate_position(player_position,"Ibis")
-
-        if len(key_pos)>0:
-            bbox_key = self.get_bbox(key_pos[0])
-            self.create_rectangle(bbox_key, fill = "yellow")
-            self.annotate_position(key_pos[0], "Trash")
-        
-        if len(moveincrease_pos)>0:
-            bbox_moveincrease = self.get_bbox(moveincrease_pos[0])
-            self.create_rectangle(bbox_moveincrease, fill = "orange")
-            self.annotate_position(moveincrease_pos[0], "Banana")
+        fill, text = CELL_STYLES[ENEMY]
+        self.create_rectangle(self.get_bbox(position), fill = fill, tags=tags)
+        self.create_text(self.get_position_center(position), text = text, fill = 'white', tags=tags)
 
-        if len(door_pos)>0:
-            bbox_door = self.get_bbox(door_pos[0])
-            self.create_rectangle(bbox_door, fill = "red")
-            self.annotate_position(door_pos[0], "Nest")
+    def draw_ghost(self, position):
+        """
+        Draws the ghost of the best run at the given (row, col) position, as a single see-through item.
 
-        for i, item in enumerate(wall_pos):
-            bbox_wall = self.get_bbox(item)
-            self.create_rectangle(bbox_wall, fill = "#a9a9a9")
+        Parameters
+            position: (row, col)
+        """
+        self.delete('ghost')
+        self.create_rectangle(self.get_bbox(position), fill = "#00fa9a", outline = '', stipple = 'gray50',
+                              tags='ghost')
 
 
 class KeyPad(AbstractGrid):
@@ -773,6 +296,21 @@ class KeyPad(AbstractGrid):
             return "D"
 
 
+ENEMY_COLOUR = '#b22222'
+# How opaque the ghost of the best run is, from 0 to 1.
+GHOST_ALPHA = 0.4
+
+# The sprite (see assets.SPRITE_FILES) drawn for each dungeon character.
+SPRITES = {
+    WALL: 'wall',
+    SPACE: 'empty',
+    KEY: 'key',
+    MOVE_INCREASE: 'moveIncrease',
+    DOOR: 'door',
+    PLAYER: 'player',
+}
+
+
 class AdvancedDungeonMap(AbstractGrid):
     def __init__(self, master, size, width=600, **kwargs):
         """
@@ -785,6 +323,59 @@ class AdvancedDungeonMap(AbstractGrid):
             **kwargs
         """
         super(AdvancedDungeonMap, self).__init__(master, size, size, width, width, **kwargs)
+        self._sprites = {}
+        shared_cache().prepare(max(self.dx, self.dy))
+
+    def resize(self, width, height):
+        """
+        Changes the size of the map. Sprites are swapped for ones scaled to the new cell size; until those are ready
+        the closest size already scaled is used, and False is returned so swap_sprites() can be called again later.
+
+        Parameters
+            width
+            height
+        """
+        super(AdvancedDungeonMap, self).resize(width, height)
+        shared_cache().prepare(max(self.dx, self.dy))
+        return self.swap_sprites()
+
+    def swap_sprites(self):
+        """
+        Gives the sprites drawn on the map the images for the current cell size. Returns True if every image was
+        scaled for this size, False if some were borrowed from another size because theirs are not ready yet.
+        """
+        cache = shared_cache()
+        exact = all(cache.is_ready(name, int(self.dx), int(self.dy)) for name in SPRITES.values())
+        self._sprites = {}
+        for char, name in SPRITES.items():
+            if self.find_withtag('sprite_' + name):
+                self.itemconfig('sprite_' + name, image=self.get_sprite(char))
+        if self.find_withtag('ghost'):
+            self.itemconfig('ghost', image=self.get_ghost_sprite())
+        return exact
+
+    def get_sprite(self, char):
+        """
+        Returns the image drawn for a dungeon character, scaled to the cell size. Images come pre-scaled from the
+        shared SpriteCache and are converted for tkinter on first use.
+
+        Parameters
+            char: a dungeon character in SPRITES
+        """
+        if char not in self._sprites:
+            image = shared_cache().get_image(SPRITES[char], int(self.dx), int(self.dy))
+            self._sprites[char] = photo_image(image)
+        return self._sprites[char]
+
+    def get_ghost_sprite(self):
+        """
+        Returns the player's image made see-through, for the ghost of the best run.
+        """
+        if 'ghost' not in self._sprites:
+            image = shared_cache().get_image(SPRITES[PLAYER], int(self.dx), int(self.dy)).convert('RGBA')
+            image.putalpha(image.getchannel('A').point(lambda alpha: int(alpha * GHOST_ALPHA)))
+            self._sprites['ghost'] = photo_image(image)
+        return self._sprites['ghost']
 
     def draw_grid(self, dungeon, player_position):
         """
@@ -794,103 +385,85 @@ class AdvancedDungeonMap(AbstractGrid):
             dungeon
             player_position
         """
-        wall_pos = []
-        key_pos = []
-        moveincrease_pos = []
-        door_pos = []
-        empty_pos = []
-        empty_pos.append(player_position)
+        self.delete('all')
         for row, line in enumerate(dungeon):
             for col, char in enumerate(line):
-                if char == WALL:
-                    wall_pos.append((row, col))
-                elif char == KEY:
-                    key_pos.append((row, col))
-                    empty_pos.append((row, col))
-                elif char == MOVE_INCREASE:
-                    moveincrease_pos.append((row, col))
-                    empty_pos.append((row, col))
-                elif char == DOOR:
-                    door_pos.append((row, col))
-                    empty_pos.append((row, col))
-                else:
-                    if (row, col) != player_position:
-                        empty_pos.append((row, col))
-
-        global p_wall
-        wall = Image.open('images/wall.png')
-        wall = wall.resize((int(self.dx), int(self.dy)))
-        p_wall = ImageTk.PhotoImage(wall)
-        for i, item in enumerate(wall_pos):
-            (x, y) = self.get_position_center(item)
-            self.create_image(x, y, image=p_wall, anchor='center')
-
-        global p_empty
-        empty = Image.open('images/empty.png')
-        empty = empty.resize((int(self.dx), int(self.dy)))
-        p_empty = ImageTk.PhotoImage(empty)
-        for i, item in enumerate(empty_pos):
-            (x, y) = self.get_position_center(item)
-            self.create_image(x, y, image=p_empty, anchor='center')
-
-        global p_key
-        if len(key_pos) > 0:
-            key = Image.open('images/key.png')
-            key.thumbnail((self.dx, self.dy))
-            p_key = ImageTk.PhotoImage(key)
-            (x, y) = self.get_position_center(key_pos[0])
-            self.create_image(x, y, image=p_key, anchor='center')
-
-        global p_moveincrease
-        if len(moveincrease_pos) > 0:
-            moveincrease = Image.open('images/moveIncrease.png')
-            moveincrease.thumbnail((self.dx, self.dy))
-            p_moveincrease = ImageTk.PhotoImage(moveincrease)
-            (x, y) = self.get_position_center(moveincrease_pos[0])
-            self.create_image(x, y, image=p_moveincrease, anchor='center')
-
-        global p_door
-        if len(door_pos) > 0:
-            door = Image.open('images/door.gif')
-            door.thumbnail((self.dx, self.dy))
-            p_door = ImageTk.PhotoImage(door)
-            (x, y) = self.get_position_center(door_pos[0])
-            self.create_image(x, y, image=p_door, anchor='center')
-
-        global p_player
-        player = Image.open('images/player.png')
-        player.thumbnail((self.dx, self.dy))
-        p_player = ImageTk.PhotoImage(player)
-        (x, y) = self.get_position_center(player_position)
-        self.create_image(x, y, image=p_player, anchor='center')
+                # The player's starting cell is drawn empty; the player is drawn where they are now.
+                self.draw_cell((row, col), SPACE if char == PLAYER else char)
+        self.draw_player(player_position)
+
+    def draw_cell(self, position, char):
+        """
+        Redraws the cell at the given (row, col) position, leaving the rest of the map untouched.
+
+        Parameters
+            position: (row, col)
+            char: the dungeon character to draw in the cell
+        """
+        tag = self.cell_tag(position)
+        self.delete(tag)
+        (x, y) = self.get_position_center(position)
+        if char != WALL:
+            self.create_image(x, y, image=self.get_sprite(SPACE), anchor='center', tags=(tag, 'sprite_empty'))
+        if char == ENEMY:
+            self.draw_enemy(position, tag)
+        elif char != SPACE:
+            self.create_image(x, y, image=self.get_sprite(char), anchor='center', tags=(tag, 'sprite_' + SPRITES[char]))
+        self.tag_raise('player')
+
+    def draw_player(self, position):
+        """
+        Draws the player at the given (row, col) position.
+
+        Parameters
+            position: (row, col)
+        """
+        self.delete('player')
+        (x, y) = self.get_position_center(position)
+        self.create_image(x, y, image=self.get_sprite(PLAYER), anchor='center', tags=('player', 'sprite_player'))
+
+    def draw_enemy(self, position, tags):
+        """
+        Draws an enemy at the given (row, col) position. There is no sprite for enemies, so they are drawn as a
+        circle.
+
+        Parameters
+            position: (row, col)
+            tags: the canvas tags of the enemy's items
+        """
+        x1, y1, x2, y2 = self.get_bbox(position)
+        inset = min(self.dx, self.dy) / 6
+        self.create_oval(x1 + inset, y1 + inset, x2 - inset, y2 - inset, fill=ENEMY_COLOUR, outline='black',
+                         tags=tags)
+
+    def draw_ghost(self, position):
+        """
+        Draws the ghost of the best run at the given (row, col) position, as a single see-through image.
+
+        Parameters
+            position: (row, col)
+        """
+        self.delete('ghost')
+        (x, y) = self.get_position_center(position)
+        self.create_image(x, y, image=self.get_ghost_sprite(), anchor='center', tags='ghost')
+        self.tag_raise('player')
 
 
 class StatusBar(AbstractGrid):
     def __init__(self, master, width=800, **kwargs):
         """
-        Constructor of the StatusBar class.
+        Constructor of the StatusBar class. The widgets are created once here; draw() only changes their text.
 
         Parameters
             master
             width
             **kwargs
         """
-        super(StatusBar, self).__init__(master, 1, 5, width, 100, **kwargs)
+        super(StatusBar, self).__init__(master, 1, 7, width, 100, **kwargs)
         self.btn_frm = tk.Frame(self)
         self.btn_newgame = tk.Button(self.btn_frm, text="New game")
         self.btn_quit = tk.Button(self.btn_frm, text="Quit")
 
-    def draw(self, t, m):
-        """
-        Draw the statusbar for the game (TASK_TWO).
-
-        Parameters
-            t: time cost
-            m: moves left
-        """
-        global p_clock
-        global p_lightning
-
         self.btn_newgame.config(font=('Arial', 14))
         self.btn_newgame.grid(row=0, column=0)
 
@@ -898,42 +471,382 @@ class StatusBar(AbstractGrid):
         self.btn_quit.grid(row=1, column=0)
         self.btn_frm.grid(row=0, column=0)
 
-        clock = Image.open('images/clock.png')
-        clock.thumbnail((100, 100))
-        p_clock = ImageTk.PhotoImage(clock)
-        lb_clock = tk.Label(self, image=p_clock)
+        self._p_clock = photo_image(shared_cache().get_image('clock', 100, 100))
+        lb_clock = tk.Label(self, image=self._p_clock)
         lb_clock.grid(row=0, column=1)
 
         time_frm = tk.Frame(self)
         Time_title = tk.Label(time_frm, text="Time elapsed")
         Time_title.config(font=('Arial', 14))
         Time_title.grid(row=0, column=0)
-        Time = tk.Label(time_frm, text= str(t))
-        Time.config(font=('Arial', 14))
-        Time.grid(row=1, column=0)
+        self._time = tk.Label(time_frm)
+        self._time.config(font=('Arial', 14))
+        self._time.grid(row=1, column=0)
         time_frm.grid(row=0, column=2)
 
-        lightning = Image.open('images/lightning.png')
-        lightning.thumbnail((100, 100))
-        p_lightning = ImageTk.PhotoImage(lightning)
-        lb_lightning = tk.Label(self, image=p_lightning)
+        self._p_lightning = photo_image(shared_cache().get_image('lightning', 100, 100))
+        lb_lightning = tk.Label(self, image=self._p_lightning)
         lb_lightning.grid(row=0, column=3)
 
         move_frm = tk.Frame(self)
         Moves_title = tk.Label(move_frm, text="Moves left")
         Moves_title.config(font=('Arial', 14))
         Moves_title.grid(row=0, column=0)
-        moves = tk.Label(move_frm, text= str(m) + " moves remaining")
-        moves.config(font=('Arial', 14))
-        moves.grid(row=1, column=0)
+        self._moves = tk.Label(move_frm)
+        self._moves.config(font=('Arial', 14))
+        self._moves.grid(row=1, column=0)
         move_frm.grid(row=0, column=4)
 
+        self._p_lives = photo_image(shared_cache().get_image('lives', 100, 100))
+        lb_lives = tk.Label(self, image=self._p_lives)
+        lb_lives.grid(row=0, column=5)
+
+        lives_frm = tk.Frame(self)
+        Lives_title = tk.Label(lives_frm, text="Lives left")
+        Lives_title.config(font=('Arial', 14))
+        Lives_title.grid(row=0, column=0)
+        self._lives = tk.Label(lives_frm)
+        self._lives.config(font=('Arial', 14))
+        self._lives.grid(row=1, column=0)
+        lives_frm.grid(row=0, column=6)
+
+        self._shown = None
+
+    def draw(self, t, m, l):
+        """
+        Draw the statusbar for the game (TASK_TWO). Labels are only updated when what they show has changed.
+
+        Parameters
+            t: time cost
+            m: moves left
+            l: lives left
+        """
+        if self._shown == (t, m, l):
+            return
+        self._shown = (t, m, l)
+        self._time.config(text= str(t))
+        self._moves.config(text= str(m) + " moves remaining")
+        self._lives.config(text= str(l) + (" life" if l == 1 else " lives"))
+
+
+class Tween:
+    """
+    Slides the canvas items with a tag from one point to another over a fixed duration. The position is worked out
+    from the time elapsed, so a late frame jumps ahead rather than falling behind.
+    """
+
+    def __init__(self, canvas, tag, start, end, duration):
+        """
+        Constructor of the Tween class.
+
+        Parameters
+            canvas: the canvas the items are on
+            tag: the tag of the items to move
+            start: (x, y) where the items are now
+            end: (x, y) where the items finish
+            duration: seconds the slide takes
+        """
+        self._canvas = canvas
+        self._tag = tag
+        self._start = start
+        self._end = end
+        self._duration = duration
+        self._began = time.perf_counter()
+        self._current = start
+
+    def step(self, now):
+        """
+        Moves the items to where they should be at the given time. Returns True once they have arrived.
+
+        Parameters
+            now: time.perf_counter() value of the frame
+        """
+        progress = 1 if self._duration <= 0 else min(1, (now - self._began) / self._duration)
+        x = self._start[0] + (self._end[0] - self._start[0]) * progress
+        y = self._start[1] + (self._end[1] - self._start[1]) * progress
+        self._canvas.move(self._tag, x - self._current[0], y - self._current[1])
+        self._current = (x, y)
+        return progress >= 1
+
+    def finish(self):
+        """
+        Moves the items straight to the end point.
+        """
+        self.step(self._began + self._duration)
+
+
+class Ghost:
+    """
+    Replays a recorded run as a ghost racing the player. Moves are read from the run's move log as the game clock
+    reaches them, so the ghost costs the same each frame however long the run is. Walls are the only thing that
+    stops the ghost.
+    """
+
+    def __init__(self, replay, start, is_open):
+        """
+        Constructor of the Ghost class.
+
+        Parameters
+            replay: the move log of the run, as made by encode_replay
+            start: (row, col) the run started at
+            is_open: returns True if a (row, col) position can be walked onto
+        """
+        self._replay = replay
+        self._start = start
+        self._is_open = is_open
+        self.reset()
+
+    def reset(self):
+        """
+        Puts the ghost back at the start of the run.
+        """
+        self._moves = decode_replay(self._replay)
+        self._next = next(self._moves, None)
+        self._position = self._start
+
+    def get_position(self):
+        """
+        Returns the (row, col) position of the ghost.
+        """
+        return self._position
+
+    def advance(self, now):
+        """
+        Plays the moves of the run made up to a game time. Returns True if the ghost moved.
+
+        Parameters
+            now: the game time, in seconds
+        """
+        old_position = self._position
+        while self._next is not None and self._next[1] <= now:
+            dr, dc = DIRECTIONS[self._next[0]]
+            target = (self._position[0] + dr, self._position[1] + dc)
+            if self._is_open(target):
+                self._position = target
+            self._next = next(self._moves, None)
+        return self._position != old_position
+
+
+# Keys moving the player, repeat timing for held keys, and how long a key release waits for the press that the
+# system's own key repeat sends straight after it.
+KEY_DIRECTIONS = {'w': 'W', 's': 'S', 'a': 'A', 'd': 'D'}
+REPEAT_DELAY = 0.25
+REPEAT_INTERVAL = 0.1
+RELEASE_GRACE = 0.05
+INPUT_BUFFER = 4
+
+class InputHandler:
+    """
+    Tracks which direction keys are held down and turns presses and held keys into moves. Moves are collected
+    between frames and handed out together by poll(), so each frame plays them in one go.
+    """
+
+    def __init__(self, delay=REPEAT_DELAY, interval=REPEAT_INTERVAL, limit=INPUT_BUFFER):
+        """
+        Constructor of the InputHandler class.
+
+        Parameters
+            delay: seconds a key is held before it starts repeating
+            interval: seconds between repeated moves while a key is held
+            limit: how many presses are kept between frames; the oldest are dropped first
+        """
+        self._delay = delay
+        self._interval = interval
+        self._queued = deque(maxlen=limit)
+        self._held = []
+        self._releasing = {}
+        self._next_repeat = 0
+
+    def press(self, direction, now, stamp=None):
+        """
+        Records a direction key going down.
+
+        Parameters
+            direction: 'W', 'S', 'A' or 'D'
+            now: time.perf_counter() value of the event
+            stamp: the event's own timestamp, if it has one
+        """
+        if direction in self._releasing:
+            released_stamp = self._releasing.pop(direction)[1]
+            if stamp is None or stamp == released_stamp:
+                # The system's key repeat sends a release and a press together; the key never went up.
+                return
+            self._held.remove(direction)
+        if direction in self._held:
+            return
+        self._held.append(direction)
+        self._queued.append(direction)
+        self._next_repeat = now + self._delay
+
+    def release(self, direction, now, stamp=None):
+        """
+        Records a direction key going up. The release only takes effect if no press with the same timestamp follows
+        within RELEASE_GRACE.
+
+        Parameters
+            direction: 'W', 'S', 'A' or 'D'
+            now: time.perf_counter() value of the event
+            stamp: the event's own timestamp, if it has one
+        """
+        if direction in self._held:
+            self._releasing[direction] = (now, stamp)
+
+    def release_all(self):
+        """
+        Lets go of every key held down, e.g. when the window loses focus and their releases will never arrive.
+        """
+        self._held.clear()
+        self._releasing.clear()
+        self._next_repeat = 0
+
+    def tap(self, direction):
+        """
+        Queues a single move, as from a click on the KeyPad.
+
+        Parameters
+            direction: 'W', 'S', 'A' or 'D'
+        """
+        self._queued.append(direction)
+
+    def poll(self, now):
+        """
+        Returns the moves to play this frame: every press since the last frame or, if there were none, a repeat of
+        the most recently pressed key still held down when one is due.
+
+        Parameters
+            now: time.perf_counter() value of the frame
+        """
+        for direction, (released, stamp) in list(self._releasing.items()):
+            if now - released >= RELEASE_GRACE:
+                del self._releasing[direction]
+                self._held.remove(direction)
+        moves = list(self._queued)
+        self._queued.clear()
+        if not moves and self._held and self._held[-1] not in self._releasing and now >= self._next_repeat:
+            moves.append(self._held[-1])
+            self._next_repeat += self._interval
+            if self._next_repeat < now:
+                self._next_repeat = now + self._interval
+        return moves
+
+    def clear(self):
+        """
+        Forgets the presses waiting to be played.
+        """
+        self._queued.clear()
+
+
+TOAST_DURATION = 1.5
+TOAST_GAP = 0.2
+TOAST_LIMIT = 3
+
+class Toaster:
+    """
+    Shows short messages over a canvas without blocking the game, one at a time. A message repeated while it is
+    shown or waiting is counted instead of queued again, at most TOAST_LIMIT messages wait, and consecutive messages
+    are kept a short gap apart.
+    """
+
+    def __init__(self, canvas, duration=TOAST_DURATION, gap=TOAST_GAP, limit=TOAST_LIMIT):
+        """
+        Constructor of the Toaster class.
+
+        Parameters
+            canvas: the AbstractGrid the messages are drawn over
+            duration: seconds a message stays on screen
+            gap: seconds between one message going and the next appearing
+            limit: how many messages can wait; the oldest are dropped first
+        """
+        self._canvas = canvas
+        self._duration = duration
+        self._gap = gap
+        self._waiting = deque(maxlen=limit)
+        self._shown = None
+        self._expires = 0
+        self._next = 0
+
+    def post(self, text):
+        """
+        Adds a message to be shown.
+
+        Parameters
+            text: the message
+        """
+        if self._shown is not None and self._shown[0] == text:
+            self._shown[1] += 1
+            self._expires = time.perf_counter() + self._duration
+            self.draw()
+        elif self._waiting and self._waiting[-1][0] == text:
+            self._waiting[-1][1] += 1
+        else:
+            self._waiting.append([text, 1])
+
+    def update(self, now):
+        """
+        Hides the message on screen once it has expired and shows the next one when it is due. Called every frame.
+
+        Parameters
+            now: time.perf_counter() value of the frame
+        """
+        if self._shown is not None and now >= self._expires:
+            self._shown = None
+            self._next = now + self._gap
+            self.draw()
+        if self._shown is None and self._waiting and now >= self._next:
+            self._shown = self._waiting.popleft()
+            self._expires = now + self._duration
+            self.draw()
+
+    def draw(self):
+        """
+        Draws the message on screen, if any, over everything else on the canvas.
+        """
+        self._canvas.delete('toast')
+        if self._shown is None:
+            return
+        text, count = self._shown
+        if count > 1:
+            text += ' (x' + str(count) + ')'
+        x = self._canvas.width / 2
+        y = self._canvas.height - 30
+        label = self._canvas.create_text(x, y, text=text, fill='white', font=('Arial', 14), tags='toast')
+        x1, y1, x2, y2 = self._canvas.bbox(label)
+        self._canvas.create_rectangle(x1 - 10, y1 - 5, x2 + 10, y2 + 5, fill='#333333', outline='', tags='toast')
+        self._canvas.tag_raise(label)
+
 
 TASK_ONE = 1
 TASK_TWO = 2
 
+MOVE_DURATION = 0.12
+FRAME_RATE = 60
+
+# Milliseconds the window must stop changing size for before the map is resized.
+RESIZE_DELAY = 100
+
+# The width, in cells, of the part of a chunked world shown around the player.
+VIEWPORT_SIZE = 15
+
+# Seconds between two steps of the enemies.
+ENEMY_STEP = 0.4
+
+FOG_RADIUS = 4
+FOG_COLOUR = 'black'
+
+LIVES = 3
+
+UNDO_LIMIT = 100
+UNDO_KEY = 'z'
+REDO_KEY = 'y'
+
+# Keys choosing what the level editor paints, and the names shown for them.
+EDITOR_BRUSHES = {'1': WALL, '2': SPACE, '3': KEY, '4': MOVE_INCREASE, '5': DOOR, '6': PLAYER}
+BRUSH_NAMES = {WALL: 'Wall', SPACE: 'Empty', KEY: 'Key', MOVE_INCREASE: 'Move increase', DOOR: 'Door', PLAYER: 'Player'}
+
 class GameApp():
-    def __init__(self, master, task=TASK_ONE, dungeon_name="game2.txt"):
+    def __init__(self, master, task=TASK_ONE, dungeon_name="game2.txt", move_duration=MOVE_DURATION,
+                 frame_rate=FRAME_RATE, fog=False, fog_radius=FOG_RADIUS, scores_file=SCORES_FILE, lives=LIVES,
+                 world=None, ghost=False):
         """
         Constructor of the GameApp class.
 
@@ -941,24 +854,65 @@ class GameApp():
             master
             task: TASK_ONE or TASK_TWO
             dungeon_name
+            move_duration: seconds the player takes to slide from one cell to the next
+            frame_rate: frames drawn per second
+            fog: True to only show the cells the player can see
+            fog_radius: how far the player can see in fog of war mode
+            scores_file: the leaderboard database finished runs are recorded in (TASK_TWO)
+            lives: how many times the player can run out of moves and go back to a checkpoint (TASK_TWO; TASK_ONE
+                has one life)
+            world: a ChunkedWorld to play in instead of the level file; the map then shows the cells around the
+                player and follows them
+            ghost: True to race a ghost of the best recorded run of the level (TASK_TWO)
         """
         self._dungeon_name = dungeon_name
-        self._game = GameLogic(self._dungeon_name)
+        self._world = world
+        self._lives = lives if task == TASK_TWO else 1
+        self._changed = set()
+        self._life_lost = False
+        self._enemy_clock = FixedTimestep(ENEMY_STEP)
+        self.create_game()
         self._master = master
 
+        self._master.columnconfigure(0, weight=1)
+        self._master.rowconfigure(1, weight=1)
         self._fr_game = tk.Frame(self._master)
-        self._fr_game.columnconfigure(0, minsize=600)
-        self._fr_game.columnconfigure(1, minsize=200)
-        self._fr_game.rowconfigure(0, minsize=600)
+        self._fr_game.columnconfigure(0, weight=1)
+        self._fr_game.rowconfigure(0, weight=1)
 
         self._direction = ''
         self._end = False
         self._task = task
 
-        self.start = time.time()
-        self.timeoffset = 0
+        self.clock = GameClock()
+
+        self._undo = deque(maxlen=UNDO_LIMIT)
+        self._redo = []
         self.t = 0
 
+        self._editor = None
+        self._brush = WALL
+
+        self.Dungeon = None
+        self._move_duration = move_duration
+        self._frame_time = 1 / frame_rate
+        self._next_frame = 0
+        self._frame_id = None
+        self._tween = None
+        self._input = InputHandler()
+        self._resize_to = None
+        self._resize_id = None
+        self._path = deque()
+
+        self._fog = fog
+        self._fog_radius = fog_radius
+        self._fov = FieldOfView(self.is_opaque, fog_radius)
+
+        self._scores = ScoreStore(scores_file) if task == TASK_TWO else None
+        self._replay = []
+        self._race = ghost
+        self._ghost = None
+
         self.keypad = KeyPad(self._fr_game, 200, 50)
 
         if self._task == TASK_TWO:
@@ -968,116 +922,479 @@ class GameApp():
             self.menubar.add_command(label="Save game", command=self.savegame)
             self.menubar.add_command(label="Load game", command=self.loadgame)
             self.menubar.add_command(label="New game", command=self.newgame)
+            self.menubar.add_command(label="Undo", command=self.undo)
+            self.menubar.add_command(label="Redo", command=self.redo)
+            self.menubar.add_command(label="Edit level", command=self.toggle_editor)
+            self.menubar.add_command(label="Save level", command=self.save_level)
+            self.menubar.add_command(label="Fog of war", command=self.toggle_fog)
+            self.menubar.add_command(label="Ghost race", command=self.toggle_ghost)
             self.menubar.add_command(label="Quit", command=self.quit)
 
     def play(self):
         """
-        Handles the player interaction.
+        Handles the player interaction. The window is built on the first call; after that the whole dungeon is drawn
+        once and a frame loop takes over, animating the player, playing buffered moves and ending the game.
+        """
+        if self.Dungeon is None:
+            self.build()
+        self.load_ghost()
+        self.redraw()
+        if self._frame_id is not None:
+            self._master.after_cancel(self._frame_id)
+        self._next_frame = time.perf_counter()
+        self.schedule_frame()
+
+    def build(self):
+        """
+        Creates the widgets of the game window.
+        """
+        title = tk.Label(self._master, text="Key Cave Adventure Game", bg = "#00fa9a")
+        title.config(font=('Arial', 30))
+        title.grid(row=0, column=0, sticky='nsew')
+
+        size = self._game.get_dungeon_size() if self._world is None else VIEWPORT_SIZE
+        if self._task == TASK_ONE:
+            self.Dungeon = DungeonMap(self._fr_game, size, 600, bg="#d3d3d3")
+        elif self._task == TASK_TWO:
+            self.Dungeon = AdvancedDungeonMap(self._fr_game, size, 600)
+            self.status.grid(row=0, column=0, sticky='nsew')
+            self.status.btn_quit.bind('<Button-1>', self.quit)
+            self.status.btn_newgame.bind('<Button-1>', self.newgame)
+            self._master.config(menu=self.menubar)
+            self._fr_bar.grid(row=2, column=0, sticky='nsew')
+
+        self.keypad.bind("<Button-1>", self.on_Button)
+        self._master.bind("<KeyPress>", self.on_key_press)
+        self._master.bind("<KeyRelease>", self.on_key_release)
+        self._master.bind("<FocusOut>", self.on_focus_out)
+        self._master.bind("<FocusIn>", lambda event: self.clock.resume('focus'))
+
+        self.Dungeon.bind('<Configure>', self.on_resize)
+        self.Dungeon.bind('<Button-1>', self.on_map_click)
+        self.Dungeon.grid(row=0, column=0, sticky='nsew')
+        self.keypad.grid(row=0, column=1, sticky='sw')
+        self._fr_game.grid(row=1, column=0, sticky='nsew')
+        self._map_bg = self.Dungeon.cget('bg')
+        self._toaster = Toaster(self.Dungeon)
+
+    def redraw(self):
+        """
+        Draws the whole dungeon and the status bar again. Used when the game changes other than by a move.
+        """
+        self._tween = None
+        self._input.clear()
+        self._path.clear()
+        position = self._game.get_player().get_position()
+        if self._world is not None:
+            self.draw_view()
+        elif self._fog:
+            self.Dungeon.config(bg=FOG_COLOUR)
+            self.Dungeon.delete('all')
+            self._fov.reset()
+            self.update_fog(position)
+            self.Dungeon.draw_player(position)
+        else:
+            self.Dungeon.config(bg=self._map_bg)
+            self.Dungeon.draw_grid(self._game.get_rows(), position)
+            self.draw_enemies()
+        if self._ghost is not None:
+            self.Dungeon.draw_ghost(self._ghost.get_position())
+        self._toaster.draw()
+        self.draw_status()
+
+    def load_ghost(self):
+        """
+        Set up the ghost of the best recorded run of the level, if racing it is on and there is one.
         """
-        text0 = 'You have finished the level!'
-        text1 = 'You have finished the level with a score of '
-        text2 = 'Would you like to play again?'
+        self._ghost = None
+        if not self._race or self._scores is None or self._world is not None:
+            return
+        self._scores.flush()
+        best = self._scores.best(self._dungeon_name)
+        if best is not None and best[2]:
+            is_open = lambda position: self._game.get_char(position) not in (WALL, None)
+            self._ghost = Ghost(best[2], self._game.get_player().get_position(), is_open)
 
-        if not self._game.won() and not self._game.check_game_over():
-            title = tk.Label(self._master, text="Key Cave Adventure Game", bg = "#00fa9a")
-            title.config(font=('Arial', 30))
-            title.grid(row=0, column=0, sticky='nsew')
+    def toggle_ghost(self):
+        """
+        Turn racing the ghost of the best run on or off. The ghost starts with the next game.
+        """
+        self._race = not self._race
+        if not self._race:
+            self._ghost = None
+            self.Dungeon.delete('ghost')
+        self._toaster.post("Ghost race on from the next game" if self._race else "Ghost race off")
 
-            if self._task == TASK_ONE:
-                self.Dungeon = DungeonMap(self._fr_game, self._game._dungeon_size, 600, bg="#d3d3d3")
-            elif self._task == TASK_TWO:
-                self.Dungeon = AdvancedDungeonMap(self._fr_game, self._game._dungeon_size, 600)
-                self.gettime()
-                m = self._game._player.moves_remaining()
-                min = self.t // 60
-                sec = self.t - min * 60
-                self.status.draw(str(min) + 'm' + str(sec) + 's', m)
-                self.status.grid(row=0, column=0, sticky='nsew')
-                self.status.btn_quit.bind('<Button-1>', self.quit)
-                self.status.btn_newgame.bind('<Button-1>', self.newgame)
-                self._master.config(menu=self.menubar)
-                self._fr_bar.grid(row=2, column=0, sticky='nsew')
+    def draw_view(self):
+        """
+        Draws the part of the chunked world around the player, with the player in the middle of the map.
+        """
+        row, col = self._game.get_player().get_position()
+        half = VIEWPORT_SIZE // 2
+        self.Dungeon.draw_grid(self._world.view((row - half, col - half), VIEWPORT_SIZE), (half, half))
+        self.draw_enemies()
+
+    def enemy_view(self):
+        """
+        Returns the top left and bottom right (row, col) of the part of the dungeon enemies are drawn in: the map,
+        the part of a chunked world on screen, or what the player can see in fog of war mode.
+        """
+        row, col = self._game.get_player().get_position()
+        if self._world is not None:
+            half = VIEWPORT_SIZE // 2
+            return (row - half, col - half), (row + half, col + half)
+        if self._fog:
+            radius = self._fog_radius
+            return (row - radius, col - radius), (row + radius, col + radius)
+        size = self._game.get_dungeon_size()
+        return (0, 0), (size - 1, size - 1)
+
+    def draw_enemies(self):
+        """
+        Draws the enemies that can be seen. Each enemy's items are tagged 'enemy' and 'enemy<index>'.
+        """
+        self.Dungeon.delete('enemy')
+        top_left, bottom_right = self.enemy_view()
+        top, left = top_left if self._world is not None else (0, 0)
+        for index, (row, col) in self._game.enemies_in(top_left, bottom_right):
+            if self._fog and self._world is None and not self._fov.is_visible((row, col)):
+                continue
+            self.Dungeon.draw_enemy((row - top, col - left), ('enemy', 'enemy%d' % index))
+
+    def on_enemies_moved(self, event):
+        """
+        Move the enemies drawn on the map. When only part of the dungeon is shown the enemies in view are drawn
+        again instead, since enemies walk in and out of it.
+        """
+        if self._world is not None or self._fog:
+            self.draw_enemies()
+            return
+        for index, old_position, new_position in event.moves:
+            self.Dungeon.shift('enemy%d' % index, old_position, new_position)
+
+    def is_opaque(self, position):
+        """
+        Returns True if the player cannot see through the given (row, col) position.
+
+        Parameters
+            position: (row, col)
+        """
+        return self._game.get_char(position) in (WALL, None)
+
+    def update_fog(self, position):
+        """
+        Look from the given (row, col) position and draw or hide only the cells whose visibility changed.
+
+        Parameters
+            position: (row, col)
+        """
+        appeared, disappeared = self._fov.update(position)
+        for cell in disappeared:
+            self.Dungeon.clear_cell(cell)
+        for cell in appeared:
+            char = self._game.get_char(cell)
+            if char is not None:
+                self.Dungeon.draw_cell(cell, SPACE if char == PLAYER else char)
+        self.draw_enemies()
 
-            self.Dungeon.draw_grid(self._game._dungeon, self._game.get_player().get_position())
+    def toggle_fog(self):
+        """
+        Turn the fog of war on or off. Not available in a chunked world.
+        """
+        if self._world is not None:
+            return
+        self._fog = not self._fog
+        self.redraw()
 
-            self.keypad.bind("<Button-1>", self.on_Button)
-            self._master.bind("<Key>", self.on_key_press)
+    def draw_status(self):
+        """
+        Updates the status bar (TASK_TWO) with the time elapsed and the moves left.
+        """
+        if self._task == TASK_TWO:
+            self.gettime()
+            m = self._moves_left
+            min = int(self.t // 60)
+            sec = self.t - min * 60
+            self.status.draw(str(min) + 'm' + '%04.1f' % sec + 's', m, self._game.get_lives())
+
+    def on_resize(self, event):
+        """
+        Resize a map to fit its new space. While the window is being dragged the map waits until it stops changing
+        size, so only the last size is drawn.
+        """
+        canvas = event.widget
+        border = 2 * (int(canvas.cget('highlightthickness')) + int(canvas.cget('borderwidth')))
+        self._resize_to = (canvas, min(event.width, event.height) - border)
+        if self._resize_id is not None:
+            self._master.after_cancel(self._resize_id)
+        self._resize_id = self._master.after(RESIZE_DELAY, self.apply_resize)
+
+    def apply_resize(self):
+        """
+        Resize the map to the last size it was given.
+        """
+        self._resize_id = None
+        canvas, size = self._resize_to
+        if size <= 0 or size == canvas.width:
+            return
+        if canvas is self.Dungeon and self._tween is not None:
+            self._tween.finish()
+            self._tween = None
+        ready = canvas.resize(size, size)
+        if canvas is self.Dungeon:
+            self._toaster.draw()
+        if not ready:
+            self._resize_id = self._master.after(RESIZE_DELAY, self.swap_sprites)
+
+    def swap_sprites(self):
+        """
+        Swap in the sprites scaled for the map's new size, waiting a little longer if some are not ready yet.
+        """
+        self._resize_id = None
+        canvas, size = self._resize_to
+        if not canvas.swap_sprites():
+            self._resize_id = self._master.after(RESIZE_DELAY, self.swap_sprites)
+
+    def schedule_frame(self):
+        """
+        Schedules the next frame. When frames run late, the frames that were missed are dropped rather than run
+        back to back.
+        """
+        now = time.perf_counter()
+        self._next_frame += self._frame_time
+        if self._next_frame < now:
+            self._next_frame = now + self._frame_time - (now - self._next_frame) % self._frame_time
+        delay = max(1, int((self._next_frame - now) * 1000))
+        self._frame_id = self._master.after(delay, self.frame)
+
+    def frame(self):
+        """
+        Draws one frame: advances the player's animation, plays the next buffered move and checks whether the game
+        has ended.
+        """
+        self._frame_id = None
+        now = time.perf_counter()
+        self._toaster.update(now)
+        moves = self._input.poll(now) if self._editor is None else []
+        if not moves and self._tween is None and self._path:
+            # Walk a clicked route one cell per animation.
+            moves = [self._path.popleft()]
+        if self._tween is not None:
+            # Waiting moves cut the current animation short so input never lags behind.
+            if self._tween.step(now) or moves:
+                self._tween.finish()
+                self._tween = None
+        if moves:
+            self.play_moves(moves)
+        if self._editor is None:
+            self.tick_enemies()
+        if self._ghost is not None:
+            old_position = self._ghost.get_position()
+            if self._ghost.advance(self.clock.elapsed()):
+                self.Dungeon.shift('ghost', old_position, self._ghost.get_position())
+        self.draw_status()
+
+        if self._tween is None and (self._game.won() or self._game.check_game_over()):
+            self.end_game()
+        else:
+            self.schedule_frame()
 
-            self.Dungeon.grid(row=0, column=0, sticky='nsew')
-            self.keypad.grid(row=0, column=1, sticky='sw')
+    def tick_enemies(self):
+        """
+        Run the steps of the enemy simulation that are due by the game clock, at a fixed rate whatever the frame
+        rate.
+        """
+        self._life_lost = False
+        for _ in range(self._enemy_clock.advance(self.clock.elapsed())):
+            self._game.tick()
+        for message in self._game.pop_messages():
+            self._toaster.post(message)
+        if self._life_lost:
+            self.redraw()
 
-            self._master.after(50, self.play)
-            self._fr_game.grid(row=1, column=0, sticky='nsew')
+    def end_game(self):
+        """
+        Tells the player they have won or lost, and asks whether to play again (TASK_TWO).
+        """
+        text0 = 'You have finished the level!'
+        text1 = 'You have finished the level with a score of '
+        text2 = 'Would you like to play again?'
 
-        elif self._game.won() and not self._end:
+        if self._game.won() and not self._end:
             if self._task == TASK_ONE:
-                tk.messagebox.showinfo('You Won!', text0)
+                with self.clock.paused('dialog'):
+                    tk.messagebox.showinfo('You Won!', text0)
                 self.quit()
             elif self._task == TASK_TWO:
-                response = tk.messagebox.askyesno('You Won!', text1 + str(self.t) +'\n'+ text2)
+                self.gettime()
+                rank, total = self._scores.rank(self._dungeon_name, self.t)
+                self._scores.record(self._dungeon_name, self.t, self._game.get_moves_used(),
+                                    encode_replay(self._replay))
+                ranking = 'Rank ' + str(rank) + ' of ' + str(total) + ' runs of this level'
+                with self.clock.paused('dialog'):
+                    response = tk.messagebox.askyesno('You Won!',
+                                                      text1 + str(self.t) + '\n' + ranking + '\n' + text2)
                 if response == True:
                     self.newgame()
-                    self.play()
                 else:
                     self.quit()
         elif self._game.check_game_over() and not self._end:
             if self._task == TASK_ONE:
-                tk.messagebox.showinfo('You Losed!', LOSE_TEST)
+                with self.clock.paused('dialog'):
+                    tk.messagebox.showinfo('You Losed!', LOSE_TEST)
                 self.quit()
             elif self._task == TASK_TWO:
-                response = tk.messagebox.askyesno('You Losed!', LOSE_TEST + '\n' + text2)
+                with self.clock.paused('dialog'):
+                    response = tk.messagebox.askyesno('You Losed!', LOSE_TEST + '\n' + text2)
                 if response == True:
                     self.newgame()
-                    self.play()
                 else:
                     self.quit()
 
-
     def gettime(self):
         """
-        Get the game time.
+        Get the game time, in seconds to the hundredth.
         """
-        now = time.time()
-        self.t = int(now - self.start) + self.timeoffset
+        self.t = round(self.clock.elapsed(), 2)
 
     def quit(self, event=0):
         """
         Quit the game.
         Parameters
         """
-        response = tk.messagebox.askyesno('Quit?','Are you sure you would like to quit the game?')
+        with self.clock.paused('dialog'):
+            response = tk.messagebox.askyesno('Quit?','Are you sure you would like to quit the game?')
         if response == True:
             self._end = True
+            self.close()
             self._master.destroy()
 
+    def close(self):
+        """
+        Close the score store, writing out any scores still waiting.
+        """
+        if self._scores is not None:
+            self._scores.close()
+
+    def create_game(self):
+        """
+        Start a new game of the level and listen to the events the view reacts to.
+        """
+        if self._world is None:
+            self._game = GameLogic(self._dungeon_name, self._lives)
+        else:
+            self._world.set_removed(frozenset())
+            self._world.load_start()
+            self._game = GameLogic(self._dungeon_name, self._lives, dungeon=self._world, moves=WORLD_MOVES)
+            self._world.follow(self._game)
+        self._game.subscribe(ItemPicked, lambda event: self._changed.add(event.position))
+        self._game.subscribe(LifeLost, self.on_life_lost)
+        self._game.subscribe(Restored, self.on_restored)
+        self._game.subscribe(EnemiesMoved, self.on_enemies_moved)
+        self._game.subscribe(MovesChanged, self.on_moves_changed)
+        self._moves_left = self._game.get_player().moves_remaining()
+        self._routes = RouteCache(self._game)
+        self._enemy_clock.reset()
+
+    def on_life_lost(self, event):
+        """
+        Remember that a life was lost, so the moves waiting to be played are dropped and the game is drawn again
+        from its checkpoint.
+        """
+        self._life_lost = True
+        # The moves since the checkpoint are thrown away, so they can no longer be undone or redone.
+        self._undo.clear()
+        self._redo.clear()
+
+    def on_restored(self, event):
+        """
+        Keep the move log and the moves left in step with the game: moves taken back by an undo or a lost life are
+        dropped from the log.
+        """
+        del self._replay[event.state.moves_used:]
+        self._moves_left = event.state.move_count
+
+    def on_moves_changed(self, event):
+        """
+        Remember the moves left for the status bar, which is drawn every frame.
+        """
+        self._moves_left = event.moves
+
     def newgame(self, event=0):
         """
         Restart the game.
         """
-        self.start = time.time()
-        self._game = GameLogic(self._dungeon_name)
+        self.clock.reset()
+        self.create_game()
+        self._undo.clear()
+        self._redo.clear()
+        self._replay = []
+        if self.Dungeon is not None:
+            self.play()
 
     def on_Button(self, event):
         """
         Click the KeyPad to control the player.
         """
-        self._direction = self.keypad.pixel_to_direction((event.x, event.y))
-        self.move(self._direction)
+        direction = self.keypad.pixel_to_direction((event.x, event.y))
+        if direction is not None and self._editor is None:
+            self._direction = direction
+            self._path.clear()
+            self._input.tap(direction)
+
+    def on_map_click(self, event):
+        """
+        Click a cell of the dungeon map to walk the player there along a shortest route.
+        """
+        if self._editor is not None:
+            return
+        row, col = self.Dungeon.pixel_to_position((event.x, event.y))
+        start = self._game.get_player().get_position()
+        if self._world is not None:
+            # The map shows the cells around the player, with the player in the middle.
+            half = VIEWPORT_SIZE // 2
+            row, col = row + start[0] - half, col + start[1] - half
+        route = self._routes.route(start, (row, col))
+        if route is None:
+            self._toaster.post("No way there")
+        else:
+            self._path = deque(route)
 
     def on_key_press(self, event):
         """
         Press the Key to control the player.
         """
         c = event.char
-        if c == 'w':
-            self._direction = 'W'
-        elif c == 's':
-            self._direction = 'S'
-        elif c == 'a':
-            self._direction = 'A'
-        elif c == 'd':
-            self._direction = 'D'
-        self.move(self._direction)
+        if self._editor is not None:
+            if c in EDITOR_BRUSHES:
+                self._brush = EDITOR_BRUSHES[c]
+                self.show_editor_info()
+            return
+        elif c == UNDO_KEY:
+            self.undo()
+            return
+        elif c == REDO_KEY:
+            self.redo()
+            return
+        elif event.keysym.lower() in KEY_DIRECTIONS:
+            self._direction = KEY_DIRECTIONS[event.keysym.lower()]
+            self._path.clear()
+            self._input.press(self._direction, time.perf_counter(), getattr(event, 'time', None))
+
+    def on_key_release(self, event):
+        """
+        Release a Key controlling the player.
+        """
+        if event.keysym.lower() in KEY_DIRECTIONS:
+            self._input.release(KEY_DIRECTIONS[event.keysym.lower()], time.perf_counter(), getattr(event, 'time', None))
+
+    def on_focus_out(self, event):
+        """
+        Pause the clock while the window is in the background, and let go of the keys held down: their releases go
+        to whichever window has the focus now.
+        """
+        self.clock.pause('focus')
+        self._input.release_all()
 
     def move(self, direction):
         """
@@ -1086,15 +1403,137 @@ class GameApp():
         Parameters
             direction: 'W', 'S' ,'A' or 'D'
         """
-        if direction in DIRECTIONS:
-            entity = self._game.get_entity_in_direction(direction)
-            if not self._game.collision_check(direction):
-                self._game.move_player(direction)
-            else:
-                tk.messagebox.showinfo('Warn', INVALID)
-            self._game.get_player().change_move_count(-1)
-            if entity and entity.can_collide():
-                entity.on_hit(self._game)
+        self.play_moves([direction])
+
+    def play_moves(self, directions):
+        """
+        Play several moves in the game, then draw the result once.
+
+        Parameters
+            directions: list of 'W', 'S' ,'A' or 'D'
+        """
+        old_position = self._game.get_player().get_position()
+        self._changed.clear()
+        self._life_lost = False
+        for direction in directions:
+            if direction not in DIRECTIONS or self._game.won() or self._game.check_game_over() or self._life_lost:
+                break
+            self._undo.append(self._game.snapshot())
+            self._redo.clear()
+            self._replay.append((direction, self.clock.elapsed()))
+            if not self._game.play_move(direction):
+                self._toaster.post(INVALID)
+        for message in self._game.pop_messages():
+            self._toaster.post(message)
+        if self._life_lost:
+            # A life was lost and the game went back to its checkpoint.
+            self.redraw()
+            return
+        if self._world is not None:
+            # The map follows the player, so every cell on it may have changed.
+            self.draw_view()
+            return
+
+        new_position = self._game.get_player().get_position()
+        if self._fog and new_position != old_position:
+            self.update_fog(new_position)
+        for cell in self._changed:
+            if not self._fog or self._fov.is_visible(cell):
+                self.Dungeon.draw_cell(cell, SPACE)
+        if abs(new_position[0] - old_position[0]) + abs(new_position[1] - old_position[1]) == 1:
+            self._tween = Tween(self.Dungeon, 'player', self.Dungeon.get_position_center(old_position),
+                                self.Dungeon.get_position_center(new_position), self._move_duration)
+        elif new_position != old_position:
+            self.Dungeon.draw_player(new_position)
+
+    def undo(self, event=0):
+        """
+        Take back the last move.
+        """
+        if self._undo and not self._game.won():
+            state = self._undo.pop()
+            self._redo.append((self._game.snapshot(), self._replay[state.moves_used:]))
+            self._game.restore(state)
+            self.redraw()
+
+    def redo(self, event=0):
+        """
+        Play again the last move taken back.
+        """
+        if self._redo:
+            state, moves = self._redo.pop()
+            self._undo.append(self._game.snapshot())
+            self._replay.extend(moves)
+            self._game.restore(state)
+            self.redraw()
+
+    def toggle_editor(self):
+        """
+        Open the level editor on the current level, or close it and go back to the game. Chunked worlds cannot be
+        edited.
+        """
+        if self._world is not None:
+            return
+        if self._editor is None:
+            self.clock.pause('editor')
+            self._editor = LevelEditor(self._game.get_level().rows)
+            self._editor_map = AdvancedDungeonMap(self._fr_game, self._editor.get_size(), 600)
+            for row in range(self._editor.get_size()):
+                for col in range(self._editor.get_size()):
+                    self._editor_map.draw_cell((row, col), self._editor.get_char((row, col)))
+            self._editor_map.bind('<Button-1>', self.on_editor_click)
+            self._editor_map.bind('<B1-Motion>', self.on_editor_click)
+            self._editor_map.bind('<Configure>', self.on_resize)
+            self._editor_map.grid(row=0, column=0, sticky='nsew')
+            self._editor_info = tk.Label(self._fr_game, justify='left', font=('Arial', 14))
+            self._editor_info.grid(row=0, column=1, sticky='nw')
+            self.show_editor_info()
+        else:
+            self._editor_map.destroy()
+            self._editor_info.destroy()
+            self._editor = None
+            self.clock.resume('editor')
+
+    def on_editor_click(self, event):
+        """
+        Paint the clicked cell of the level editor with the current brush. Only the cells that change are redrawn.
+        """
+        position = self._editor_map.pixel_to_position((event.x, event.y))
+        row, col = position
+        if not (0 <= row < self._editor.get_size() and 0 <= col < self._editor.get_size()):
+            return
+        changed = self._editor.paint(position, self._brush)
+        for cell, char in changed.items():
+            self._editor_map.draw_cell(cell, char)
+        if changed:
+            self.show_editor_info()
+
+    def show_editor_info(self):
+        """
+        Show the current brush and whether the edited level can be solved.
+        """
+        lines = ['Brush: ' + BRUSH_NAMES[self._brush]]
+        lines += [key + ': ' + BRUSH_NAMES[char] for key, char in EDITOR_BRUSHES.items()]
+        moves = self._editor.min_moves()
+        if moves is None:
+            lines.append('Cannot be solved')
+        else:
+            lines.append('Solvable in ' + str(moves) + ' moves')
+        if self._dungeon_name in GAME_LEVELS:
+            lines.append('Moves allowed: ' + str(GAME_LEVELS[self._dungeon_name]))
+        self._editor_info.config(text='\n'.join(lines))
+
+    def save_level(self):
+        """
+        Prompt the user for a file and save the level being edited in the level file format.
+        """
+        if self._editor is None:
+            return
+        from tkinter import filedialog
+        with self.clock.paused('dialog'):
+            file_path = filedialog.asksaveasfilename(defaultextension='.txt')
+        if file_path:
+            self._editor.save(file_path)
 
     def savegame(self):
         """
@@ -1105,35 +1544,57 @@ class GameApp():
             player's moves remaining
             player's position
             dungeon name
-        """
-        file_path = filedialog.askopenfilename()
-        with open(file_path, 'w') as f:
-            m = self._game._player.moves_remaining()
-            ply = self._game._player.get_position()
+            move log of the run
+        """
+        from tkinter import filedialog
+        self.gettime()
+        with self.clock.paused('dialog'):
+            file_path = filedialog.askopenfilename()
+        with tracing.span("GameApp.savegame write"), open(file_path, 'w') as f:
+            m = self._game.get_player().moves_remaining()
+            ply = self._game.get_player().get_position()
             f.write(str(self.t)+'\n')
             f.write(str(m)+'\n')
             f.write(str(ply)+ '\n')
-            f.write(self._dungeon_name)
+            f.write(self._dungeon_name + '\n')
+            f.write(encode_replay(self._replay))
 
     def loadgame(self):
         """
         Prompt the user for the location of the file(.txt) to load a game from and load the
         game described in that file.
         """
-        file_path = filedialog.askopenfilename()
-        with open(file_path, 'r') as f:
-            self.start = time.time()
-            self.timeoffset = int(f.readline())
-            self._game._player.move_count = int(f.readline())
-            position_str = f.readline()
-            self._game._player.position = (int(float(position_str[1])), int(float(position_str[4])))
-            self._dungeon_name = f.readline()
+        from tkinter import filedialog
+        with self.clock.paused('dialog'):
+            file_path = filedialog.askopenfilename()
+        with tracing.span("GameApp.loadgame read"), open(file_path, 'r') as f:
+            self.clock.reset(float(f.readline()))
+            m = int(f.readline())
+            position_str = f.readline().strip()
+            ply = tuple(int(n) for n in position_str[1:-1].split(','))
+            self._dungeon_name = f.readline().rstrip('\n')
+            self._replay = list(decode_replay(f.readline()))
+        self._undo.clear()
+        self._redo.clear()
+        self._game.restore(self._game.snapshot()._replace(position=ply, move_count=m, moves_used=len(self._replay)))
+        self.redraw()
+
+# game_logic stays free of tracing so the rules import quickly; its functions are registered here.
+for owner, attribute in ((GameApp, 'play'), (GameApp, 'move'), (GameApp, 'play_moves'), (GameApp, 'frame'),
+                         (DungeonMap, 'draw_grid'), (AdvancedDungeonMap, 'draw_grid'), (StatusBar, 'draw'),
+                         (GameLogic, 'get_entity')):
+    tracing.register(owner, attribute)
 
 def main():
+    trace_file = os.environ.get(tracing.TRACE_ENV)
+    if trace_file:
+        tracing.enable()
     master = tkinter.Tk()
     game = GameApp(master, TASK_TWO, "game2.txt") # TASK_ONE or TASK_TWO
     game.play()
     master.mainloop()
+    if trace_file:
+        tracing.save(trace_file)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Pre-scaled sprites for the images mode (TASK_TWO).
+
+Every sprite is scaled ahead of time into a fixed set of size buckets by a thread pool. Scaled images are kept on
+disk, named after a hash of the source image and the bucket size, so later runs just load them. Drawing at a given
+cell size takes the nearest bucket that is ready, which is already close to the right size, so the UI thread never
+scales a full-size source image.
+
+PIL is imported inside the functions that use it, so importing this module stays cheap.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+IMAGES_DIR = "images"
+CACHE_DIR = ".sprite_cache"
+
+# The source file of each sprite, and whether it is stretched to fill a cell or shrunk to fit inside it.
+SPRITE_FILES = {
+    "wall": ("wall.png", True),
+    "empty": ("empty.png", True),
+    "key": ("key.png", False),
+    "moveIncrease": ("moveIncrease.png", False),
+    "door": ("door.gif", False),
+    "player": ("player.png", False),
+    "clock": ("clock.png", False),
+    "lightning": ("lightning.png", False),
+    "lives": ("lives.png", False),
+}
+
+SIZE_BUCKETS = (16, 24, 32, 48, 64, 96, 128, 192, 256)
+
+_shared = None
+
+
+def bucket_for(size) -> int:
+    """
+    Returns the smallest bucket at least as large as a size, or the largest bucket.
+
+    Parameters:
+        size(int): The size wanted, in pixels.
+
+    Returns:
+        int: A size from SIZE_BUCKETS.
+    """
+    for bucket in SIZE_BUCKETS:
+        if bucket >= size:
+            return bucket
+    return SIZE_BUCKETS[-1]
+
+
+def shared_cache():
+    """
+    Returns the SpriteCache shared by the whole program, creating it on first use.
+
+    Returns:
+        SpriteCache: The shared cache.
+    """
+    global _shared
+    if _shared is None:
+        _shared = SpriteCache()
+    return _shared
+
+
+class SpriteCache:
+    """
+    Sprites scaled into size buckets by a thread pool, backed by an on-disk cache.
+    """
+
+    def __init__(self, images_dir=IMAGES_DIR, cache_dir=CACHE_DIR, workers=None):
+        """
+        Constructor of the SpriteCache class.
+
+        Parameters:
+            images_dir(str): The directory of the source images.
+            cache_dir(str): The directory scaled images are kept in.
+            workers(int): The number of scaling threads, None for the ThreadPoolExecutor default.
+        """
+        self._images_dir = images_dir
+        self._cache_dir = cache_dir
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sprites")
+        self._jobs = {}
+        self._hashes = {}
+
+    def prepare(self, size):
+        """
+        Starts scaling every sprite into the bucket for a size, and the buckets either side of it, in the background.
+
+        Parameters:
+            size(int): The size the sprites will be drawn at, in pixels.
+        """
+        index = SIZE_BUCKETS.index(bucket_for(size))
+        for bucket in SIZE_BUCKETS[max(0, index - 1):index + 2]:
+            for name in SPRITE_FILES:
+                self._submit(name, bucket)
+
+    def is_ready(self, name, width, height) -> bool:
+        """
+        Returns True if a sprite has been scaled into the bucket for a width and height.
+
+        Parameters:
+            name(str): The name of the sprite in SPRITE_FILES.
+            width(int): The width to draw the sprite at.
+            height(int): The height to draw the sprite at.
+        """
+        job = self._jobs.get((name, bucket_for(max(width, height))))
+        return job is not None and job.done()
+
+    def get_image(self, name, width, height, wait=True):
+        """
+        Returns a sprite as a PIL image scaled for a width and height. The bucket for that size is used when it is
+        ready, otherwise the nearest ready bucket.
+
+        Parameters:
+            name(str): The name of the sprite in SPRITE_FILES.
+            width(int): The width to draw the sprite at.
+            height(int): The height to draw the sprite at.
+            wait(bool): Whether to wait for the bucket if no bucket of the sprite is ready yet.
+
+        Returns:
+            PIL.Image.Image: The scaled sprite, or None if none is ready and wait is False.
+        """
+        bucket = bucket_for(max(width, height))
+        job = self._submit(name, bucket)
+        if not job.done():
+            ready = [b for b in SIZE_BUCKETS if (name, b) in self._jobs and self._jobs[name, b].done()]
+            if ready:
+                job = self._jobs[name, min(ready, key=lambda b: abs(b - bucket))]
+            elif not wait:
+                return None
+        image = job.result()
+        fill = SPRITE_FILES[name][1]
+        if fill:
+            return image.resize((int(width), int(height)))
+        image = image.copy()
+        image.thumbnail((width, height))
+        return image
+
+    def shutdown(self):
+        """
+        Stops the scaling threads once the queued work is done.
+        """
+        self._pool.shutdown(wait=True)
+
+    def _submit(self, name, bucket):
+        """
+        Returns the job scaling a sprite into a bucket, starting it if needed.
+
+        Parameters:
+            name(str): The name of the sprite in SPRITE_FILES.
+            bucket(int): The bucket size.
+        """
+        key = (name, bucket)
+        if key not in self._jobs:
+            self._jobs[key] = self._pool.submit(self._load, name, bucket)
+        return self._jobs[key]
+
+    def _load(self, name, bucket):
+        """
+        Runs on a scaling thread: loads a sprite scaled into a bucket from the disk cache, or scales it and saves it.
+
+        Parameters:
+            name(str): The name of the sprite in SPRITE_FILES.
+            bucket(int): The bucket size.
+
+        Returns:
+            PIL.Image.Image: The scaled sprite.
+        """
+        from PIL import Image
+
+        filename, fill = SPRITE_FILES[name]
+        source = os.path.join(self._images_dir, filename)
+        cached = os.path.join(self._cache_dir, "%s-%s-%d.png" % (name, self._source_hash(source), bucket))
+        if os.path.exists(cached):
+            with Image.open(cached) as image:
+                image.load()
+                return image
+
+        with Image.open(source) as image:
+            image = image.convert("RGBA")
+        if fill:
+            image = image.resize((bucket, bucket), Image.LANCZOS)
+        else:
+            image.thumbnail((bucket, bucket), Image.LANCZOS)
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        partial = cached + ".%d.tmp" % os.getpid()
+        image.save(partial, "PNG")
+        os.replace(partial, cached)
+        return image
+
+    def _source_hash(self, path):
+        """
+        Returns a short hash of a source image's contents, so edited images are scaled again.
+
+        Parameters:
+            path(str): The source image.
+        """
+        if path not in self._hashes:
+            with open(path, "rb") as file:
+                self._hashes[path] = hashlib.sha1(file.read()).hexdigest()[:16]
+        return self._hashes[path]
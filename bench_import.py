@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Measures how long importing the game modules takes in a fresh interpreter.
+
+Each module is imported in a new process several times and the fastest import is reported, timed inside the
+interpreter so start-up is not counted. The GUI modules each import pulls in are listed alongside:
+
+    python bench_import.py
+    python bench_import.py --runs 20 game_logic a3
+
+Compile the modules first (python -m compileall .) if PYTHONDONTWRITEBYTECODE is set, otherwise every run includes
+compiling the source.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULES = ["game_logic", "a3"]
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TIMER = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+MODULES = "import sys, {}; print(' '.join(sys.modules))"
+GUI_MODULES = ["tkinter", "PIL"]
+
+
+def time_import(module, runs):
+    """
+    Returns the fastest of several import times of a module, each in a fresh interpreter.
+
+    Parameters:
+        module(str): The name of the module to import.
+        runs(int): The number of interpreters to start.
+
+    Returns:
+        float: The fastest import time, in seconds.
+    """
+    best = None
+    for _ in range(runs):
+        elapsed = float(run_python(TIMER.format(module)).split()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def gui_modules_loaded(module):
+    """
+    Returns the GUI modules that importing a module loads.
+
+    Parameters:
+        module(str): The name of the module to import.
+
+    Returns:
+        list<str>: The names in GUI_MODULES found in sys.modules after the import.
+    """
+    loaded = run_python(MODULES.format(module)).split()
+    return [name for name in GUI_MODULES if name in loaded]
+
+
+def run_python(statement):
+    """
+    Runs a statement in a fresh interpreter started in the game directory.
+
+    Parameters:
+        statement(str): The Python code to run.
+
+    Returns:
+        str: What the statement printed.
+    """
+    return subprocess.run([sys.executable, "-c", statement], cwd=HERE, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time importing the game modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        elapsed = time_import(module, args.runs)
+        gui = ", ".join(gui_modules_loaded(module)) or "none"
+        print("{:<12} {:8.2f} ms   GUI modules loaded: {}".format(module, elapsed * 1000, gui))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Chunked caves for dungeons too large to hold in memory.
+
+The cave is split into square chunks that are read from a directory of chunk files, or generated from a seed, the
+first time a position in them is looked at. A ChunkedWorld keeps only the most recently used chunks and drops the
+least recently used one when it holds too many; items picked up are remembered separately, so a chunk that is loaded
+again still has them removed.
+
+A ChunkedWorld can be given to GameLogic in place of the dungeon read from a level file:
+
+    world = ChunkedWorld(SeededChunks(42))
+    game = GameLogic("world", dungeon=world, moves=WORLD_MOVES)
+    world.follow(game)
+"""
+
+import os
+import random
+from collections import OrderedDict
+
+from a2_support import *
+from game_logic import PlayerMoved
+
+CHUNK_SIZE = 16
+MAX_CHUNKS = 64
+WORLD_MOVES = 60
+
+
+def chunk_of(position, chunk_size=CHUNK_SIZE) -> tuple:
+    """
+    Returns the chunk containing a position.
+
+    Parameters:
+        position(tuple<int, int>): A (row, col) position; it can be negative.
+        chunk_size(int): The width of a chunk.
+
+    Returns:
+        tuple<int, int>: The (row, col) of the chunk.
+    """
+    row, col = position
+    return row // chunk_size, col // chunk_size
+
+
+class DirectoryChunks:
+    """
+    Chunks read from a directory of files named "<row>_<col>.txt", each holding chunk_size lines of chunk_size
+    characters in the level file format. Chunks without a file are solid wall.
+    """
+
+    def __init__(self, directory, chunk_size=CHUNK_SIZE):
+        """
+        Constructor of the DirectoryChunks class.
+
+        Parameters:
+            directory(str): The directory of chunk files.
+            chunk_size(int): The width of a chunk.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+
+    def load(self, chunk) -> tuple:
+        """
+        Reads a chunk.
+
+        Parameters:
+            chunk(tuple<int, int>): The (row, col) of the chunk.
+
+        Returns:
+            tuple<str>: The rows of the chunk.
+        """
+        path = os.path.join(self.directory, "%d_%d.txt" % chunk)
+        if not os.path.exists(path):
+            return (WALL * self.chunk_size,) * self.chunk_size
+        rows = []
+        with open(path, 'r') as file:
+            for line in file:
+                rows.append(line.rstrip("\n").ljust(self.chunk_size, WALL)[:self.chunk_size])
+        rows += [WALL * self.chunk_size] * (self.chunk_size - len(rows))
+        return tuple(rows[:self.chunk_size])
+
+    def start(self) -> tuple:
+        """
+        Returns the chunk the Player starts in: the first chunk file containing the Player.
+
+        Returns:
+            tuple<int, int>: The (row, col) of the chunk.
+        """
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".txt"):
+                continue
+            with open(os.path.join(self.directory, name), 'r') as file:
+                if PLAYER in file.read():
+                    row, col = name[:-4].split("_")
+                    return int(row), int(col)
+        raise ValueError("No chunk in " + self.directory + " contains the Player")
+
+
+def split_level(filename, directory, chunk_size=CHUNK_SIZE):
+    """
+    Splits a level file into chunk files that DirectoryChunks can read.
+
+    Parameters:
+        filename(str): The level file.
+        directory(str): The directory to write the chunk files to.
+        chunk_size(int): The width of a chunk.
+    """
+    with open(filename, 'r') as file:
+        rows = [line.rstrip("\n") for line in file]
+    width = max(len(row) for row in rows)
+    os.makedirs(directory, exist_ok=True)
+    for chunk_row in range(0, len(rows), chunk_size):
+        for chunk_col in range(0, width, chunk_size):
+            lines = [row[chunk_col:chunk_col + chunk_size].ljust(chunk_size, WALL)
+                     for row in rows[chunk_row:chunk_row + chunk_size]]
+            path = os.path.join(directory, "%d_%d.txt" % (chunk_row // chunk_size, chunk_col // chunk_size))
+            with open(path, 'w') as file:
+                file.write("\n".join(lines))
+
+
+class SeededChunks:
+    """
+    An endless cave generated from a seed. Every chunk has an open corridor along its middle row and middle column,
+    so every chunk can be reached from every other. The Player starts in the middle of chunk (0, 0).
+    """
+
+    def __init__(self, seed, chunk_size=CHUNK_SIZE, walls=0.3, keys=0.2, doors=0.1, move_increases=2):
+        """
+        Constructor of the SeededChunks class.
+
+        Parameters:
+            seed: Any value accepted by random.Random; the same seed always gives the same cave.
+            chunk_size(int): The width of a chunk.
+            walls(float): The chance of a cell off the corridors being a wall.
+            keys(float): The chance of a chunk holding a Key.
+            doors(float): The chance of a chunk holding a Door.
+            move_increases(int): How many MoveIncrease items are in each chunk.
+        """
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self._walls = walls
+        self._keys = keys
+        self._doors = doors
+        self._move_increases = move_increases
+
+    def load(self, chunk) -> tuple:
+        """
+        Generates a chunk.
+
+        Parameters:
+            chunk(tuple<int, int>): The (row, col) of the chunk.
+
+        Returns:
+            tuple<str>: The rows of the chunk.
+        """
+        rng = random.Random("%s:%d:%d" % ((self.seed,) + chunk))
+        size = self.chunk_size
+        middle = size // 2
+        grid = [[WALL if rng.random() < self._walls and r != middle and c != middle else SPACE
+                 for c in range(size)] for r in range(size)]
+        corridor = [(middle, c) for c in range(size) if c != middle]
+
+        items = [MOVE_INCREASE] * self._move_increases
+        if rng.random() < self._keys:
+            items.append(KEY)
+        if rng.random() < self._doors:
+            items.append(DOOR)
+        for item, (r, c) in zip(items, rng.sample(corridor, min(len(items), len(corridor)))):
+            grid[r][c] = item
+        if chunk == (0, 0):
+            grid[middle][middle] = PLAYER
+        return tuple("".join(row) for row in grid)
+
+    def start(self) -> tuple:
+        """
+        Returns:
+            tuple<int, int>: The chunk the Player starts in.
+        """
+        return (0, 0)
+
+
+class ChunkedWorld:
+    """
+    A dungeon made of chunks loaded on demand and kept in a least recently used cache. It can be used in place of a
+    DungeonGrid by GameLogic: positions are absolute, can be negative, and lookups work the same on either side of a
+    chunk boundary.
+    """
+
+    def __init__(self, source, max_chunks=MAX_CHUNKS, removed=frozenset()):
+        """
+        Constructor of the ChunkedWorld class. The chunks around the Player's start are loaded straight away.
+
+        Parameters:
+            source(DirectoryChunks or SeededChunks): Where chunks come from.
+            max_chunks(int): The most chunks kept in memory; at least the 3x3 chunks around the Player.
+            removed(frozenset<tuple<int, int>>): The positions that have been cleared.
+        """
+        self._source = source
+        self._chunk_size = source.chunk_size
+        self._max_chunks = max(9, max_chunks)
+        self._chunks = OrderedDict()
+        self._removed = removed
+        self.loads = 0
+        self.load_start()
+
+    def load_start(self):
+        """
+        Loads the chunks around the Player's start, so a new game can find the Player.
+        """
+        row, col = self._source.start()
+        self.load_around((row * self._chunk_size, col * self._chunk_size))
+
+    def get_chunk(self, chunk) -> tuple:
+        """
+        Returns the rows of a chunk, loading it if it is not in memory and dropping the least recently used chunk
+        if too many are.
+
+        Parameters:
+            chunk(tuple<int, int>): The (row, col) of the chunk.
+
+        Returns:
+            tuple<str>: The rows of the chunk.
+        """
+        rows = self._chunks.get(chunk)
+        if rows is not None:
+            self._chunks.move_to_end(chunk)
+            return rows
+        rows = self._source.load(chunk)
+        self.loads += 1
+        self._chunks[chunk] = rows
+        if len(self._chunks) > self._max_chunks:
+            self._chunks.popitem(last=False)
+        return rows
+
+    def load_around(self, position):
+        """
+        Loads the chunk containing a position and the eight chunks around it, so the cells near the Player are
+        ready before they are needed.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        row, col = chunk_of(position, self._chunk_size)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                self.get_chunk((row + dr, col + dc))
+        self.get_chunk((row, col))
+
+    def follow(self, game):
+        """
+        Loads the chunks around the Player every time they move in a game.
+
+        Parameters:
+            game(GameLogic): A game played in this world.
+        """
+        game.subscribe(PlayerMoved, lambda event: self.load_around(event.new_position))
+
+    def resident_chunks(self) -> list:
+        """
+        Returns:
+            list<tuple<int, int>>: The chunks in memory, least recently used first.
+        """
+        return list(self._chunks)
+
+    def get_removed(self) -> frozenset:
+        """
+        Returns:
+            frozenset<tuple<int, int>>: The positions that have been cleared.
+        """
+        return self._removed
+
+    def set_removed(self, removed):
+        """
+        Replaces the set of cleared positions.
+
+        Parameters:
+            removed(frozenset<tuple<int, int>>): The positions that have been cleared.
+        """
+        self._removed = removed
+
+    def remove(self, position):
+        """
+        Clears the character at a position.
+
+        Parameters:
+            position(tuple<int, int>): The (row, col) position to clear.
+        """
+        self._removed = self._removed | {position}
+
+    def remove_all(self, positions):
+        """
+        Clears the characters at several positions.
+
+        Parameters:
+            positions(list<tuple<int, int>>): The (row, col) positions to clear.
+        """
+        self._removed = self._removed | frozenset(positions)
+
+    def get_char(self, position) -> str:
+        """
+        Returns the character at a position, loading its chunk if needed.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            str: The character at the position.
+        """
+        if position in self._removed:
+            return SPACE
+        row, col = position
+        size = self._chunk_size
+        return self.get_chunk((row // size, col // size))[row % size][col % size]
+
+    def get_positions(self, char) -> list:
+        """
+        Returns the positions of a character in the chunks currently in memory, skipping removed positions. The
+        world has no end, so chunks that are not loaded are not searched.
+
+        Parameters:
+            char(str): The character to look for.
+
+        Returns:
+            list<tuple<int, int>>: The positions of the character.
+        """
+        size = self._chunk_size
+        found = []
+        for (chunk_row, chunk_col), rows in self._chunks.items():
+            for r, line in enumerate(rows):
+                c = line.find(char)
+                while c != -1:
+                    position = (chunk_row * size + r, chunk_col * size + c)
+                    if position not in self._removed:
+                        found.append(position)
+                    c = line.find(char, c + 1)
+        return found
+
+    def view(self, top_left, size) -> list:
+        """
+        Returns a square window of the world, e.g. the part shown on screen.
+
+        Parameters:
+            top_left(tuple<int, int>): The (row, col) position of the top left corner of the window.
+            size(int): The width of the window.
+
+        Returns:
+            list<str>: The rows of the window.
+        """
+        top, left = top_left
+        return ["".join(self.get_char((top + r, left + c)) for c in range(size)) for r in range(size)]
+
+    def __len__(self) -> int:
+        """
+        A chunked world has no fixed width, so its length is 0.
+        """
+        return 0
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Field of view for the fog of war mode.
+
+Visible cells are found with symmetric shadowcasting, limited to a view radius, so the work done for a move depends
+on the radius and not on the size of the dungeon. FieldOfView remembers what was visible before the move and reports
+only the cells that appeared or disappeared, so views only redraw those.
+"""
+
+from fractions import Fraction
+
+
+def compute_fov(origin, radius, is_opaque):
+    """
+    Returns the cells visible from a position.
+
+    Parameters:
+        origin(tuple<int, int>): The (row, col) position looked from.
+        radius(int): How far can be seen, in cells.
+        is_opaque(callable): Returns True if a (row, col) position blocks sight.
+
+    Returns:
+        set<tuple<int, int>>: The visible positions, including the origin.
+    """
+    visible = {origin}
+    row, col = origin
+    # Each quadrant maps (depth, column) to a position looking north, south, east or west.
+    quadrants = [
+        lambda depth, c: (row - depth, col + c),
+        lambda depth, c: (row + depth, col + c),
+        lambda depth, c: (row + c, col + depth),
+        lambda depth, c: (row + c, col - depth),
+    ]
+    limit = radius * radius + radius
+    for transform in quadrants:
+        _scan(transform, 1, Fraction(-1), Fraction(1), radius, limit, is_opaque, visible)
+    return visible
+
+
+def _scan(transform, depth, start_slope, end_slope, radius, limit, is_opaque, visible):
+    """
+    Scans one row of a quadrant between two slopes, recursing into the rows behind it.
+
+    Parameters:
+        transform(callable): Maps (depth, column) in the quadrant to a (row, col) position.
+        depth(int): The distance of the row from the origin.
+        start_slope(Fraction): The slope the scan starts at.
+        end_slope(Fraction): The slope the scan ends at.
+        radius(int): How far can be seen, in cells.
+        limit(int): The largest squared distance that is within the radius.
+        is_opaque(callable): Returns True if a (row, col) position blocks sight.
+        visible(set<tuple<int, int>>): The visible positions found so far.
+    """
+    if depth > radius:
+        return
+    previous_opaque = None
+    first = _round_up(depth * start_slope)
+    last = _round_down(depth * end_slope)
+    for c in range(first, last + 1):
+        position = transform(depth, c)
+        opaque = is_opaque(position)
+        in_range = depth * depth + c * c <= limit
+        if in_range and (opaque or depth * start_slope <= c <= depth * end_slope):
+            visible.add(position)
+        if previous_opaque and not opaque:
+            start_slope = Fraction(2 * c - 1, 2 * depth)
+        if previous_opaque is False and opaque:
+            _scan(transform, depth + 1, start_slope, Fraction(2 * c - 1, 2 * depth), radius, limit, is_opaque,
+                  visible)
+        previous_opaque = opaque
+    if previous_opaque is False:
+        _scan(transform, depth + 1, start_slope, end_slope, radius, limit, is_opaque, visible)
+
+
+def _round_up(n):
+    """
+    Rounds a Fraction to the nearest integer, rounding halves up.
+    """
+    return int((n + Fraction(1, 2)) // 1)
+
+
+def _round_down(n):
+    """
+    Rounds a Fraction to the nearest integer, rounding halves down.
+    """
+    return -int((-n + Fraction(1, 2)) // 1)
+
+
+class FieldOfView:
+    """
+    The cells the Player can see, updated move by move.
+    """
+
+    def __init__(self, is_opaque, radius=4):
+        """
+        Constructor of the FieldOfView class.
+
+        Parameters:
+            is_opaque(callable): Returns True if a (row, col) position blocks sight.
+            radius(int): How far the Player can see, in cells.
+        """
+        self._is_opaque = is_opaque
+        self._radius = radius
+        self._visible = set()
+
+    def is_visible(self, position) -> bool:
+        """
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            bool: True if the position is currently visible.
+        """
+        return position in self._visible
+
+    def get_visible(self) -> set:
+        """
+        Returns:
+            set<tuple<int, int>>: The currently visible positions.
+        """
+        return self._visible
+
+    def update(self, origin) -> tuple:
+        """
+        Looks from a new position and returns the changes in what can be seen.
+
+        Parameters:
+            origin(tuple<int, int>): The position the Player is now at.
+
+        Returns:
+            tuple<set, set>: The positions that became visible and the positions that became hidden.
+        """
+        visible = compute_fov(origin, self._radius, self._is_opaque)
+        appeared = visible - self._visible
+        disappeared = self._visible - visible
+        self._visible = visible
+        return appeared, disappeared
+
+    def reset(self):
+        """
+        Forgets what was visible, so the next update reports every visible cell as having appeared.
+        """
+        self._visible = set()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+The clock that times a game.
+
+It is based on time.perf_counter, so changes to the system clock do not affect it, and it can be paused for several
+reasons at once (a dialog, the window losing focus, ...). It only runs while nothing is pausing it.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class GameClock:
+    """
+    A pausable stopwatch measuring game time in seconds.
+    """
+
+    def __init__(self, offset=0.0):
+        """
+        Constructor of the GameClock class. The clock starts running straight away.
+
+        Parameters:
+            offset(float): The game time to start from, in seconds.
+        """
+        self._pauses = set()
+        self.reset(offset)
+
+    def reset(self, offset=0.0):
+        """
+        Restarts the clock from a game time, keeping the reasons it is paused for.
+
+        Parameters:
+            offset(float): The game time to start from, in seconds.
+        """
+        self._banked = offset
+        self._started = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """
+        Returns:
+            float: The game time, in seconds.
+        """
+        if self._pauses:
+            return self._banked
+        return self._banked + time.perf_counter() - self._started
+
+    def is_running(self) -> bool:
+        """
+        Returns:
+            bool: True if nothing is pausing the clock.
+        """
+        return not self._pauses
+
+    def pause(self, reason="pause"):
+        """
+        Stops the clock until resume() is called with the same reason.
+
+        Parameters:
+            reason(str): Why the clock is paused.
+        """
+        if not self._pauses:
+            self._banked += time.perf_counter() - self._started
+        self._pauses.add(reason)
+
+    def resume(self, reason="pause"):
+        """
+        Removes a reason the clock is paused for, and starts it again if there are none left.
+
+        Parameters:
+            reason(str): The reason given to pause().
+        """
+        if reason not in self._pauses:
+            return
+        self._pauses.discard(reason)
+        if not self._pauses:
+            self._started = time.perf_counter()
+
+    @contextmanager
+    def paused(self, reason="pause"):
+        """
+        Pauses the clock for the duration of a with block.
+
+        Parameters:
+            reason(str): Why the clock is paused.
+        """
+        self.pause(reason)
+        try:
+            yield
+        finally:
+            self.resume(reason)
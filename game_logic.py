@@ -0,0 +1,981 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+The rules of Key Cave Adventure: GameLogic and the entities of the dungeon.
+
+This module has no GUI dependencies so scripts, tools and servers can import it without tkinter or PIL.
+
+GameLogic emits events as the game changes. Views subscribe to the events they care about, e.g.
+game.subscribe(ItemPicked, callback), instead of looking at the whole game after every move.
+"""
+
+from collections import namedtuple
+
+from a2_support import *
+from levels import DungeonGrid, get_level
+from simulation import SpatialHash
+
+# Enemies patrol the dungeon; the level file marks where each one starts.
+ENEMY = "E"
+# The characters enemies can walk on.
+ENEMY_FLOOR = (SPACE, PLAYER)
+
+
+# The part of a game that changes while playing. Every field is immutable, so a snapshot shares its removed items with
+# the game and costs the same however large the dungeon is.
+GameState = namedtuple("GameState", ["position", "move_count", "inventory", "removed", "win", "moves_used"])
+
+LIFE_LOST = "You ran out of moves and lost a life!"
+CAUGHT = "An enemy caught you!"
+
+# Events emitted by GameLogic.
+PlayerMoved = namedtuple("PlayerMoved", ["old_position", "new_position"])
+ItemPicked = namedtuple("ItemPicked", ["item", "position"])
+MovesChanged = namedtuple("MovesChanged", ["moves"])
+Won = namedtuple("Won", [])
+Lost = namedtuple("Lost", [])
+LifeLost = namedtuple("LifeLost", ["lives"])
+Restored = namedtuple("Restored", ["state"])
+EnemiesMoved = namedtuple("EnemiesMoved", ["moves"])
+
+
+class GameLogic:
+    """
+    GameLogic contains all the game information and how the game should play out. By default,
+    GameLogic should be constructed with ​GameLogic(dungeon_name=”game1.txt”)​.
+    """
+
+    def __init__(self, dungeon_name="game1.txt", lives=1, dungeon=None, moves=None):
+        """Constructor of the GameLogic class.
+
+        Parameters:
+            dungeon_name (str): The name of the level.
+            lives (int): How many times the Player can run out of moves before the game is lost.
+            dungeon (DungeonGrid): The dungeon to play in instead of the level file, e.g. a ChunkedWorld.
+            moves (int): The moves the Player starts with instead of the level's entry in GAME_LEVELS.
+        """
+
+        self._dungeon = dungeon if dungeon is not None else DungeonGrid(get_level(dungeon_name))
+        self._dungeon_size = len(self._dungeon)
+        self._entities = {WALL: Wall(), DOOR: Door(), MOVE_INCREASE: MoveIncrease(), KEY: Key()}
+
+        # you need to implement the Player class first.
+        self._player = Player(moves if moves is not None else GAME_LEVELS[dungeon_name])
+
+        # The Entities are looked up in the shared dungeon when asked for, so a game only keeps the Player's position.
+        self._player.set_position(self.get_positions(PLAYER)[0])
+
+        self._win = False
+        self._moves_played = 0
+        self._messages = []
+        self._subscribers = {}
+
+        # Enemies move on their own, so they are kept out of the dungeon and found through a spatial hash.
+        self._enemies = []
+        self._enemy_hash = SpatialHash()
+        starts = self.get_positions(ENEMY)
+        if starts:
+            self._dungeon.remove_all(starts)
+        for position in starts:
+            enemy = Enemy(position, self._patrol_direction(position))
+            self._enemy_hash.insert(len(self._enemies), position)
+            self._enemies.append(enemy)
+
+        # Lives and the checkpoint are not part of GameState: undoing a move never gives a life back.
+        self._lives = lives
+        self._checkpoint = self.snapshot()
+
+    def get_positions(self, entity):
+        """ Returns a list of tuples containing all positions of a given Entity
+             type.
+
+        Parameters:
+            entity (str): the id of an entity.
+
+        Returns:
+            )list<tuple<int, int>>): Returns a list of tuples representing the 
+            positions of a given entity id.
+        """
+
+        return self._dungeon.get_positions(entity)
+
+    def get_dungeon_size(self) -> int:
+        '''
+        Returns:
+            int: Return the width of the dungeon as an integer.
+        '''
+        return self._dungeon_size
+
+    def get_char(self, position):
+        """
+        Returns the character of the dungeon at a position, with removed items shown as SPACE.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            str: The character at the position, or None if the position is off the map.
+        """
+        return self._dungeon.get_char(position)
+
+    def get_rows(self) -> list:
+        """
+        Returns:
+            list<str>: The rows of the dungeon as it is now, with removed items shown as SPACE.
+        """
+        return list(self._dungeon)
+
+    def get_level(self):
+        """
+        Returns the parsed level the game is played on, shared with every other game of it.
+
+        Returns:
+            Level: The level, or None if the dungeon is not a parsed level, e.g. a ChunkedWorld.
+        """
+        return self._dungeon.get_level() if isinstance(self._dungeon, DungeonGrid) else None
+
+    def get_removed(self) -> frozenset:
+        """
+        Returns:
+            frozenset<tuple<int, int>>: The positions of the items that have been removed from the dungeon.
+        """
+        return self._dungeon.get_removed()
+
+    def init_game_information(self) -> dict:
+        """
+        This method should return a dictionary containing the position and the corresponding Entity as the
+        keys and values respectively. This method also sets the Player’s position. At the start of the
+        game this method should be called to find the position of all entities within the current dungeon.
+
+        Returns:
+            d(dict<tuple<int, int>): Return a dictionary containing the position and the corresponding Entity.
+        """
+        list_player = self.get_positions(PLAYER)
+        self._player.set_position(list_player[0])
+
+        return self.get_game_information()
+
+    def get_game_information(self) -> dict:
+        """
+        Returns a dictionary containing the position and the corresponding Entity, as the keys and values, for the
+        current dungeon. The dictionary is built from the dungeon on every call.
+
+        Returns:
+            d(dict<tuple<int, int>): Return a dictionary containing the position and the corresponding Entity.
+        """
+        d = {}
+        for char, entity in self._entities.items():
+            for position in self.get_positions(char):
+                d[position] = entity
+
+        return d
+
+    def get_player(self):
+        """
+        This method returns the Player object within the game.
+
+        Returns:
+            Player: Return Player object within the game.
+        """
+        return self._player
+
+    def get_entity(self, position):
+        """
+        Returns an Entity at a given position in the dungeon. Entity in the given direction or if the position is off
+        map then this function should return None
+
+        Parameters:
+            position(tuple<int,int>): Position of the Entity to be returned.
+
+        Returns:
+            Entity or None: Return the Entity in the given direction.
+
+        """
+        return self._entities.get(self._dungeon.get_char(position))
+
+    def get_entity_in_direction(self, direction):
+        """
+        Returns an Entity in the given direction of the Player’s position. If there is no Entity in the given direction
+        or if the direction is off map then this function should return None.
+
+        Parameters:
+            direction(str): Direction of the Player’s position.
+
+        Returns:
+            Entity: Return the Entity at the given direction.
+
+        """
+        new_position = self.new_position(direction)
+        return self.get_entity(new_position)
+
+    def collision_check(self, direction) -> bool:
+        """
+        Returns ​False​ if a player can travel in the given direction, they won’t collide. ​True, they will collide,
+        otherwise
+
+        Parameters:
+            direction(str):The given direction of the player to travel.
+
+        Returns:
+            bool: Return ​False​ if a player can travel in the given direction. ​True, they will collide.
+        """
+        entity = self.get_entity_in_direction(direction)
+        if entity:
+            return not entity.can_collide()
+        else:
+            return False
+
+    def new_position(self, direction) -> tuple:
+        """
+        Returns a tuple of integers that represents the new position given the direction.
+
+        Parameters:
+            direction(str):Given the direction to be updated.
+
+        Returns:
+            new_position(tuple<int,int>): Return the new position given the direction.
+        """
+        dx, dy = DIRECTIONS[direction]
+        x, y = self._player.get_position()
+        new_position = (x + dx, y + dy)
+        return new_position
+
+    def move_player(self, direction) -> None:
+        """
+        Update the Player’s position to place them one position in the given direction.
+
+        Parameters:
+            direction(str): New position of the player.
+        """
+        new_position = self.new_position(direction)
+        self._player.set_position(new_position)
+
+    def play_move(self, direction) -> bool:
+        """
+        Plays one turn in the given direction. The Player moves unless they would collide, one move is used either
+        way, and the Entity at the new position is hit if it can be collided with.
+
+        Parameters:
+            direction(str): The direction the Player moves in.
+
+        Returns:
+            bool: Return False if the Player collided and did not move, True otherwise.
+        """
+        entity = self.get_entity_in_direction(direction)
+        blocked = entity is not None and not entity.can_collide()
+        if not blocked:
+            old_position = self._player.get_position()
+            self.move_player(direction)
+            self.emit(PlayerMoved(old_position, self._player.get_position()))
+        self._player.change_move_count(-1)
+        self._moves_played += 1
+        if entity and entity.can_collide():
+            entity.on_hit(self)
+            if isinstance(entity, Item) and self._can_finish():
+                self._checkpoint = self.snapshot()
+        if self._enemies and self._enemy_hash.at(self._player.get_position()):
+            self.caught()
+        else:
+            self._moves_used()
+        return not blocked
+
+    def get_enemies(self) -> list:
+        """
+        Returns:
+            list<Enemy>: The enemies in the dungeon. An enemy is identified by its index in this list.
+        """
+        return self._enemies
+
+    def enemies_in(self, top_left, bottom_right) -> list:
+        """
+        Returns the enemies inside a rectangle of the dungeon.
+
+        Parameters:
+            top_left(tuple<int, int>): The (row, col) of the top left cell, included.
+            bottom_right(tuple<int, int>): The (row, col) of the bottom right cell, included.
+
+        Returns:
+            list<tuple<int, tuple<int, int>>>: The index and position of each enemy.
+        """
+        return self._enemy_hash.query(top_left, bottom_right)
+
+    def tick(self) -> None:
+        """
+        Advances the enemies by one step of the simulation. Called at a fixed rate, independently of the Player's
+        moves.
+        """
+        if not self._enemies or self._win or self.check_game_over():
+            return
+        get_char = self._dungeon.get_char
+        can_enter = lambda position: get_char(position) in ENEMY_FLOOR
+        move = self._enemy_hash.move
+        moves = []
+        for index, enemy in enumerate(self._enemies):
+            old_position = enemy.position
+            new_position = enemy.patrol(can_enter)
+            if new_position != old_position:
+                move(index, old_position, new_position)
+                moves.append((index, old_position, new_position))
+        if moves:
+            self.emit(EnemiesMoved(moves))
+        if self._enemy_hash.at(self._player.get_position()):
+            self.caught()
+
+    def caught(self) -> None:
+        """
+        An enemy has reached the Player: a life is lost, or the game if it was the last one.
+        """
+        if self._lives > 1:
+            self.lose_life(CAUGHT)
+        else:
+            self.add_message(CAUGHT)
+            self._player.move_count = 0
+            self.emit(MovesChanged(0))
+            self.emit(Lost())
+
+    def _enemy_can_enter(self, position) -> bool:
+        """
+        Returns True if an enemy can walk onto a position: enemies only walk on empty floor.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        return self._dungeon.get_char(position) in ENEMY_FLOOR
+
+    def _patrol_direction(self, position) -> tuple:
+        """
+        Returns the direction an enemy starting at a position patrols in: across the dungeon if it has room to,
+        otherwise up and down.
+
+        Parameters:
+            position(tuple<int, int>): The (row, col) position the enemy starts at.
+        """
+        row, col = position
+        if self._enemy_can_enter((row, col - 1)) or self._enemy_can_enter((row, col + 1)):
+            return DIRECTIONS["D"]
+        return DIRECTIONS["S"]
+
+    def investigate(self, direction):
+        """
+        Looks at the Entity in the given direction, which uses one move.
+
+        Parameters:
+            direction(str): The direction to look in.
+
+        Returns:
+            Entity: The Entity in the given direction, or None.
+        """
+        entity = self.get_entity_in_direction(direction)
+        self._player.change_move_count(-1)
+        self._moves_played += 1
+        self._moves_used()
+        return entity
+
+    def _moves_used(self) -> None:
+        """
+        Announces the Player's moves after a turn, and takes a life or ends the game if they have run out.
+        """
+        self.emit(MovesChanged(self._player.moves_remaining()))
+        if self._win or self._player.moves_remaining() != 0:
+            return
+        if self._lives > 1:
+            self.lose_life()
+        else:
+            self.emit(Lost())
+
+    def _can_finish(self) -> bool:
+        """
+        Returns True if the moves left are enough to walk to a Key, unless one is held, and then to a Door.
+        MoveIncrease items on the way are not counted, so a state this returns False for is never kept as a
+        checkpoint. A parsed level answers from distances it works out once for every game of it; other dungeons,
+        like a ChunkedWorld, are searched only as far as the moves left reach.
+        """
+        moves = self._player.moves_remaining()
+        position = self._player.get_position()
+        has_key = any(isinstance(item, Key) for item in self._player.get_inventory())
+        level = self.get_level()
+        if level is not None:
+            needed = level.moves_to_finish(position, has_key)
+            return needed is not None and needed <= moves
+
+        # Breadth-first over (position, holding a Key), one move per level.
+        start = (position, has_key)
+        seen = {start}
+        frontier = [start]
+        for depth in range(moves + 1):
+            following = []
+            for position, has_key in frontier:
+                char = self._dungeon.get_char(position)
+                if has_key and char == DOOR:
+                    return True
+                if depth == moves:
+                    continue
+                has_key = has_key or char == KEY
+                row, col = position
+                for dr, dc in DIRECTIONS.values():
+                    state = ((row + dr, col + dc), has_key)
+                    if state not in seen and self._dungeon.get_char(state[0]) not in (WALL, None):
+                        seen.add(state)
+                        following.append(state)
+            frontier = following
+        return False
+
+    def get_moves_used(self) -> int:
+        """
+        Returns:
+            int: The moves played to reach the current state of the game. Moves taken back by restoring an earlier
+                state, e.g. an undo or a lost life, are not counted.
+        """
+        return self._moves_played
+
+    def get_lives(self) -> int:
+        """
+        Returns:
+            int: The number of lives left, including the one being played.
+        """
+        return self._lives
+
+    def lose_life(self, message=LIFE_LOST) -> None:
+        """
+        Takes a life from the Player and returns the game to the last checkpoint: the start of the level, or the
+        last time an Item was picked up with enough moves left to finish the level.
+
+        Parameters:
+            message(str): The message telling the Player why they lost a life.
+        """
+        self._lives -= 1
+        self.emit(LifeLost(self._lives))
+        self.restore(self._checkpoint)
+        self.add_message(message)
+
+    def subscribe(self, event_type, callback) -> None:
+        """
+        Calls a function every time an event of the given type is emitted.
+
+        Parameters:
+            event_type(type): An event type, e.g. PlayerMoved.
+            callback(callable): Called with the event.
+        """
+        self._subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback) -> None:
+        """
+        Stops calling a function subscribed with subscribe().
+
+        Parameters:
+            event_type(type): The event type it was subscribed to.
+            callback(callable): The function that was subscribed.
+        """
+        callbacks = self._subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, event) -> None:
+        """
+        Calls the functions subscribed to the type of an event, in the order they subscribed.
+
+        Parameters:
+            event: One of the event namedtuples, e.g. PlayerMoved(old_position, new_position).
+        """
+        for callback in self._subscribers.get(type(event), ()):
+            callback(event)
+
+    def check_game_over(self) -> bool:
+        """
+        Return True if the game has been ​lost and False otherwise.
+
+        Returns:
+            bool: Return True if the game has been ​lost and False otherwise.
+        """
+        if self._player.moves_remaining() == 0:
+            return True
+        else:
+            return False
+
+    def set_win(self, win) -> None:
+        """
+        Set the game’s win state to be True or False.
+
+        Parameters:
+            win(bool): The game’s win state to be True or False.
+        """
+        won = win and not self._win
+        self._win = win
+        if won:
+            self.emit(Won())
+
+    def won(self) -> bool:
+        """
+        Return game’s win state.
+
+        Returns:
+            bool:Return game’s win state.
+        """
+        return self._win
+
+    def add_message(self, message) -> None:
+        """
+        Add a message for the player. Messages are kept until the front-end collects them with pop_messages().
+
+        Parameters:
+            message(str): The message to show the player.
+        """
+        self._messages.append(message)
+
+    def pop_messages(self) -> list:
+        """
+        Returns the messages added since the last call and forgets them.
+
+        Returns:
+            list<str>: The messages, oldest first.
+        """
+        messages = self._messages
+        self._messages = []
+        return messages
+
+    def remove_entity(self, position) -> None:
+        """
+        Remove the Entity at the given position from the dungeon. The shared level is left untouched; only this
+        game's view of it changes.
+
+        Parameters:
+            position(tuple<int, int>): The position of the Entity to be removed.
+        """
+        self._dungeon.remove(position)
+
+    def snapshot(self) -> GameState:
+        """
+        Returns a snapshot of the state of the game that can later be passed to restore().
+
+        Returns:
+            GameState: The Player's position, move count and inventory, the removed Entities, the win state and the
+                moves used so far.
+        """
+        return GameState(self._player.get_position(), self._player.moves_remaining(),
+                         tuple(self._player.get_inventory()), self._dungeon.get_removed(), self._win,
+                         self._moves_played)
+
+    def restore(self, state) -> None:
+        """
+        Returns the game to the state it was in when the snapshot was taken.
+
+        Parameters:
+            state(GameState): A snapshot returned by snapshot().
+        """
+        self._player.set_position(state.position)
+        self._player.move_count = state.move_count
+        self._player.inventory = list(state.inventory)
+        self._dungeon.set_removed(state.removed)
+        self._win = state.win
+        self._moves_played = state.moves_used
+        self.emit(Restored(state))
+
+
+class Entity:
+    """
+    Each Entity has an id, and can either be collided with (two entities can be in the same position)
+    or not (two entities cannot be in the same position.) The collidable attribute should be set to
+    True for an Entity upon creation. Entity should be constructed with Entity().
+    """
+
+    def __init__(self):
+        """
+        Constructor of the Entity class.
+        """
+        self.id = 'Entity'
+        self.collidable = True
+
+    def get_id(self) -> str:
+        """
+        Returns a string that represents the Entity’s ID.
+
+        Returns:
+            self.id(str): Returns a string that represents the Entity’s ID.
+        """
+        return self.id
+
+    def set_collide(self, collidable: bool):
+        """
+        Set the collision state for the Entity to be True
+
+        Parameters:
+            collidable(bool): The collision state for the Entity.
+        """
+        self.collidable = collidable
+
+    def can_collide(self) -> bool:
+        """
+        Returns True if the Entity can be collided with (another Entity can share the position that this one is in)
+        and False otherwise.
+
+        Returns:
+            bool: Returns True if the Entity can be collided with and False otherwise.
+        """
+        return self.collidable
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the Entity. e.g. "Entity('Entity')"
+
+        Returns:
+            s(str): Return the string representation of the Entity.
+        """
+        s = "Entity('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+
+class Wall(Entity):
+    """
+    A Wall is a special type of an Entity within the game.
+    The Wall Entity cannot be collided with. Wall should be constructed with Wall().
+    """
+
+    def __init__(self):
+        """
+        Constructor of the Wall class.
+        """
+        self.id = WALL
+        self.collidable = False
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the Wall. e.g. "Wall('#')"
+
+        Returns:
+            s(str): Return the string representation of the Wall.
+        """
+        s = "Wall('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+
+class Item(Entity):
+    """
+    An Item is a special type of an Entity within the game. This is an abstract class.
+    By default the Item Entity can be collided with. Item should be constructed with Item().
+    """
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the Wall. e.g. "Item('Entity')"
+
+        Returns:
+            s(str): Return the string representation of the Wall.
+        """
+        s = "Item('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+    def on_hit(self, game: GameLogic):
+        """
+        This function should raise the NotImplementedError.
+
+        Parameters:
+            game(GameLogic): The game.
+        """
+        raise NotImplementedError
+
+
+
+class Key(Item):
+    """
+    A Key is a special type of Item within the game.
+    The Key Item can be collided with. Key should be constructed with Key().
+    """
+
+    def __init__(self):
+        """
+        Constructor of the Key class.
+        """
+        self.id = KEY
+        self.collidable = True
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the Key. e.g. "Key('K')"
+
+        Returns:
+            s(str): Return the string representation of the Key.
+        """
+        s = "Key('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+    def on_hit(self, game: GameLogic) -> None:
+        """
+        When the player takes the Key the Key should be added to the Player’s inventory. The Key should then be
+        removed from the dungeon once it’s in the Player’s inventory.
+
+        Parameters:
+            game(GameLogic): The game.
+        """
+        player = game.get_player()
+        player.add_item(self)
+        game.remove_entity(player.get_position())
+        game.emit(ItemPicked(self, player.get_position()))
+
+
+class MoveIncrease(Item):
+    """
+    MoveIncrease is a special type of Item within the game. The MoveIncrease Item can be collided with. MoveIncrease
+    should be constructed with MoveIncrease(moves=5: int) where moves describe how many extra moves the Player will be
+    granted when they collect this Item, the default value should be 5.
+    """
+
+    def __init__(self, moves=5):
+        """
+        Constructor of the MoveIncrease class.
+
+        Parameters:
+            moves(int): moves describe how many extra moves the Player will be granted when they collect this Item.
+        """
+        self.id = MOVE_INCREASE
+        self.collidable = True
+        self.moves = moves
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the MoveIncrease. e.g. "MoveIncrease('M')"
+
+        Returns:
+            s(str): Return the string representation of the MoveIncrease.
+        """
+        s = "MoveIncrease('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+    def on_hit(self, game) -> None:
+        """
+        When the player hits the MoveIncrease (M) item the number of moves for the player increases and the M item is
+        removed from the game. These actions are implemented via the on_hit method. Specifically, extra moves should
+        be granted to the Player and the M item should be removed from the game.
+
+        Parameters:
+            game(GameLogic): The game.
+        """
+        player = game.get_player()
+        player.change_move_count(self.moves)
+        game.remove_entity(player.get_position())
+        game.emit(ItemPicked(self, player.get_position()))
+
+
+class Door(Entity):
+    """
+    A Door is a special type of an Entity within the game. The Door Entity can be collided with (The Player should be
+    able to share its position with the Door when the Player enters the Door.) Door should be constructed with Door().
+    """
+
+    def __init__(self):
+        """
+        Constructor of the Door class.
+        """
+        self.id = DOOR
+        self.collidable = True
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the Door. e.g. "Door('D')"
+
+        Returns:
+            s(str): Return the string representation of the Door.
+        """
+        s = "Door('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+    def on_hit(self, game: GameLogic) -> None:
+        '''t'''
+        player = game.get_player()
+        inventory = player.get_inventory()
+        if inventory:
+            game.set_win(True)
+        else:
+            game.add_message("You don't have the key!")
+
+
+
+class Enemy(Entity):
+    """
+    An Enemy patrols back and forth in a straight line, turning round when its way is blocked. The Player loses a
+    life when an Enemy reaches them. Enemy should be constructed with Enemy(position, direction).
+    """
+
+    def __init__(self, position, direction=(0, 1)):
+        """
+        Constructor of the Enemy class.
+
+        Parameters:
+            position(tuple<int, int>): The position the Enemy starts at.
+            direction(tuple<int, int>): The (row, col) step the Enemy takes each tick.
+        """
+        self.id = ENEMY
+        self.collidable = True
+        self.position = position
+        self.direction = direction
+
+    def get_position(self) -> tuple:
+        """
+        Returns:
+            tuple<int, int>: The position of the Enemy.
+        """
+        return self.position
+
+    def patrol(self, can_enter) -> tuple:
+        """
+        Takes one step, turning round first if the way ahead is blocked. An Enemy blocked both ways stays put.
+
+        Parameters:
+            can_enter(callable): Returns True if the Enemy can walk onto a (row, col) position.
+
+        Returns:
+            tuple<int, int>: The new position of the Enemy.
+        """
+        row, col = self.position
+        dr, dc = self.direction
+        if not can_enter((row + dr, col + dc)):
+            dr, dc = self.direction = (-dr, -dc)
+            if not can_enter((row + dr, col + dc)):
+                return self.position
+        self.position = (row + dr, col + dc)
+        return self.position
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the Enemy. e.g. "Enemy('E')"
+
+        Returns:
+            s(str): Return the string representation of the Enemy.
+        """
+        s = "Enemy('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
+
+
+class Player(Entity):
+    """
+    A Player is a special type of an Entity within the game. The Player Entity can be collided with. The Player
+    should be constructed with Player(move_count: int) where moves represents how many moves a Player can have for
+    the given dungeon they are in (see GAME_LEVELS).
+    """
+
+    def __init__(self, move_count):
+        """
+        Constructor of the Player class.
+
+        Parameters:
+            move_count(int): moves represents how many moves a Player can have for the given dungeon they are in.
+        """
+        self.id = PLAYER
+        self.collidable = True
+        self.move_count = move_count
+        self.position = None
+        self.inventory = []
+
+    def set_position(self, position):
+        """
+        Sets the position of the Player.
+
+        Parameters
+            position(tuple<int, int>): The position of the Player.
+        """
+        self.position = position
+
+    def get_position(self) -> tuple:
+        """
+        Returns a tuple of ints representing the position of the Player. If the Player’s position hasn’t been set yet
+        then this method should return None.
+
+        Returns:
+            self.position(tuple<int, int>): Returns a tuple of ints representing the position of the Player.
+        """
+        return self.position
+
+    def change_move_count(self, number):
+        """
+        Add the number to the Player’s move count.
+
+        Parameters
+            number(int): number to be added to the Player’s move count.
+        """
+        self.move_count += number
+
+    def moves_remaining(self) -> int:
+        """
+        Returns an int representing how many moves the Player has left before they reach the maximum move count.
+
+        Returns: self.move_count(int): Returns an int representing how many moves the Player has left before they
+        reach the maximum move count.
+        """
+        return self.move_count
+
+    def add_item(self, item):
+        """
+        Adds the item to the Player’s Inventory.
+
+        Parameters:
+            item(Entity): the item to be added to the Player’s Inventory.
+        """
+        self.inventory.append(item)
+
+    def get_inventory(self) -> list:
+        """
+        Returns a list that represents the Player’s inventory. If the Player has nothing in their inventory then an
+        empty list should be returned.
+
+        Returns:
+            self.inventory(list<Entity>): Returns a list that represents the Player’s inventory.
+        """
+        return self.inventory
+
+    def __str__(self) -> str:
+        """
+        Returns the ​string representation of the Player​. e.g. "Player('O')"
+
+        Returns:
+            s(str): Returns the ​string representation of the Player
+        """
+        s = "Player('" + self.id + "')"
+        return s
+
+    def __repr__(self) -> str:
+        """
+        Same as str(self).
+        """
+        return self.__str__()
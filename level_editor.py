@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+The model behind the level editor: an editable dungeon that keeps track of whether it can be solved, and in how
+many moves, as cells are painted.
+
+Shortest distances are kept in DistanceFields. Painting a wall or an empty cell only repairs the distances around
+the edited cell instead of searching the whole dungeon again.
+"""
+
+import heapq
+from collections import deque
+
+from a2_support import *
+
+INFINITY = float("inf")
+
+# Characters that can only appear once in a level; painting one moves it.
+UNIQUE = (PLAYER, KEY, DOOR)
+
+
+class DistanceField:
+    """
+    The shortest number of moves from a source position to every reachable position, kept up to date as cells are
+    opened and closed.
+    """
+
+    def __init__(self, size, is_open, source):
+        """
+        Constructor of the DistanceField class.
+
+        Parameters:
+            size(int): The width of the dungeon.
+            is_open(callable): Returns True if the Player can stand on a (row, col) position.
+            source(tuple<int, int>): The position distances are measured from, or None.
+        """
+        self._size = size
+        self._is_open = is_open
+        self._source = source
+        self._dist = {}
+        self.rebuild()
+
+    def get(self, position):
+        """
+        Returns the distance to a position, or None if it cannot be reached.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        return self._dist.get(position)
+
+    def set_source(self, source):
+        """
+        Measures distances from a new source position.
+
+        Parameters:
+            source(tuple<int, int>): The new source position, or None.
+        """
+        self._source = source
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recomputes every distance with a breadth-first search from the source.
+        """
+        self._dist = {}
+        if self._source is None or not self._is_open(self._source):
+            return
+        self._dist[self._source] = 0
+        queue = deque([self._source])
+        while queue:
+            position = queue.popleft()
+            d = self._dist[position] + 1
+            for neighbour in self._neighbours(position):
+                if neighbour not in self._dist:
+                    self._dist[neighbour] = d
+                    queue.append(neighbour)
+
+    def opened(self, position):
+        """
+        Updates the distances after a cell became open. Only cells that are now closer are visited.
+
+        Parameters:
+            position(tuple<int, int>): The cell that became open.
+        """
+        around = [self._dist[n] for n in self._neighbours(position) if n in self._dist]
+        if position == self._source:
+            self.rebuild()
+            return
+        if not around:
+            return
+        self._dist[position] = min(around) + 1
+        queue = deque([position])
+        while queue:
+            current = queue.popleft()
+            d = self._dist[current] + 1
+            for neighbour in self._neighbours(current):
+                if self._dist.get(neighbour, INFINITY) > d:
+                    self._dist[neighbour] = d
+                    queue.append(neighbour)
+
+    def closed(self, position):
+        """
+        Updates the distances after a cell became closed. Only the cells whose every shortest path went through the
+        closed cell are searched again.
+
+        Parameters:
+            position(tuple<int, int>): The cell that became closed.
+        """
+        if position not in self._dist:
+            return
+        if position == self._source:
+            self.rebuild()
+            return
+
+        # Find the cells that lost every shortest path, level by level away from the closed cell.
+        affected = {position}
+        queue = deque([position])
+        while queue:
+            current = queue.popleft()
+            child_dist = self._dist[current] + 1
+            for child in self._neighbours(current):
+                if child in affected or self._dist.get(child) != child_dist:
+                    continue
+                if not any(parent not in affected and self._dist.get(parent) == child_dist - 1
+                           for parent in self._neighbours(child)):
+                    affected.add(child)
+                    queue.append(child)
+
+        for cell in affected:
+            del self._dist[cell]
+
+        # Give the affected cells new distances, starting from the unaffected cells around them.
+        heap = []
+        for cell in affected:
+            if cell == position:
+                continue
+            around = [self._dist[n] for n in self._neighbours(cell) if n in self._dist]
+            if around:
+                heapq.heappush(heap, (min(around) + 1, cell))
+        while heap:
+            d, cell = heapq.heappop(heap)
+            if cell in self._dist:
+                continue
+            self._dist[cell] = d
+            for neighbour in self._neighbours(cell):
+                if neighbour in affected and neighbour not in self._dist:
+                    heapq.heappush(heap, (d + 1, neighbour))
+
+    def _neighbours(self, position):
+        """
+        Yields the open positions next to a position.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        row, col = position
+        for dr, dc in DIRECTIONS.values():
+            r, c = row + dr, col + dc
+            if 0 <= r < self._size and 0 <= c < self._size and self._is_open((r, c)):
+                yield (r, c)
+
+
+class LevelEditor:
+    """
+    An editable dungeon. It tracks the Player, Key and Door so it can report the fewest moves needed to pick up the
+    Key and reach the Door.
+    """
+
+    def __init__(self, rows):
+        """
+        Constructor of the LevelEditor class.
+
+        Parameters:
+            rows(list<str>): The rows of the dungeon to edit.
+        """
+        self._grid = [list(row) for row in rows]
+        self._size = len(self._grid)
+        self._unique = {char: self._find(char) for char in UNIQUE}
+        self._from_player = DistanceField(self._size, self.is_open, self._unique[PLAYER])
+        self._from_key = DistanceField(self._size, self.is_open, self._unique[KEY])
+
+    def get_size(self) -> int:
+        """
+        Returns:
+            int: The width of the dungeon.
+        """
+        return self._size
+
+    def get_char(self, position) -> str:
+        """
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            str: The character at the position.
+        """
+        row, col = position
+        return self._grid[row][col]
+
+    def get_rows(self) -> list:
+        """
+        Returns:
+            list<str>: The rows of the dungeon.
+        """
+        return ["".join(row) for row in self._grid]
+
+    def is_open(self, position) -> bool:
+        """
+        Returns True if the Player can stand on a position.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        return self.get_char(position) != WALL
+
+    def paint(self, position, char) -> dict:
+        """
+        Paints a character on a cell. Painting the Player, the Key or the Door moves it from where it was.
+
+        Parameters:
+            position(tuple<int, int>): The (row, col) position to paint.
+            char(str): The character to paint.
+
+        Returns:
+            dict<tuple<int, int>: str>: The cells that changed and their new characters.
+        """
+        old = self.get_char(position)
+        if old == char:
+            return {}
+        changed = {}
+        if char in UNIQUE and self._unique[char] is not None:
+            self._set(self._unique[char], SPACE)
+            changed[self._unique[char]] = SPACE
+        self._set(position, char)
+        changed[position] = char
+        if old in UNIQUE:
+            self._unique[old] = None
+        if char in UNIQUE:
+            self._unique[char] = position
+
+        if old == WALL:
+            self._from_player.opened(position)
+            self._from_key.opened(position)
+        elif char == WALL:
+            self._from_player.closed(position)
+            self._from_key.closed(position)
+        if PLAYER in (old, char):
+            self._from_player.set_source(self._unique[PLAYER])
+        if KEY in (old, char):
+            self._from_key.set_source(self._unique[KEY])
+        return changed
+
+    def min_moves(self):
+        """
+        Returns the fewest moves needed to pick up the Key and reach the Door, or None if the level cannot be solved.
+
+        Returns:
+            int: The fewest moves needed, or None.
+        """
+        key, door = self._unique[KEY], self._unique[DOOR]
+        if key is None or door is None:
+            return None
+        to_key = self._from_player.get(key)
+        to_door = self._from_key.get(door)
+        if to_key is None or to_door is None:
+            return None
+        return to_key + to_door
+
+    def to_text(self) -> str:
+        """
+        Returns:
+            str: The dungeon in the level file format read by load_game.
+        """
+        return "\n".join(self.get_rows())
+
+    def save(self, filename):
+        """
+        Writes the dungeon to a level file.
+
+        Parameters:
+            filename(str): The file to write.
+        """
+        with open(filename, 'w') as file:
+            file.write(self.to_text())
+
+    def _find(self, char):
+        """
+        Returns the first position of a character, or None if it is not in the dungeon.
+
+        Parameters:
+            char(str): The character to look for.
+        """
+        for row, line in enumerate(self._grid):
+            for col, c in enumerate(line):
+                if c == char:
+                    return (row, col)
+        return None
+
+    def _set(self, position, char):
+        """
+        Sets the character of a cell.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+            char(str): The new character.
+        """
+        row, col = position
+        self._grid[row][col] = char
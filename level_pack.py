@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Level packs: many levels in one file, any of which can be loaded without reading the others.
+
+A pack starts with a header and an index holding one fixed-size record per level: where its payload is, its name,
+its move budget and its difficulty. A name table follows, with the name and position of every level sorted by name,
+and then the payloads, each a level in the level file format compressed with zlib. Loading a level reads its index
+record and its payload, and finding a level by name bisects the name table a record at a time, so both take about
+the same time in a pack of three levels or of a hundred thousand:
+
+    write_pack("levels.klp", pack_files(["game1.txt", "game2.txt", "game3.txt"]))
+    with LevelPack("levels.klp") as pack:
+        dungeon = pack.load_game("game2.txt")          # the same rows as load_game("game2.txt")
+        game = pack.new_game(1)
+
+Or from the command line:
+
+    python level_pack.py build levels.klp game1.txt game2.txt game3.txt
+    python level_pack.py list levels.klp
+"""
+
+import argparse
+import struct
+import zlib
+from collections import namedtuple
+
+from a2_support import *
+from game_logic import GameLogic
+from level_editor import LevelEditor
+from levels import DungeonGrid, Level
+
+MAGIC = b"KCLP"
+VERSION = 2
+ENCODING = "ascii"
+NAME_LENGTH = 32
+
+# Magic, version and number of levels.
+HEADER = struct.Struct("<4sHI")
+# Payload offset and length, move budget, difficulty and name of one level.
+RECORD = struct.Struct("<QIIf%ds" % NAME_LENGTH)
+# Name and position of one level, in the name table.
+NAME_ENTRY = struct.Struct("<%dsI" % NAME_LENGTH)
+
+# What the index knows about a level.
+LevelInfo = namedtuple("LevelInfo", ["name", "moves", "difficulty"])
+
+
+def difficulty(rows, moves) -> float:
+    """
+    Returns how hard a level is: the share of its move budget the shortest solution uses.
+
+    Parameters:
+        rows(list<str>): The rows of the level.
+        moves(int): The move budget of the level.
+
+    Returns:
+        float: 0 for a level with moves to spare, 1 for one that must be played perfectly, more than 1 if the
+            budget is too small without picking up MoveIncrease items, and inf if it cannot be solved.
+    """
+    needed = LevelEditor(rows).min_moves()
+    if needed is None:
+        return float("inf")
+    return needed / max(1, moves)
+
+
+def pack_files(filenames, budgets=GAME_LEVELS):
+    """
+    Returns the levels in level files, ready to give to write_pack().
+
+    Parameters:
+        filenames(list<str>): The level files.
+        budgets(dict<str: int>): The move budget of each level, by file name.
+
+    Returns:
+        generator<tuple<str, list<str>, int, float>>: The name, rows, move budget and difficulty of each level.
+    """
+    for filename in filenames:
+        rows = ["".join(row) for row in load_game(filename)]
+        moves = budgets[filename]
+        yield filename, rows, moves, difficulty(rows, moves)
+
+
+def write_pack(path, levels):
+    """
+    Writes levels to a pack file.
+
+    Parameters:
+        path(str): The file to write.
+        levels(iterable<tuple<str, list<str>, int, float>>): The name, rows, move budget and difficulty of each
+            level, e.g. from pack_files().
+
+    Returns:
+        int: The number of levels written.
+    """
+    records = []
+    payloads = []
+    for name, rows, moves, level_difficulty in levels:
+        encoded = name.encode(ENCODING)
+        if len(encoded) > NAME_LENGTH:
+            raise ValueError("Level name " + name + " is longer than " + str(NAME_LENGTH) + " characters")
+        payloads.append(zlib.compress("\n".join(rows).encode(ENCODING), 9))
+        records.append((moves, level_difficulty, encoded))
+
+    offset = HEADER.size + (RECORD.size + NAME_ENTRY.size) * len(records)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        for (moves, level_difficulty, encoded), payload in zip(records, payloads):
+            file.write(RECORD.pack(offset, len(payload), moves, level_difficulty, encoded))
+            offset += len(payload)
+        for position in sorted(range(len(records)), key=lambda i: records[i][2]):
+            file.write(NAME_ENTRY.pack(records[position][2], position))
+        for payload in payloads:
+            file.write(payload)
+    return len(records)
+
+
+class LevelPack:
+    """
+    A pack file opened for reading. Levels are looked up by their position in the pack or by name.
+    """
+
+    def __init__(self, path):
+        """
+        Constructor of the LevelPack class. Only the header is read.
+
+        Parameters:
+            path(str): The pack file.
+        """
+        self._file = open(path, 'rb')
+        magic, version, self._count = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise ValueError(path + " is not a version " + str(VERSION) + " level pack")
+        self._names_start = HEADER.size + RECORD.size * self._count
+        self._names = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pack file.
+        """
+        self._file.close()
+
+    def index_of(self, level) -> int:
+        """
+        Returns the position of a level in the pack. A name is found by bisecting the name table, reading one
+        entry at each step; if several levels share a name, the first of them is found.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+        """
+        if isinstance(level, int):
+            if not 0 <= level < self._count:
+                raise IndexError("Level pack has no level " + str(level))
+            return level
+        if level not in self._names:
+            self._names[level] = self._find_name(level)
+        return self._names[level]
+
+    def _find_name(self, name) -> int:
+        """
+        Returns the position of the first level with a name, from the name table.
+
+        Parameters:
+            name(str): The name of a level.
+        """
+        missing = KeyError("Level pack has no level named " + name)
+        try:
+            encoded = name.encode(ENCODING)
+        except UnicodeEncodeError:
+            raise missing from None
+        if len(encoded) > NAME_LENGTH:
+            raise missing
+        # Names are stored padded with NULs, which sort before every other character.
+        key = encoded.ljust(NAME_LENGTH, b"\0")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            found, position = self._name_entry(low)
+            if found == key:
+                return position
+        raise missing
+
+    def _name_entry(self, entry) -> tuple:
+        """
+        Returns an entry of the name table: the padded name of a level and its position.
+
+        Parameters:
+            entry(int): The position of the entry in the name table.
+        """
+        self._file.seek(self._names_start + NAME_ENTRY.size * entry)
+        return NAME_ENTRY.unpack(self._file.read(NAME_ENTRY.size))
+
+    def _record(self, level) -> tuple:
+        """
+        Returns the index record of a level.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+        """
+        self._file.seek(HEADER.size + RECORD.size * self.index_of(level))
+        return RECORD.unpack(self._file.read(RECORD.size))
+
+    def get_info(self, level) -> LevelInfo:
+        """
+        Returns the name, move budget and difficulty of a level.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+        """
+        _, _, moves, level_difficulty, name = self._record(level)
+        return LevelInfo(name.rstrip(b"\0").decode(ENCODING), moves, level_difficulty)
+
+    def read_rows(self, level) -> list:
+        """
+        Reads and decompresses one level.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+
+        Returns:
+            list<str>: The rows of the level.
+        """
+        offset, length = self._record(level)[:2]
+        self._file.seek(offset)
+        return zlib.decompress(self._file.read(length)).decode(ENCODING).split("\n")
+
+    def load_game(self, level):
+        """
+        Loads a level the way load_game loads a level file.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+
+        Returns:
+            (list<list<str>>): A 2D array of strings representing the dungeon.
+        """
+        return [list(row) for row in self.read_rows(level)]
+
+    def get_level(self, level) -> Level:
+        """
+        Returns a level parsed for playing.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+        """
+        return Level(self.read_rows(level))
+
+    def new_game(self, level, lives=1) -> GameLogic:
+        """
+        Starts a game of a level with its move budget.
+
+        Parameters:
+            level(int or str): The position or name of a level.
+            lives(int): How many times the Player can run out of moves.
+        """
+        info = self.get_info(level)
+        return GameLogic(info.name, lives, dungeon=DungeonGrid(self.get_level(level)), moves=info.moves)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and list Key Cave level packs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="pack level files listed in GAME_LEVELS")
+    build.add_argument("pack")
+    build.add_argument("levels", nargs="+")
+    listing = commands.add_parser("list", help="list the levels in a pack")
+    listing.add_argument("pack")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print("Packed", write_pack(args.pack, pack_files(args.levels)), "levels into", args.pack)
+    else:
+        with LevelPack(args.pack) as pack:
+            for i in range(len(pack)):
+                info = pack.get_info(i)
+                print("%6d  %-32s moves %4d  difficulty %.2f" % (i, info.name, info.moves, info.difficulty))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Process-wide cache of parsed levels.
+
+Levels are parsed once per (path, mtime) into an immutable Level that every game of that level shares. Each game
+only keeps a DungeonGrid overlay recording the positions of the items it has removed.
+"""
+
+import os
+from array import array
+
+from a2_support import *
+
+_cache = {}
+
+
+class Level:
+    """
+    An immutable, parsed level: its rows and an index of the positions of every character.
+    """
+
+    def __init__(self, rows):
+        """
+        Constructor of the Level class.
+
+        Parameters:
+            rows(list<list<str>>): The dungeon layout, as returned by load_game.
+        """
+        self.rows = tuple("".join(row) for row in rows)
+        self.size = len(self.rows)
+        positions = {}
+        for row, line in enumerate(self.rows):
+            for col, char in enumerate(line):
+                positions.setdefault(char, []).append((row, col))
+        self.positions = {char: tuple(found) for char, found in positions.items()}
+        self._walls = None
+        self._finish = None
+
+    def get_walls(self) -> frozenset:
+        """
+        Returns the positions of the walls as a set, built the first time it is asked for.
+
+        Returns:
+            frozenset<tuple<int, int>>: The (row, col) positions of every WALL.
+        """
+        if self._walls is None:
+            self._walls = frozenset(self.positions.get(WALL, ()))
+        return self._walls
+
+    def moves_to_finish(self, position, has_key) -> int:
+        """
+        Returns the fewest moves from a position to a Door, by way of a Key unless one is held. Walls are the only
+        obstacles, so the answer holds however many items have been picked up. The distances of every cell are
+        worked out the first time they are asked for and shared by every game of the level.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+            has_key(bool): True if the Player already holds a Key.
+
+        Returns:
+            int: The fewest moves, or None if no Door can be reached from the position.
+        """
+        if self._finish is None:
+            self._finish = self._finish_distances()
+        width, to_door, via_key = self._finish
+        row, col = position
+        if not (0 <= row < self.size and 0 <= col < len(self.rows[row])):
+            return None
+        moves = (to_door if has_key else via_key)[(row + 1) * width + col]
+        return None if moves < 0 else moves
+
+    def _finish_distances(self) -> tuple:
+        """
+        Works out the distances for moves_to_finish() with breadth-first searches over a flat copy of the level,
+        padded with walls so no step needs a bounds check.
+
+        Returns:
+            tuple<int, array, array>: The width of a padded row, and the moves from each cell to a Door and to a
+                Door by way of a Key, -1 where there is no way.
+        """
+        width = max(map(len, self.rows), default=0) + 1
+        is_open = bytes(0 if chr(char) == WALL else 1 for char in range(256))
+        grid = bytearray(width * (self.size + 2))
+        for row, line in enumerate(self.rows):
+            start = (row + 1) * width
+            grid[start:start + len(line)] = line.encode("latin-1", "replace").translate(is_open)
+        to_door = array("i", [-1]) * len(grid)
+        _spread(grid, width, to_door, [(row + 1) * width + col for row, col in self.positions.get(DOOR, ())], 0)
+        via_key = array("i", [-1]) * len(grid)
+        for row, col in self.positions.get(KEY, ()):
+            key = (row + 1) * width + col
+            if to_door[key] >= 0:
+                _spread(grid, width, via_key, [key], to_door[key])
+        return width, to_door, via_key
+
+    def __repr__(self) -> str:
+        return "Level(size=" + str(self.size) + ")"
+
+
+def _spread(grid, width, dist, cells, start):
+    """
+    Breadth-first search from some cells of a flat grid, lowering the distances it improves on.
+
+    Parameters:
+        grid(bytearray): 1 for each open cell, rows of width cells with a closed cell at the end of each and closed
+            rows above and below.
+        width(int): The length of a row of the grid.
+        dist(array<int>): The distance of each cell, -1 if unknown; updated in place.
+        cells(list<int>): The cells to start from.
+        start(int): The distance of the cells started from.
+    """
+    queue = []
+    for cell in cells:
+        if dist[cell] < 0 or start < dist[cell]:
+            dist[cell] = start
+            queue.append(cell)
+    steps = (1, -1, width, -width)
+    # The queue only grows at its end, so iterating over it visits the cells in the order they were reached.
+    for cell in queue:
+        d = dist[cell] + 1
+        for step in steps:
+            neighbour = cell + step
+            if grid[neighbour] and (dist[neighbour] < 0 or d < dist[neighbour]):
+                dist[neighbour] = d
+                queue.append(neighbour)
+
+
+def get_level(filename) -> Level:
+    """
+    Returns the parsed level for a file, parsing it only if it is not cached or has changed on disk since.
+
+    Parameters:
+        filename(str): A string representing the name of the level.
+
+    Returns:
+        Level: The shared, parsed level.
+    """
+    path = os.path.abspath(filename)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    level = Level(load_game(path))
+    _cache[path] = (mtime, level)
+    return level
+
+
+def clear_cache():
+    """
+    Forgets every cached level.
+    """
+    _cache.clear()
+
+
+class DungeonGrid:
+    """
+    A copy-on-write view of a Level. Removed positions read as SPACE; the Level itself is never modified, and
+    removing a position replaces the set of removed positions instead of changing it in place, so views can share it.
+    """
+
+    def __init__(self, level, removed=frozenset()):
+        """
+        Constructor of the DungeonGrid class.
+
+        Parameters:
+            level(Level): The level this grid is a view of.
+            removed(frozenset<tuple<int, int>>): The positions that have been cleared.
+        """
+        self._level = level
+        self._removed = removed
+        # The removed columns of each row, for the removed set they were built from.
+        self._rows_removed = {}
+        self._rows_removed_for = None
+
+    def get_level(self) -> Level:
+        """
+        Returns:
+            Level: The level this grid is a view of.
+        """
+        return self._level
+
+    def get_removed(self) -> frozenset:
+        """
+        Returns:
+            frozenset<tuple<int, int>>: The positions that have been cleared.
+        """
+        return self._removed
+
+    def set_removed(self, removed):
+        """
+        Replaces the set of cleared positions.
+
+        Parameters:
+            removed(frozenset<tuple<int, int>>): The positions that have been cleared.
+        """
+        self._removed = removed
+
+    def remove(self, position):
+        """
+        Clears the character at a position.
+
+        Parameters:
+            position(tuple<int, int>): The (row, col) position to clear.
+        """
+        removed = self._removed | {position}
+        if self._rows_removed_for is self._removed:
+            self._rows_removed.setdefault(position[0], []).append(position[1])
+            self._rows_removed_for = removed
+        self._removed = removed
+
+    def remove_all(self, positions):
+        """
+        Clears the characters at several positions, copying the set of removed positions only once.
+
+        Parameters:
+            positions(list<tuple<int, int>>): The (row, col) positions to clear.
+        """
+        self._removed = self._removed | frozenset(positions)
+
+    def _removed_in_row(self, row) -> list:
+        """
+        Returns the removed columns of a row. The index of rows is rebuilt only when the removed set was replaced.
+
+        Parameters:
+            row(int): The row to look at.
+
+        Returns:
+            list<int>: The columns of the row that have been cleared.
+        """
+        if self._rows_removed_for is not self._removed:
+            rows_removed = {}
+            for r, c in self._removed:
+                rows_removed.setdefault(r, []).append(c)
+            self._rows_removed = rows_removed
+            self._rows_removed_for = self._removed
+        return self._rows_removed.get(row, ())
+
+    def get_char(self, position):
+        """
+        Returns the character at a position, or None if the position is off the map.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            str: The character at the position.
+        """
+        row, col = position
+        if not (0 <= row < self._level.size and 0 <= col < len(self._level.rows[row])):
+            return None
+        if position in self._removed:
+            return SPACE
+        return self._level.rows[row][col]
+
+    def get_positions(self, char) -> list:
+        """
+        Returns the positions of a character, skipping removed positions.
+
+        Parameters:
+            char(str): The character to look for.
+
+        Returns:
+            list<tuple<int, int>>: The positions of the character, in row-major order.
+        """
+        return [p for p in self._level.positions.get(char, ()) if p not in self._removed]
+
+    def __len__(self) -> int:
+        return self._level.size
+
+    def __getitem__(self, row) -> str:
+        line = self._level.rows[row]
+        columns = self._removed_in_row(row) if self._removed else ()
+        if not columns:
+            return line
+        chars = list(line)
+        for c in columns:
+            chars[c] = SPACE
+        return "".join(chars)
+
+    def __iter__(self):
+        for row in range(self._level.size):
+            yield self[row]
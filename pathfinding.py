@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Shortest routes through a dungeon for click-to-move.
+
+Routes are found with A* using the Manhattan distance, which never overestimates on a grid of four-way moves. A
+search gives up after a fixed number of expanded cells or once its time budget is spent, whichever comes first, so
+a click on a huge map answers within a frame, if sometimes with no route. The clock is only read every
+CLOCK_EVERY expansions. Routes, and goals proven unreachable, are cached until the dungeon changes; a search that
+gave up is tried again on the next click.
+"""
+
+import heapq
+import time
+
+from a2_support import *
+from game_logic import ItemPicked, Restored
+
+MAX_EXPANSIONS = 3000
+# Seconds a search may take, well inside the 10ms a click should answer in.
+TIME_BUDGET = 0.005
+CLOCK_EVERY = 256
+ROUTE_CACHE_SIZE = 256
+
+# The direction of each (row, col) step.
+STEPS = {step: direction for direction, step in DIRECTIONS.items()}
+
+
+def find_path(start, goal, is_open, max_expansions=MAX_EXPANSIONS, time_budget=None):
+    """
+    Returns the moves of a shortest route between two positions.
+
+    Parameters:
+        start(tuple<int, int>): The (row, col) position to start from.
+        goal(tuple<int, int>): The (row, col) position to reach.
+        is_open(callable): Returns True if the Player can stand on a (row, col) position.
+        max_expansions(int): The most cells expanded before the search gives up.
+        time_budget(float): The most seconds the search takes before it gives up, None for no limit.
+
+    Returns:
+        list<str>: The directions to move in, or None if there is no route or the search gave up.
+    """
+    return search_path(start, goal, is_open, max_expansions, time_budget)[0]
+
+
+def search_path(start, goal, is_open, max_expansions=MAX_EXPANSIONS, time_budget=None) -> tuple:
+    """
+    Searches for a shortest route between two positions, telling a route that does not exist from a search that
+    gave up.
+
+    Parameters:
+        start(tuple<int, int>): The (row, col) position to start from.
+        goal(tuple<int, int>): The (row, col) position to reach.
+        is_open(callable): Returns True if the Player can stand on a (row, col) position.
+        max_expansions(int): The most cells expanded before the search gives up.
+        time_budget(float): The most seconds the search takes before it gives up, None for no limit.
+
+    Returns:
+        tuple<list<str>, bool>: The directions to move in, or None if no route was found, and whether the search
+            finished: False if it gave up before it could tell.
+    """
+    if start == goal:
+        return [], True
+    if not is_open(goal):
+        return None, True
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    goal_row, goal_col = goal
+    came_from = {start: None}
+    cost = {start: 0}
+    heap = [(abs(start[0] - goal_row) + abs(start[1] - goal_col), 0, start)]
+    steps = tuple(DIRECTIONS.values())
+    push, pop = heapq.heappush, heapq.heappop
+    expansions = 0
+    while heap:
+        _, g, position = pop(heap)
+        if position == goal:
+            return _directions(came_from, goal), True
+        if g > cost[position]:
+            continue
+        expansions += 1
+        if expansions > max_expansions:
+            return None, False
+        if deadline is not None and not expansions % CLOCK_EVERY and time.perf_counter() > deadline:
+            return None, False
+        row, col = position
+        g += 1
+        for dr, dc in steps:
+            neighbour = (row + dr, col + dc)
+            if g < cost.get(neighbour, g + 1) and is_open(neighbour):
+                cost[neighbour] = g
+                came_from[neighbour] = position
+                push(heap, (g + abs(row + dr - goal_row) + abs(col + dc - goal_col), g, neighbour))
+    return None, True
+
+
+def _directions(came_from, goal) -> list:
+    """
+    Follows the search tree back from the goal and returns the moves from the start.
+
+    Parameters:
+        came_from(dict<tuple<int, int>: tuple<int, int>>): The cell each cell was reached from.
+        goal(tuple<int, int>): The position reached.
+    """
+    directions = []
+    position = goal
+    while came_from[position] is not None:
+        previous = came_from[position]
+        directions.append(STEPS[(position[0] - previous[0], position[1] - previous[1])])
+        position = previous
+    directions.reverse()
+    return directions
+
+
+class RouteCache:
+    """
+    Shortest routes through a game's dungeon, remembered until an item is picked up or the game is restored. Goals
+    that cannot be reached are remembered too, but not searches that gave up, which may succeed on another try.
+    """
+
+    def __init__(self, game, max_expansions=MAX_EXPANSIONS, size=ROUTE_CACHE_SIZE, time_budget=TIME_BUDGET):
+        """
+        Constructor of the RouteCache class.
+
+        Parameters:
+            game(GameLogic): The game to find routes in.
+            max_expansions(int): The most cells one search expands.
+            size(int): The most routes remembered.
+            time_budget(float): The most seconds one search takes, None for no limit.
+        """
+        self._game = game
+        self._max_expansions = max_expansions
+        self._size = size
+        self._time_budget = time_budget
+        self._routes = {}
+        # Walls are never removed, so on a parsed level a wall set answers is_open without reading the rows.
+        level = game.get_level()
+        if level is not None:
+            self._walls = level.get_walls()
+            self._bound = level.size
+        else:
+            self._walls = None
+        game.subscribe(ItemPicked, self.clear)
+        game.subscribe(Restored, self.clear)
+
+    def is_open(self, position) -> bool:
+        """
+        Returns True if the Player can stand on a position.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        if self._walls is None:
+            return self._game.get_char(position) not in (WALL, None)
+        row, col = position
+        return 0 <= row < self._bound and 0 <= col < self._bound and position not in self._walls
+
+    def route(self, start, goal):
+        """
+        Returns the moves of a shortest route between two positions.
+
+        Parameters:
+            start(tuple<int, int>): The (row, col) position to start from.
+            goal(tuple<int, int>): The (row, col) position to reach.
+
+        Returns:
+            list<str>: The directions to move in, or None if no route was found.
+        """
+        key = (start, goal)
+        if key in self._routes:
+            route = self._routes[key]
+        else:
+            route, finished = search_path(start, goal, self.is_open, self._max_expansions, self._time_budget)
+            if finished:
+                if len(self._routes) >= self._size:
+                    self._routes.pop(next(iter(self._routes)))
+                self._routes[key] = route
+        return None if route is None else list(route)
+
+    def clear(self, event=None):
+        """
+        Forgets every route.
+        """
+        self._routes.clear()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+A local leaderboard of finished runs, stored in SQLite.
+
+Runs are written by a background thread in batches so recording a run never blocks the game. Reads use their own
+connection. The top runs come straight from the (level, time) index. Ranks and percentiles add up a per-level count
+of runs in each whole second of time, then count exactly only inside the one second the time falls in, so they stay
+fast however many runs are saved.
+
+A run's replay is its move log: space separated tokens of a direction and the game time, in milliseconds, at which
+the move was played, e.g. "D420 D810 W1300".
+"""
+
+import queue
+import sqlite3
+import threading
+
+SCORES_FILE = "scores.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    level TEXT NOT NULL,
+    time REAL NOT NULL,
+    moves_used INTEGER NOT NULL,
+    replay TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_level_time ON runs (level, time, moves_used);
+CREATE TABLE IF NOT EXISTS time_buckets (
+    level TEXT NOT NULL,
+    second INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    PRIMARY KEY (level, second)
+);
+"""
+
+
+def encode_replay(moves) -> str:
+    """
+    Encodes a move log.
+
+    Parameters:
+        moves(list<tuple<str, float>>): The direction of each move and the game time, in seconds, it was played at.
+
+    Returns:
+        str: The move log as text.
+    """
+    return " ".join(direction + str(int(seconds * 1000)) for direction, seconds in moves)
+
+
+def decode_replay(text):
+    """
+    Decodes a move log one move at a time.
+
+    Parameters:
+        text(str): A move log made by encode_replay.
+
+    Yields:
+        tuple<str, float>: The direction of each move and the game time, in seconds, it was played at.
+    """
+    for token in text.split():
+        yield token[0], int(token[1:]) / 1000
+
+
+class ScoreStore:
+    """
+    The leaderboard. record() queues a run for the writer thread and returns straight away.
+    """
+
+    def __init__(self, path=SCORES_FILE, batch_size=500):
+        """
+        Constructor of the ScoreStore class.
+
+        Parameters:
+            path(str): The SQLite database file.
+            batch_size(int): The most runs written in one transaction.
+        """
+        self._path = path
+        self._batch_size = batch_size
+        self._pending = queue.Queue()
+        self._local = threading.local()
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.commit()
+        self._writer = threading.Thread(target=self._write_runs, name="ScoreStore writer", daemon=True)
+        self._writer.start()
+
+    def record(self, level, time, moves_used, replay=None):
+        """
+        Queues a finished run to be saved.
+
+        Parameters:
+            level(str): The name of the level.
+            time(float): The time the run took, in seconds.
+            moves_used(int): The number of moves played.
+            replay(str): The move log of the run.
+        """
+        self._pending.put((level, time, moves_used, replay))
+
+    def flush(self):
+        """
+        Waits until every queued run has been saved.
+        """
+        self._pending.join()
+
+    def close(self):
+        """
+        Saves the queued runs and stops the writer thread.
+        """
+        self._pending.put(None)
+        self._writer.join()
+
+    def top(self, level, n=10) -> list:
+        """
+        Returns the fastest runs of a level, fewest moves first among equal times.
+
+        Parameters:
+            level(str): The name of the level.
+            n(int): How many runs to return.
+
+        Returns:
+            list<tuple<float, int, str>>: The time, moves used and replay of each run.
+        """
+        return self._connect().execute(
+            "SELECT time, moves_used, replay FROM runs WHERE level = ? ORDER BY time, moves_used LIMIT ?",
+            (level, n)).fetchall()
+
+    def best(self, level):
+        """
+        Returns the fastest run of a level, or None if it has never been finished.
+
+        Parameters:
+            level(str): The name of the level.
+
+        Returns:
+            tuple<float, int, str>: The time, moves used and replay of the run.
+        """
+        runs = self.top(level, 1)
+        return runs[0] if runs else None
+
+    def rank(self, level, time) -> tuple:
+        """
+        Returns where a time would place among the saved runs of a level.
+
+        Parameters:
+            level(str): The name of the level.
+            time(float): The time of the run, in seconds.
+
+        Returns:
+            tuple<int, int>: The rank of the time (1 is fastest) and the number of runs including it.
+        """
+        faster, slower, total = self._count_around(level, time)
+        return faster + 1, total + 1
+
+    def percentile(self, level, time) -> float:
+        """
+        Returns the percentage of saved runs of a level that are slower than a time.
+
+        Parameters:
+            level(str): The name of the level.
+            time(float): The time of the run, in seconds.
+
+        Returns:
+            float: A percentage from 0 to 100.
+        """
+        faster, slower, total = self._count_around(level, time)
+        return 100.0 if total == 0 else 100.0 * slower / total
+
+    def _count_around(self, level, time) -> tuple:
+        """
+        Counts the saved runs of a level faster and slower than a time.
+
+        Parameters:
+            level(str): The name of the level.
+            time(float): The time to compare with, in seconds.
+
+        Returns:
+            tuple<int, int, int>: The number of faster runs, slower runs and all runs.
+        """
+        connection = self._connect()
+        second = int(time)
+        before, total = connection.execute(
+            "SELECT COALESCE(SUM(CASE WHEN second < ? THEN runs END), 0), COALESCE(SUM(runs), 0) "
+            "FROM time_buckets WHERE level = ?", (second, level)).fetchone()
+        inside_faster, inside_slower, inside = connection.execute(
+            "SELECT COALESCE(SUM(time < ?), 0), COALESCE(SUM(time > ?), 0), COUNT(*) "
+            "FROM runs WHERE level = ? AND time >= ? AND time < ?",
+            (time, time, level, second, second + 1)).fetchone()
+        after = total - before - inside
+        return before + inside_faster, inside_slower + after, total
+
+    def _connect(self):
+        """
+        Returns the connection of the calling thread, opening it on first use.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def _write_runs(self):
+        """
+        Runs on the writer thread: saves queued runs in batches until close() is called.
+        """
+        connection = self._connect()
+        running = True
+        while running:
+            batch = [self._pending.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            runs = [run for run in batch if run is not None]
+            running = len(runs) == len(batch)
+            if runs:
+                connection.executemany("INSERT INTO runs (level, time, moves_used, replay) VALUES (?, ?, ?, ?)",
+                                       runs)
+                connection.executemany("INSERT INTO time_buckets (level, second, runs) VALUES (?, ?, 1) "
+                                       "ON CONFLICT (level, second) DO UPDATE SET runs = runs + 1",
+                                       [(level, int(time)) for level, time, moves_used, replay in runs])
+                connection.commit()
+            for _ in batch:
+                self._pending.task_done()
+        connection.close()
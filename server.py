@@ -0,0 +1,385 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+A line protocol server hosting many concurrent Key Cave games over TCP.
+
+Every connection gets its own GameLogic session. Each request is a single line and every reply is a block of lines
+terminated by END:
+
+    client                  server
+    W / A / S / D           INVALID | CELL <row> <col> <char> ... [MSG <message> ...] MOVES <n> [WIN | LOSE] END
+    I <direction>           MSG <entity> is on the <direction> side. MOVES <n> END
+    H                       MSG <help message> END
+    NEW [level]             SIZE <n> ROW <row> <chars> ... MOVES <n> END
+    Q                       BYE
+
+A request line longer than the server's line limit is answered with ERROR <message> END and the connection is
+closed.
+Only the cells changed by a move are sent back; the session learns which from the game's PlayerMoved and ItemPicked
+events. Spaces are sent as '.' so lines survive stripping.
+"""
+
+import argparse
+import asyncio
+
+from a2_support import *
+from game_logic import GameLogic, ItemPicked, Lost, PlayerMoved, Won
+
+END = "END"
+WIRE_SPACE = "."
+
+
+def to_wire(char):
+    """
+    Converts a dungeon character to the character sent over the wire.
+
+    Parameters:
+        char(str): A dungeon character.
+
+    Returns:
+        str: The character sent to the client.
+    """
+    return WIRE_SPACE if char == SPACE else char
+
+
+class GameSession:
+    """
+    GameSession plays one GameLogic on behalf of a connected client and turns each command into the lines of the
+    reply.
+    """
+
+    def __init__(self, dungeon_name="game1.txt"):
+        """
+        Constructor of the GameSession class.
+
+        Parameters:
+            dungeon_name(str): The name of the level to play.
+        """
+        self._dungeon_name = dungeon_name
+        self._start()
+
+    def _start(self):
+        """
+        Starts a new game of the session's level and listens to its events.
+        """
+        self._game = GameLogic(self._dungeon_name)
+        self._over = False
+        self._result = None
+        self._changed = set()
+        self._game.subscribe(PlayerMoved, lambda event: self._changed.update((event.old_position, event.new_position)))
+        self._game.subscribe(ItemPicked, lambda event: self._changed.add(event.position))
+        self._game.subscribe(Won, lambda event: self._end("WIN"))
+        self._game.subscribe(Lost, lambda event: self._end("LOSE"))
+
+    def _end(self, result):
+        """
+        Records how the game ended.
+
+        Parameters:
+            result(str): "WIN" or "LOSE".
+        """
+        self._over = True
+        self._result = result
+
+    def get_game(self):
+        """
+        Returns:
+            GameLogic: The game played by this session.
+        """
+        return self._game
+
+    def cell(self, position) -> str:
+        """
+        Returns the character shown at a position, with the Player drawn over everything else.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            str: The character shown at the position.
+        """
+        if position == self._game.get_player().get_position():
+            return PLAYER
+        entity = self._game.get_entity(position)
+        return SPACE if entity is None else entity.get_id()
+
+    def full_frame(self) -> list:
+        """
+        Returns the lines describing the whole dungeon, sent when a game starts.
+
+        Returns:
+            list<str>: The SIZE, ROW and MOVES lines.
+        """
+        size = self._game.get_dungeon_size()
+        lines = ["SIZE " + str(size)]
+        for row in range(size):
+            chars = "".join(to_wire(self.cell((row, col))) for col in range(size))
+            lines.append("ROW " + str(row) + " " + chars)
+        lines.append(self._moves_line())
+        return lines
+
+    def handle(self, line) -> list:
+        """
+        Handles one command line from the client.
+
+        Parameters:
+            line(str): The command sent by the client.
+
+        Returns:
+            list<str>: The lines of the reply, or None once the client has quit.
+        """
+        parts = line.strip().upper().split()
+        if not parts:
+            return ["MSG " + INVALID]
+        action = parts[0]
+
+        if action == QUIT:
+            return None
+        if action == "NEW":
+            if len(parts) > 1:
+                dungeon_name = line.split()[1]
+                if dungeon_name not in GAME_LEVELS:
+                    return ["MSG Unknown level " + dungeon_name]
+                self._dungeon_name = dungeon_name
+            self._start()
+            return self.full_frame()
+        if action == HELP:
+            return ["MSG " + HELP_MESSAGE]
+        if self._over:
+            return ["MSG The game is over, send NEW to play again."]
+        if action == INVESTIGATE and len(parts) == 2 and parts[1] in DIRECTIONS:
+            entity = self._game.investigate(parts[1])
+            return ["MSG " + str(entity) + " is on the " + parts[1] + " side."] + self._outcome()
+        if action in DIRECTIONS and len(parts) == 1:
+            return self._move(action)
+        return ["MSG " + INVALID]
+
+    def _move(self, direction) -> list:
+        """
+        Plays a move and returns the cells it changed.
+
+        Parameters:
+            direction(str): 'W', 'S', 'A' or 'D'.
+
+        Returns:
+            list<str>: The CELL lines followed by the outcome of the move.
+        """
+        self._changed.clear()
+        if not self._game.play_move(direction):
+            return ["INVALID"] + self._outcome()
+        lines = []
+        for position in sorted(self._changed):
+            row, col = position
+            lines.append("CELL " + str(row) + " " + str(col) + " " + to_wire(self.cell(position)))
+        return lines + self._outcome()
+
+    def _moves_line(self) -> str:
+        """
+        Returns:
+            str: The MOVES line for the Player's remaining moves.
+        """
+        return "MOVES " + str(self._game.get_player().moves_remaining())
+
+    def _outcome(self) -> list:
+        """
+        Returns the messages the game added, the MOVES line, and WIN or LOSE when the move ended the game.
+
+        Returns:
+            list<str>: The lines describing the state of the game after a move.
+        """
+        lines = ["MSG " + message for message in self._game.pop_messages()]
+        lines.append(self._moves_line())
+        if self._result is not None:
+            lines.append(self._result)
+            self._result = None
+        return lines
+
+
+class GameServer:
+    """
+    GameServer accepts connections with asyncio and plays a GameSession for each of them.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, dungeon_name="game1.txt"):
+        """
+        Constructor of the GameServer class.
+
+        Parameters:
+            host(str): The interface to listen on.
+            port(int): The port to listen on, 0 picks a free port.
+            dungeon_name(str): The level new sessions start on.
+        """
+        self._host = host
+        self._port = port
+        self._dungeon_name = dungeon_name
+        self._server = None
+        self._sessions = set()
+
+    async def start(self):
+        """
+        Starts listening for connections.
+        """
+        self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+
+    def get_port(self) -> int:
+        """
+        Returns:
+            int: The port the server is listening on.
+        """
+        return self._server.sockets[0].getsockname()[1]
+
+    def session_count(self) -> int:
+        """
+        Returns:
+            int: The number of connected clients.
+        """
+        return len(self._sessions)
+
+    async def serve_forever(self):
+        """
+        Starts the server if needed and serves clients until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stops accepting connections and waits for the server to close.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        """
+        Plays a session for one client until it quits or disconnects.
+
+        Parameters:
+            reader(asyncio.StreamReader): The stream of commands from the client.
+            writer(asyncio.StreamWriter): The stream of replies to the client.
+        """
+        session = GameSession(self._dungeon_name)
+        self._sessions.add(session)
+        try:
+            self._write(writer, session.full_frame())
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = session.handle(line.decode(errors="replace"))
+                if reply is None:
+                    writer.write(b"BYE\n")
+                    await writer.drain()
+                    break
+                self._write(writer, reply)
+                await writer.drain()
+        except (asyncio.LimitOverrunError, ValueError):
+            # The request line was longer than the StreamReader limit.
+            self._write(writer, ["ERROR Request line too long"])
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._sessions.discard(session)
+            writer.close()
+
+    def _write(self, writer, lines):
+        """
+        Writes a reply followed by END in a single write.
+
+        Parameters:
+            writer(asyncio.StreamWriter): The stream of replies to the client.
+            lines(list<str>): The lines of the reply.
+        """
+        writer.write(("\n".join(lines) + "\n" + END + "\n").encode())
+
+
+class GameClient:
+    """
+    A minimal asyncio client for the line protocol, used for scripting and testing the server locally.
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Constructor of the GameClient class. Use GameClient.connect() to open a connection.
+
+        Parameters:
+            reader(asyncio.StreamReader): The stream of replies from the server.
+            writer(asyncio.StreamWriter): The stream of commands to the server.
+        """
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        """
+        Connects to a server and reads the initial frame.
+
+        Parameters:
+            host(str): The host of the server.
+            port(int): The port of the server.
+
+        Returns:
+            tuple<GameClient, list<str>>: The client and the lines of the initial frame.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        return client, await client.read_reply()
+
+    async def read_reply(self) -> list:
+        """
+        Reads the lines of one reply.
+
+        Returns:
+            list<str>: The lines up to, but not including, END or BYE.
+        """
+        lines = []
+        while True:
+            line = (await self._reader.readline()).decode().rstrip("\n")
+            if line in (END, "BYE", ""):
+                return lines
+            lines.append(line)
+
+    async def send(self, command) -> list:
+        """
+        Sends a command and waits for its reply.
+
+        Parameters:
+            command(str): The command line to send.
+
+        Returns:
+            list<str>: The lines of the reply.
+        """
+        self._writer.write((command + "\n").encode())
+        await self._writer.drain()
+        return await self.read_reply()
+
+    async def close(self):
+        """
+        Closes the connection.
+        """
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Key Cave games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--level", default="game1.txt", choices=sorted(GAME_LEVELS))
+    args = parser.parse_args()
+    server = GameServer(args.host, args.port, args.level)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
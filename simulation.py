@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Helpers for simulating things that move on their own: a spatial hash answering "what is at or near this position"
+without looking at everything, and a fixed timestep that turns game time into a whole number of simulation steps,
+whatever the frame rate.
+"""
+
+
+class SpatialHash:
+    """
+    Items with grid positions, bucketed into square blocks of cells. Looking up a position or a rectangle only looks
+    at the blocks that overlap it.
+    """
+
+    def __init__(self, cell_size=8):
+        """
+        Constructor of the SpatialHash class.
+
+        Parameters:
+            cell_size(int): The width, in grid cells, of a block.
+        """
+        self._cell_size = cell_size
+        self._buckets = {}
+
+    def _key(self, position) -> tuple:
+        """
+        Returns the block containing a position.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+        """
+        return position[0] // self._cell_size, position[1] // self._cell_size
+
+    def insert(self, item, position):
+        """
+        Adds an item at a position.
+
+        Parameters:
+            item: Any hashable item.
+            position(tuple<int, int>): The (row, col) position of the item.
+        """
+        self._buckets.setdefault(self._key(position), {})[item] = position
+
+    def remove(self, item, position):
+        """
+        Removes an item.
+
+        Parameters:
+            item: An item that was inserted.
+            position(tuple<int, int>): The position the item is at.
+        """
+        key = self._key(position)
+        bucket = self._buckets[key]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[key]
+
+    def move(self, item, old_position, new_position):
+        """
+        Moves an item to a new position.
+
+        Parameters:
+            item: An item that was inserted.
+            old_position(tuple<int, int>): The position the item is at.
+            new_position(tuple<int, int>): The position the item moves to.
+        """
+        size = self._cell_size
+        old_key = (old_position[0] // size, old_position[1] // size)
+        new_key = (new_position[0] // size, new_position[1] // size)
+        if old_key == new_key:
+            self._buckets[new_key][item] = new_position
+        else:
+            self.remove(item, old_position)
+            self.insert(item, new_position)
+
+    def at(self, position) -> list:
+        """
+        Returns the items at a position.
+
+        Parameters:
+            position(tuple<int, int>): A (row, col) position.
+
+        Returns:
+            list: The items at the position.
+        """
+        bucket = self._buckets.get(self._key(position), {})
+        return [item for item, p in bucket.items() if p == position]
+
+    def query(self, top_left, bottom_right) -> list:
+        """
+        Returns the items inside a rectangle of cells.
+
+        Parameters:
+            top_left(tuple<int, int>): The (row, col) of the top left cell, included.
+            bottom_right(tuple<int, int>): The (row, col) of the bottom right cell, included.
+
+        Returns:
+            list<tuple>: The (item, position) of each item inside the rectangle.
+        """
+        (top, left), (bottom, right) = top_left, bottom_right
+        (key_top, key_left), (key_bottom, key_right) = self._key(top_left), self._key(bottom_right)
+        found = []
+        for key_row in range(key_top, key_bottom + 1):
+            for key_col in range(key_left, key_right + 1):
+                for item, (row, col) in self._buckets.get((key_row, key_col), {}).items():
+                    if top <= row <= bottom and left <= col <= right:
+                        found.append((item, (row, col)))
+        return found
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+
+class FixedTimestep:
+    """
+    Counts the fixed-length simulation steps due as time passes, carrying the remainder to the next call.
+    """
+
+    def __init__(self, step, max_steps=5):
+        """
+        Constructor of the FixedTimestep class.
+
+        Parameters:
+            step(float): The length of a step, in seconds.
+            max_steps(int): The most steps returned by one call; after a long stall the missed steps are dropped
+                rather than all run at once.
+        """
+        self._step = step
+        self._max_steps = max_steps
+        self._last = None
+        self._banked = 0.0
+
+    def advance(self, now) -> int:
+        """
+        Returns how many steps are due at a time.
+
+        Parameters:
+            now(float): The current time, in seconds, e.g. GameClock.elapsed().
+
+        Returns:
+            int: The number of steps to simulate.
+        """
+        if self._last is None or now < self._last:
+            self._last = now
+            return 0
+        self._banked += now - self._last
+        self._last = now
+        steps = int(self._banked // self._step)
+        self._banked -= steps * self._step
+        if steps > self._max_steps:
+            self._banked = 0.0
+            steps = self._max_steps
+        return steps
+
+    def reset(self):
+        """
+        Starts counting again from the next call to advance().
+        """
+        self._last = None
+        self._banked = 0.0
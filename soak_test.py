@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Soak test: plays GameApp with random input for a while and fails if memory, widgets or canvas items keep growing.
+
+Memory is sampled with tracemalloc, widgets by walking winfo_children() from the root window, and canvas items with
+find_all() on the dungeon map. The first sample is taken after a warm-up, so caches filling up at the start are not
+counted as growth. Each count fails if the least-squares trend through all its samples adds up to more than its budget
+over the run. Widgets and canvas items also fail if they rose at every one of at least MIN_TREND_SAMPLES samples;
+memory is left to its trend, as it creeps up for a while as Python's allocator settles. Input goes through the same
+handlers as key presses, and dialogs are answered automatically: a finished game always starts a new one.
+
+Without a display it starts a virtual one with Xvfb, if installed:
+
+    python soak_test.py --minutes 10
+    python soak_test.py --minutes 1 --task 1 --level game3.txt --memory-budget 256
+
+The exit status is 0 if every count stayed within its budget and 1 otherwise.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+DISPLAY = ":99"
+MIN_TREND_SAMPLES = 5
+
+# The fields of a Tk key event that GameApp reads.
+KeyEvent = namedtuple("KeyEvent", ["char", "keysym", "time"])
+
+
+def start_virtual_display():
+    """
+    Starts Xvfb on DISPLAY if there is no display.
+
+    Returns:
+        subprocess.Popen: The Xvfb process, or None if a display was already available.
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    if shutil.which("Xvfb") is None:
+        sys.exit("No display, and Xvfb is not installed to provide one")
+    xvfb = subprocess.Popen(["Xvfb", DISPLAY, "-screen", "0", "1280x1024x24"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = DISPLAY
+    time.sleep(1)
+    return xvfb
+
+
+def count_widgets(widget) -> int:
+    """
+    Returns the number of widgets in a window, including the window itself.
+
+    Parameters:
+        widget: A tkinter widget.
+    """
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+class Soak:
+    """
+    Drives a GameApp with random input and records samples of its memory use, widgets and canvas items.
+    """
+
+    def __init__(self, app, master, seconds, sample_every, input_every, warmup, seed=0, fog=False):
+        """
+        Constructor of the Soak class.
+
+        Parameters:
+            app(GameApp): The game to drive.
+            master(tk.Tk): The root window.
+            seconds(float): How long to play for.
+            sample_every(float): Seconds between samples.
+            input_every(int): Milliseconds between inputs.
+            warmup(float): Seconds played before the first sample.
+            seed(int): The seed of the random input.
+            fog(bool): True to also switch the fog of war on and off, which only the images mode has.
+        """
+        self._app = app
+        self._master = master
+        self._sample_every = sample_every
+        self._input_every = input_every
+        self._random = random.Random(seed)
+        self._fog = fog
+        self._stamp = 0
+        self._started = time.perf_counter()
+        self._ends = self._started + seconds
+        self._next_sample = self._started + warmup
+        self.samples = []
+
+    def run(self):
+        """
+        Plays until the time is up.
+        """
+        self._master.after(self._input_every, self.step)
+        self._master.mainloop()
+
+    def step(self):
+        """
+        Gives the game one random input and takes a sample when one is due.
+        """
+        now = time.perf_counter()
+        if now >= self._next_sample:
+            self.sample(now)
+            self._next_sample += self._sample_every
+        if now >= self._ends:
+            self._master.quit()
+            return
+
+        app = self._app
+        choice = self._random.random()
+        if choice < 0.85:
+            key = self._random.choice("wasd")
+            self._stamp += self._input_every
+            app.on_key_press(KeyEvent(key, key, self._stamp))
+            app.on_key_release(KeyEvent(key, key, self._stamp + 1))
+        elif choice < 0.9:
+            app.undo()
+        elif choice < 0.93:
+            app.redo()
+        elif choice < 0.95 and self._fog:
+            app.toggle_fog()
+        elif choice < 0.97:
+            size = self._random.randint(300, 900)
+            self._master.geometry("%dx%d" % (size + 250, size + 200))
+        elif choice < 0.98:
+            app.newgame()
+        self._master.after(self._input_every, self.step)
+
+    def sample(self, now):
+        """
+        Records the memory in use, the number of widgets and the number of items on the dungeon map.
+
+        Parameters:
+            now(float): time.perf_counter() of the sample.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        sample = (now - self._started, current, count_widgets(self._master), len(self._app.Dungeon.find_all()))
+        self.samples.append(sample)
+        print("%7.1fs  memory %8.1f KiB  widgets %5d  canvas items %6d" % (sample[0], sample[1] / 1024,
+                                                                           sample[2], sample[3]), flush=True)
+
+
+def trend(samples, index) -> float:
+    """
+    Returns the least-squares slope of one count over time.
+
+    Parameters:
+        samples(list<tuple>): The (time, memory, widgets, canvas items) samples.
+        index(int): The position of the count in a sample.
+
+    Returns:
+        float: How much the count grows per second.
+    """
+    times = [sample[0] for sample in samples]
+    values = [sample[index] for sample in samples]
+    mean_time = sum(times) / len(times)
+    mean_value = sum(values) / len(values)
+    spread = sum((t - mean_time) ** 2 for t in times)
+    if not spread:
+        return 0.0
+    return sum((t - mean_time) * (v - mean_value) for t, v in zip(times, values)) / spread
+
+
+def check(samples, memory_budget, widget_budget, item_budget) -> list:
+    """
+    Checks every count for steady growth across the samples.
+
+    Parameters:
+        samples(list<tuple>): The (time, memory, widgets, canvas items) samples.
+        memory_budget(float): The most memory, in KiB, that may be added.
+        widget_budget(int): The most widgets that may be added.
+        item_budget(int): The most canvas items that may be added.
+
+    Returns:
+        list<str>: A description of each budget that was exceeded.
+    """
+    if len(samples) < 2:
+        return ["Not enough samples; play for longer or sample more often"]
+    duration = samples[-1][0] - samples[0][0]
+    failures = []
+    counts = (("memory (KiB)", 1, memory_budget, 1024, False), ("widgets", 2, widget_budget, 1, True),
+              ("canvas items", 3, item_budget, 1, True))
+    for name, index, budget, scale, steady in counts:
+        growth = trend(samples, index) * duration / scale
+        if growth > budget:
+            failures.append("%s grew by %g over the run, more than the budget of %g" % (name, growth, budget))
+        elif (steady and len(samples) >= MIN_TREND_SAMPLES
+              and all(a[index] < b[index] for a, b in zip(samples, samples[1:]))):
+            failures.append("%s grew at every one of %d samples" % (name, len(samples)))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the Key Cave Adventure GUI for leaks.")
+    parser.add_argument("--minutes", type=float, default=5.0, help="how long to play")
+    parser.add_argument("--task", type=int, choices=(1, 2), default=2, help="1 for rectangles, 2 for images")
+    parser.add_argument("--level", default="game2.txt")
+    parser.add_argument("--sample-every", type=float, default=10.0, help="seconds between samples")
+    parser.add_argument("--input-every", type=int, default=20, help="milliseconds between inputs")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds played before the first sample")
+    parser.add_argument("--memory-budget", type=float, default=1024.0, help="KiB of memory growth allowed")
+    parser.add_argument("--widget-budget", type=int, default=0, help="widgets that may be added")
+    parser.add_argument("--item-budget", type=int, default=200, help="canvas items that may be added")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    xvfb = start_virtual_display()
+    try:
+        import tkinter as tk
+        import tkinter.messagebox
+        import a3
+
+        # Answer every dialog: play again after a game ends, and never block on an information box.
+        tkinter.messagebox.askyesno = lambda *a, **k: True
+        tkinter.messagebox.showinfo = lambda *a, **k: None
+
+        tracemalloc.start()
+        with tempfile.TemporaryDirectory() as scores_dir:
+            master = tk.Tk()
+            master.title("Key Cave Adventure Game (soak test)")
+            app = a3.GameApp(master, args.task, args.level, scores_file=os.path.join(scores_dir, "scores.db"))
+            # The rectangles mode quits after every game; keep playing instead.
+            app.quit = lambda event=0: app.newgame()
+            app.play()
+            soak = Soak(app, master, args.minutes * 60, args.sample_every, args.input_every, args.warmup, args.seed,
+                        fog=args.task == a3.TASK_TWO)
+            soak.run()
+            app.close()
+            master.destroy()
+        tracemalloc.stop()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    failures = check(soak.samples, args.memory_budget, args.widget_budget, args.item_budget)
+    for failure in failures:
+        print("FAIL: " + failure)
+    if not failures:
+        print("OK")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
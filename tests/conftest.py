@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def in_root(monkeypatch):
+    """
+    Runs every test from the repository root, where the level files are.
+    """
+    monkeypatch.chdir(ROOT)
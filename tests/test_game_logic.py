@@ -0,0 +1,103 @@
+from a2_support import *
+from game_logic import CAUGHT, GameLogic, Key, LifeLost, Lost
+from levels import DungeonGrid, Level, get_level
+
+
+def test_dungeon_accessors_show_removed_items():
+    game = GameLogic("game1.txt")
+    assert game.get_level() is get_level("game1.txt")
+    assert game.get_rows() == ["".join(row) for row in load_game("game1.txt")]
+    assert game.get_char((-1, 0)) is None
+    key = game.get_positions(KEY)[0]
+    assert game.get_char(key) == KEY
+    game.get_player().set_position((key[0], key[1] - 1))
+    game.play_move("D")
+    assert game.get_char(key) == SPACE
+    assert game.get_removed() == frozenset([key])
+    assert game.get_rows()[key[0]][key[1]] == SPACE
+    assert key not in game.get_game_information()
+
+
+def custom_game(rows, moves, lives):
+    return GameLogic("custom", lives, dungeon=DungeonGrid(Level(rows)), moves=moves)
+
+
+def test_lost_life_restores_the_checkpoint():
+    game = GameLogic("game1.txt", lives=2)
+    lives_lost = []
+    game.subscribe(LifeLost, lives_lost.append)
+    for direction in "DDW":
+        game.play_move(direction)
+    assert game.get_player().get_position() == (1, 3)
+    for _ in range(4):
+        game.play_move("A")
+    assert lives_lost == [LifeLost(1)]
+    assert game.get_player().get_position() == (1, 3)
+    assert game.get_player().moves_remaining() == 4
+    assert [type(item) for item in game.get_player().get_inventory()] == [Key]
+    assert not game.check_game_over()
+
+
+def test_last_life_ends_the_game():
+    game = GameLogic("game1.txt", lives=2)
+    lost = []
+    game.subscribe(Lost, lost.append)
+    for _ in range(14):
+        game.play_move("A")
+    assert game.get_lives() == 1
+    assert lost == [Lost()]
+    assert game.check_game_over()
+
+
+def test_unwinnable_pickup_is_not_a_checkpoint():
+    rows = ["#######",
+            "#O   M#",
+            "# #####",
+            "#K    #",
+            "#D    #",
+            "#     #",
+            "#######"]
+    game = custom_game(rows, 5, 2)
+    for _ in range(4):
+        game.play_move("D")
+    assert game.get_player().moves_remaining() == 6
+    while game.get_lives() == 2:
+        game.play_move("W")
+    assert game.get_player().get_position() == (1, 1)
+    assert game.get_player().moves_remaining() == 5
+    assert game.get_char((1, 5)) == MOVE_INCREASE
+
+    game = custom_game(rows, 6, 2)
+    for _ in range(4):
+        game.play_move("D")
+    while game.get_lives() == 2:
+        game.play_move("W")
+    assert game.get_player().get_position() == (1, 5)
+    assert game.get_player().moves_remaining() == 7
+
+
+def test_caught_costs_a_life_or_the_game():
+    rows = ["#####",
+            "#OE #",
+            "#K D#",
+            "#   #",
+            "#####"]
+    game = custom_game(rows, 10, 2)
+    game.play_move("D")
+    assert game.get_lives() == 1
+    assert game.get_player().get_position() == (1, 1)
+    assert game.pop_messages() == [CAUGHT]
+
+    game = custom_game(rows, 10, 1)
+    game.play_move("D")
+    assert game.check_game_over()
+    assert game.get_player().moves_remaining() == 0
+
+
+def test_moves_to_finish():
+    level = get_level("game1.txt")
+    assert level.moves_to_finish((2, 1), False) == 6
+    assert level.moves_to_finish((1, 3), True) == 3
+    assert level.moves_to_finish((3, 2), True) == 0
+    assert level.moves_to_finish((0, 0), True) is None
+    assert Level(["#O#", "###", "#D#"]).moves_to_finish((0, 1), True) is None
@@ -0,0 +1,38 @@
+import random
+
+from level_editor import DistanceField, LevelEditor
+
+SIZE = 12
+
+
+def distances(field):
+    return {(row, col): field.get((row, col)) for row in range(SIZE) for col in range(SIZE)}
+
+
+def test_incremental_updates_match_a_rebuild():
+    rng = random.Random(30)
+    for trial in range(20):
+        open_cells = {(row, col) for row in range(SIZE) for col in range(SIZE) if rng.random() < 0.7}
+        source = (rng.randrange(SIZE), rng.randrange(SIZE))
+        open_cells.add(source)
+        is_open = open_cells.__contains__
+        field = DistanceField(SIZE, is_open, source)
+        for edit in range(60):
+            cell = source if edit % 20 == 19 else (rng.randrange(SIZE), rng.randrange(SIZE))
+            if cell in open_cells:
+                open_cells.discard(cell)
+                field.closed(cell)
+            else:
+                open_cells.add(cell)
+                field.opened(cell)
+            assert distances(field) == distances(DistanceField(SIZE, is_open, source)), (trial, edit, cell)
+
+
+def test_min_moves():
+    rows = ["#####",
+            "#O K#",
+            "# # #",
+            "#  D#",
+            "#####"]
+    editor = LevelEditor(rows)
+    assert editor.min_moves() == 4
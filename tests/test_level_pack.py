@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from a2_support import GAME_LEVELS, load_game
+from level_pack import LevelPack, pack_files, write_pack
+
+LEVELS = ["game1.txt", "game2.txt", "game3.txt"]
+
+
+@pytest.fixture
+def pack(tmp_path):
+    path = str(tmp_path / "levels.klp")
+    assert write_pack(path, pack_files(LEVELS)) == len(LEVELS)
+    with LevelPack(path) as pack:
+        yield pack
+
+
+def test_levels_round_trip(pack):
+    assert len(pack) == len(LEVELS)
+    for i, name in enumerate(LEVELS):
+        assert pack.load_game(name) == load_game(name)
+        assert pack.load_game(i) == load_game(name)
+        info = pack.get_info(i)
+        assert (info.name, info.moves) == (name, GAME_LEVELS[name])
+        assert pack.index_of(name) == i
+
+
+def test_new_game(pack):
+    game = pack.new_game("game2.txt")
+    assert game.get_player().moves_remaining() == GAME_LEVELS["game2.txt"]
+    assert game.get_dungeon_size() == len(load_game("game2.txt"))
+
+
+def test_missing_levels(pack):
+    with pytest.raises(KeyError):
+        pack.index_of("game4.txt")
+    with pytest.raises(KeyError):
+        pack.index_of("g" * 40)
+    with pytest.raises(IndexError):
+        pack.index_of(len(LEVELS))
+
+
+def test_names_are_found_in_any_order(tmp_path):
+    path = str(tmp_path / "many.klp")
+    rows = ["#####", "#O K#", "#  D#", "#####", "#####"]
+    names = ["level%04d" % i for i in range(500)] + ["a", "b", "z"]
+    random.Random(47).shuffle(names)
+    write_pack(path, ((name, rows, 10, 0.5) for name in names))
+    with LevelPack(path) as pack:
+        for i, name in enumerate(names):
+            assert pack.index_of(name) == i
+            assert pack.get_info(i).name == name
+        with pytest.raises(KeyError):
+            pack.index_of("level")
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / "levels.klp"
+    path.write_bytes(b"not a level pack")
+    with pytest.raises(ValueError):
+        LevelPack(str(path))
@@ -0,0 +1,44 @@
+import pathfinding
+from game_logic import GameLogic
+from pathfinding import RouteCache, find_path, search_path
+
+ROWS = ["#######",
+        "#  #  #",
+        "#  #  #",
+        "#     #",
+        "#######"]
+
+
+def is_open(position):
+    row, col = position
+    return 0 <= row < len(ROWS) and 0 <= col < len(ROWS[row]) and ROWS[row][col] != "#"
+
+
+def test_shortest_route():
+    route = find_path((1, 1), (1, 5), is_open)
+    assert len(route) == 8
+    assert route.count("D") == 4
+
+
+def test_unreachable_and_given_up():
+    assert search_path((1, 1), (0, 0), is_open) == (None, True)
+    assert search_path((1, 1), (1, 5), is_open, max_expansions=2) == (None, False)
+    assert search_path((1, 1), (1, 1), is_open) == ([], True)
+
+
+def test_cache_keeps_routes_but_not_searches_that_gave_up(monkeypatch):
+    searches = []
+
+    def counting_search(start, goal, is_open, max_expansions, time_budget):
+        searches.append(goal)
+        if goal == (1, 3):
+            return None, False
+        return search_path(start, goal, is_open, max_expansions, time_budget)
+
+    monkeypatch.setattr(pathfinding, "search_path", counting_search)
+    game = GameLogic("game2.txt")
+    routes = RouteCache(game)
+    start = game.get_player().get_position()
+    for goal in [(1, 3), (1, 3), (0, 0), (0, 0)]:
+        assert routes.route(start, goal) is None
+    assert searches == [(1, 3), (1, 3), (0, 0)]
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from scores import ScoreStore, decode_replay, encode_replay
+
+TIMES = [0.5, 1.0, 1.2, 1.2, 1.7, 2.0, 3.25, 3.25, 3.9, 7.0, 12.5]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScoreStore(str(tmp_path / "scores.db"), batch_size=4)
+    for time in TIMES:
+        store.record("game1.txt", time, 5, "D100")
+    store.record("game2.txt", 0.1, 3)
+    store.flush()
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize("time", [0.0, 0.5, 1.0, 1.1, 1.2, 1.9, 2.0, 3.25, 3.5, 7.0, 12.5, 20.0])
+def test_rank_and_percentile_count_the_runs_around_a_time(store, time):
+    faster = sum(t < time for t in TIMES)
+    slower = sum(t > time for t in TIMES)
+    assert store.rank("game1.txt", time) == (faster + 1, len(TIMES) + 1)
+    assert store.percentile("game1.txt", time) == pytest.approx(100.0 * slower / len(TIMES))
+
+
+def test_unplayed_level(store):
+    assert store.rank("game3.txt", 4.0) == (1, 1)
+    assert store.percentile("game3.txt", 4.0) == 100.0
+    assert store.best("game3.txt") is None
+
+
+def test_top_and_best(store):
+    assert [run[0] for run in store.top("game1.txt", 3)] == [0.5, 1.0, 1.2]
+    assert store.best("game2.txt") == (0.1, 3, None)
+
+
+def test_replay_round_trip():
+    moves = [(random.Random(i).choice("WASD"), i * 0.25) for i in range(20)]
+    assert list(decode_replay(encode_replay(moves))) == moves
@@ -0,0 +1,78 @@
+import asyncio
+
+from server import GameClient, GameServer, GameSession
+
+
+def play(commands, dungeon_name="game1.txt"):
+    """
+    Starts a server on a free port, sends commands from a client and returns the replies.
+    """
+    async def run():
+        server = GameServer(port=0, dungeon_name=dungeon_name)
+        await server.start()
+        try:
+            client, frame = await GameClient.connect(port=server.get_port())
+            replies = [frame]
+            for command in commands:
+                replies.append(await client.send(command))
+            await client.close()
+            return replies
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_initial_frame():
+    frame = play([])[0]
+    assert frame[0] == "SIZE 5"
+    assert frame[3] == "ROW 2 #O..#"
+    assert frame[-1] == "MOVES 7"
+
+
+def test_moves_send_changed_cells():
+    reply = play(["D"])[1]
+    assert reply == ["CELL 2 1 .", "CELL 2 2 O", "MOVES 6"]
+
+
+def test_blocked_move():
+    reply = play(["A"])[1]
+    assert reply == ["INVALID", "MOVES 6"]
+
+
+def test_investigate_and_help():
+    investigate, help_reply = play(["I A", "H"])[1:]
+    assert investigate == ["MSG Wall('#') is on the A side.", "MOVES 6"]
+    assert help_reply[0].startswith("MSG Here is a list of valid actions")
+
+
+def test_bad_input():
+    assert play(["X"])[1] == ["MSG That's invalid."]
+    assert play(["I X"])[1] == ["MSG That's invalid."]
+
+
+def test_win_and_new_game():
+    replies = play(["D", "D", "W", "S", "S", "A", "NEW"])
+    assert replies[-2][-1] == "WIN"
+    assert replies[-1][-1] == "MOVES 7"
+
+
+def test_unknown_level_keeps_the_current_one():
+    replies = play(["NEW bogus", "NEW"])
+    assert replies[1] == ["MSG Unknown level bogus"]
+    assert replies[2][0] == "SIZE 5"
+
+
+def test_quit():
+    assert play(["Q"])[1] == []
+
+
+def test_over_long_line_is_refused():
+    assert play(["W" * 100000])[1] == ["ERROR Request line too long"]
+
+
+def test_session_without_network():
+    session = GameSession("game2.txt")
+    assert session.cell(session.get_game().get_player().get_position()) == "O"
+    assert session.cell((1, 6)) == "K"
+    assert session.handle("NEW game3.txt")[0] == "SIZE 12"
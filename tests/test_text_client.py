@@ -0,0 +1,45 @@
+import io
+import random
+
+import pytest
+
+from text_client import TextClient, read_commands
+
+COMMANDS = ["W", "A", "S", "D", "w", "d", "I W", "I D", "i s", "H", "", "X", "I", "D D"]
+
+
+def session(seed, length=3000):
+    rng = random.Random(seed)
+    return [rng.choice(COMMANDS) for _ in range(length)]
+
+
+def run(lines, dungeon_name="game2.txt", **kwargs):
+    client = TextClient(dungeon_name, **kwargs)
+    out = io.StringIO()
+    client.run(lines, out)
+    return out.getvalue(), (client.commands, client.games, client.wins)
+
+
+@pytest.mark.parametrize("quiet", [False, True])
+def test_remembered_results_match_playing_every_command(quiet):
+    for seed in range(3):
+        lines = session(seed)
+        assert run(lines, quiet=quiet) == run(lines, quiet=quiet, cache_size=0)
+        assert run(lines, quiet=quiet, cache_size=7) == run(lines, quiet=quiet, cache_size=0)
+
+
+def test_games_end_and_restart():
+    opening = TextClient("game1.txt").opening()
+    text, counts = run(["D", "D", "W", "S", "S", "A"] * 3 + ["A"] * 7, "game1.txt")
+    assert counts == (25, 4, 3)
+    assert text.startswith(opening)
+    assert text.count(opening) == 5
+
+
+def test_quit_stops_the_session():
+    assert run(["D", "Q", "D"])[1] == (1, 0, 0)
+
+
+def test_read_commands_splits_across_chunks():
+    stream = io.BytesIO(b"W\nA\r\nI D\n\nS")
+    assert [line.rstrip("\r") for line in read_commands(stream, chunk_size=3)] == ["W", "A", "I D", "", "S"]
@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+A text client that plays Key Cave from a stream of commands, for scripted sessions and regression corpora.
+
+Commands are the VALID_ACTIONS of the text game, one per line: W, A, S or D moves, "I <direction>" investigates,
+H shows the help message and Q quits. Blank lines are skipped. After every command the dungeon and the moves left
+are shown as the text game's Display shows them, and when a game is won or lost the next command starts a new game of the same level, so
+one stream can hold many games. Quiet mode only writes how each game ended.
+
+Input is read in large chunks, the text of each command is built as one string and all output goes through one
+buffered writer. On top of that the game is deterministic, so the result of a command in a given state of the game,
+and the text it prints, is remembered; corpora replaying the same openings over and over mostly just look up what
+happens next:
+
+    python text_client.py game2.txt < session.txt
+    python text_client.py game3.txt --input corpus.txt --output results.txt --quiet
+"""
+
+import argparse
+import sys
+import time
+
+from a2_support import *
+from game_logic import GameLogic, ItemPicked, Restored
+
+CHUNK_SIZE = 1 << 20
+OUTPUT_BUFFER = 1 << 20
+ENCODING = "utf-8"
+TRANSITION_CACHE_SIZE = 100000
+
+# How a command ended the game.
+PLAYING, LOST, WON = 0, 1, 2
+
+
+def read_commands(stream, chunk_size=CHUNK_SIZE):
+    """
+    Reads the lines of a binary stream a chunk at a time.
+
+    Parameters:
+        stream: A binary file, e.g. sys.stdin.buffer.
+        chunk_size(int): The number of bytes read at once.
+
+    Returns:
+        generator<str>: The lines, without their line endings.
+    """
+    partial = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk = partial + chunk
+        end = chunk.rfind(b"\n") + 1
+        partial = chunk[end:]
+        if end:
+            yield from chunk[:end - 1].decode(ENCODING, "replace").split("\n")
+    if partial:
+        yield partial.decode(ENCODING, "replace")
+
+
+class TextClient:
+    """
+    TextClient applies text commands to a GameLogic and returns what the text game prints for each of them.
+
+    The result of a command is remembered by (GameState, command line). That pair decides the result because the
+    text game is played with one life, so the checkpoint is never used, the game clock never ticks, so enemies stay
+    where they started, and the messages of a command are all collected before the next one. A client playing with
+    more lives or moving enemies would have to add them to the key.
+    """
+
+    def __init__(self, dungeon_name="game1.txt", quiet=False, cache_size=TRANSITION_CACHE_SIZE):
+        """
+        Constructor of the TextClient class. A game of the level starts straight away.
+
+        Parameters:
+            dungeon_name(str): The name of the level to play.
+            quiet(bool): True to only print how each game ended.
+            cache_size(int): The most (state, command) results remembered, 0 to remember none.
+        """
+        self._game = GameLogic(dungeon_name)
+        self._start = self._game.snapshot()
+        # The state the client is in, and the state the game was last left in; they differ after remembered results.
+        self._state = self._start
+        self._played = self._start
+        self._quiet = quiet
+        self._cache_size = cache_size
+        self._transitions = {}
+        self._boards = {}
+        self._board = None
+        self._game.subscribe(ItemPicked, self._items_changed)
+        self._game.subscribe(Restored, self._items_changed)
+        self.commands = 0
+        self.games = 0
+        self.wins = 0
+
+    def opening(self) -> str:
+        """
+        Returns:
+            str: The text printed when the first game starts.
+        """
+        return self._show()
+
+    def handle(self, line):
+        """
+        Applies one command.
+
+        Parameters:
+            line(str): The command.
+
+        Returns:
+            str: The text the command prints, or None once the command is Q.
+        """
+        key = (self._state, line)
+        transition = self._transitions.get(key)
+        if transition is None:
+            if line.strip().upper() == QUIT:
+                return None
+            transition = self._play(line)
+            if self._cache_size:
+                if len(self._transitions) >= self._cache_size:
+                    self._transitions.pop(next(iter(self._transitions)))
+                self._transitions[key] = transition
+        self._state, text, counted, outcome = transition
+        self.commands += counted
+        if outcome != PLAYING:
+            self.games += 1
+            self.wins += outcome == WON
+        return text
+
+    def run(self, lines, out):
+        """
+        Applies commands until they run out or one of them is Q.
+
+        Parameters:
+            lines(iterable<str>): The commands, e.g. from read_commands().
+            out: The text file to write to.
+        """
+        handle = self.handle
+        write = out.write
+        write(self.opening())
+        for line in lines:
+            text = handle(line)
+            if text is None:
+                break
+            if text:
+                write(text)
+
+    def _play(self, line) -> tuple:
+        """
+        Plays a command on the game and builds the text it prints.
+
+        Parameters:
+            line(str): The command.
+
+        Returns:
+            tuple<GameState, str, int, int>: The state of the game afterwards, the text printed, 1 if the line was a
+                command and 0 if it was blank, and PLAYING, LOST or WON.
+        """
+        parts = line.strip().upper().split()
+        if not parts:
+            return self._state, "", 0, PLAYING
+        game = self._game
+        if self._state is not self._played:
+            game.restore(self._state)
+        text = []
+        outcome = PLAYING
+        action = parts[0]
+        if action == HELP and len(parts) == 1:
+            self._say(text, HELP_MESSAGE)
+        elif action == INVESTIGATE and len(parts) == 2 and parts[1] in DIRECTIONS:
+            entity = game.investigate(parts[1])
+            self._say(text, str(entity) + " is on the " + parts[1] + " side.")
+            outcome = self._after_turn(text)
+        elif action in DIRECTIONS and len(parts) == 1:
+            if not game.play_move(action):
+                self._say(text, INVALID)
+            outcome = self._after_turn(text)
+        else:
+            self._say(text, INVALID)
+        self._played = game.snapshot()
+        return self._played, "".join(text), 1, outcome
+
+    def _after_turn(self, text) -> int:
+        """
+        Adds the messages of a turn and the dungeon to the text, or how the game ended and the start of the next one.
+
+        Parameters:
+            text(list<str>): The text printed by the command so far.
+
+        Returns:
+            int: PLAYING, LOST or WON.
+        """
+        game = self._game
+        for message in game.pop_messages():
+            self._say(text, message)
+        if game.won():
+            outcome, ending = WON, WIN_TEXT
+        elif game.check_game_over():
+            outcome, ending = LOST, LOSE_TEST
+        else:
+            text.append(self._show())
+            return PLAYING
+        text.append(ending + "\n")
+        game.restore(self._start)
+        text.append(self._show())
+        return outcome
+
+    def _show(self) -> str:
+        """
+        Returns the dungeon and the moves left as Display prints them, or nothing in quiet mode.
+        """
+        if self._quiet:
+            return ""
+        player = self._game.get_player()
+        row, col = player.get_position()
+        rows = list(self._get_board())
+        line = rows[row]
+        if line[col] == SPACE:
+            rows[row] = line[:col] + PLAYER + line[col + 1:]
+        return "\n".join(rows) + "\nMoves left: " + str(player.moves_remaining()) + "\n\n"
+
+    def _items_changed(self, event):
+        """
+        Forgets the board being shown once items are picked up or the game is restored.
+        """
+        self._board = None
+
+    def _get_board(self) -> tuple:
+        """
+        Returns the rows of the dungeon without the Player, as Display draws them: only the characters of entities
+        are shown. Boards are remembered for each set of removed items.
+        """
+        if self._board is not None:
+            return self._board
+        removed = self._game.get_removed()
+        board = self._boards.get(removed)
+        if board is None:
+            size = self._game.get_dungeon_size()
+            grid = [[SPACE] * size for _ in range(size)]
+            for (row, col), entity in self._game.get_game_information().items():
+                if 0 <= row < size and 0 <= col < size:
+                    grid[row][col] = entity.get_id()
+            board = tuple("".join(row) for row in grid)
+            if len(self._boards) >= max(1, self._cache_size):
+                self._boards.clear()
+            self._boards[removed] = board
+        self._board = board
+        return board
+
+    def _say(self, text, message):
+        """
+        Adds a message to the text printed, unless in quiet mode.
+
+        Parameters:
+            text(list<str>): The text printed by the command so far.
+            message(str): The message to print.
+        """
+        if not self._quiet:
+            text.append(message + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Key Cave from a stream of text commands.")
+    parser.add_argument("level", nargs="?", default="game1.txt", choices=sorted(GAME_LEVELS))
+    parser.add_argument("--input", help="the file of commands, default standard input")
+    parser.add_argument("--output", help="the file to write to, default standard output")
+    parser.add_argument("--quiet", action="store_true", help="only write how each game ended")
+    args = parser.parse_args()
+
+    source = open(args.input, 'rb') if args.input else sys.stdin.buffer
+    if args.output:
+        out = open(args.output, 'w', buffering=OUTPUT_BUFFER)
+    else:
+        out = open(sys.stdout.fileno(), 'w', buffering=OUTPUT_BUFFER, closefd=False)
+    started = time.perf_counter()
+    with source, out:
+        client = TextClient(args.level, args.quiet)
+        client.run(read_commands(source), out)
+    print("%d commands, %d games, %d won in %.3fs" % (client.commands, client.games, client.wins,
+                                                       time.perf_counter() - started), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Plays bots against levels with the headless rules in game_logic.py, across a pool of processes.
+
+A bot is a function that takes the GameLogic being played and returns a direction from DIRECTIONS. Bots must be
+defined at the top level of a module so the worker processes can find them by name.
+
+The level grids are written once into a block of shared memory. Workers attach to it when they start and read a
+level out of it the first time they play it, so each game handed to a worker is only a few numbers and the grids
+are never pickled:
+
+    python tournament.py --games 500 game1.txt game2.txt game3.txt
+    python tournament.py game3.txt --bots route --workers 8 --games 2000
+
+Prints the win rate and average moves used of every bot on every level, and how many games were played per second.
+"""
+
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool, shared_memory
+
+from a2_support import *
+from game_logic import GameLogic, Key
+from levels import DungeonGrid, Level
+from pathfinding import find_path
+
+GAMES = 100
+ENCODING = "ascii"
+
+# Set in each worker process by _start_worker().
+_worker = {}
+
+
+def random_bot(game):
+    """
+    Moves in a random direction.
+
+    Parameters:
+        game(GameLogic): The game being played.
+
+    Returns:
+        str: A direction from DIRECTIONS.
+    """
+    return random.choice(tuple(DIRECTIONS))
+
+
+def _shortest_route(game, char):
+    """
+    Returns the moves of the shortest route from the Player to the nearest of a character.
+
+    Parameters:
+        game(GameLogic): The game being played.
+        char(str): The character to walk to.
+
+    Returns:
+        list<str>: The directions to move in, or None if there is none to reach.
+    """
+    is_open = lambda position: game.get_char(position) not in (WALL, None)
+    start = game.get_player().get_position()
+    best = None
+    for goal in game.get_positions(char):
+        route = find_path(start, goal, is_open)
+        if route and (best is None or len(route) < len(best)):
+            best = route
+    return best
+
+
+def route_bot(game):
+    """
+    Walks the shortest route to the nearest Key, then to the Door once a Key is held, detouring to the nearest
+    MoveIncrease when the moves left are not enough.
+
+    Parameters:
+        game(GameLogic): The game being played.
+
+    Returns:
+        str: A direction from DIRECTIONS.
+    """
+    player = game.get_player()
+    has_key = any(isinstance(item, Key) for item in player.get_inventory())
+    route = _shortest_route(game, DOOR if has_key else KEY)
+    if route is None or len(route) > player.moves_remaining():
+        route = _shortest_route(game, MOVE_INCREASE) or route
+    return route[0] if route else random_bot(game)
+
+
+BOTS = {"random": random_bot, "route": route_bot}
+
+
+def share_levels(levels):
+    """
+    Copies level grids into a new block of shared memory.
+
+    Parameters:
+        levels(list<tuple<str, Level, int>>): The name, parsed level and move budget of each level.
+
+    Returns:
+        tuple<SharedMemory, list<tuple<str, int, int, int>>>: The block, and the name, offset, length and move
+            budget of each level in it.
+    """
+    payloads = ["\n".join(level.rows).encode(ENCODING) for _, level, _ in levels]
+    block = shared_memory.SharedMemory(create=True, size=max(1, sum(len(payload) for payload in payloads)))
+    index = []
+    offset = 0
+    for (name, _, moves), payload in zip(levels, payloads):
+        block.buf[offset:offset + len(payload)] = payload
+        index.append((name, offset, len(payload), moves))
+        offset += len(payload)
+    return block, index
+
+
+def _start_worker(block_name, index, bots):
+    """
+    Runs once in each worker process: attaches to the shared levels.
+
+    Parameters:
+        block_name(str): The name of the shared memory block.
+        index(list<tuple<str, int, int, int>>): The name, offset, length and move budget of each level.
+        bots(list<callable>): The bots, in the order games refer to them.
+    """
+    _worker["block"] = shared_memory.SharedMemory(name=block_name)
+    _worker["index"] = index
+    _worker["bots"] = bots
+    _worker["levels"] = {}
+
+
+def _worker_level(level_index) -> Level:
+    """
+    Returns a level in a worker, reading it from shared memory the first time it is played.
+
+    Parameters:
+        level_index(int): The position of the level in the index.
+    """
+    level = _worker["levels"].get(level_index)
+    if level is None:
+        _, offset, length, _ = _worker["index"][level_index]
+        rows = bytes(_worker["block"].buf[offset:offset + length]).decode(ENCODING).split("\n")
+        level = _worker["levels"][level_index] = Level(rows)
+    return level
+
+
+def play_game(bot, name, level, moves):
+    """
+    Plays one game of a level with a bot.
+
+    Parameters:
+        bot(callable): Returns the direction to move in, given the GameLogic.
+        name(str): The name of the level.
+        level(Level): The parsed level.
+        moves(int): The moves the Player starts with.
+
+    Returns:
+        tuple<bool, int>: Whether the bot won, and the moves it used.
+    """
+    game = GameLogic(name, dungeon=DungeonGrid(level), moves=moves)
+    used = 0
+    while not game.won() and not game.check_game_over():
+        direction = bot(game)
+        if direction not in DIRECTIONS:
+            raise ValueError("Bot " + bot.__name__ + " returned " + repr(direction) + ", not one of DIRECTIONS")
+        game.play_move(direction)
+        used += 1
+    return game.won(), used
+
+
+def _play(job):
+    """
+    Runs in a worker: plays one game.
+
+    Parameters:
+        job(tuple<int, int, int>): The bot index, level index and random seed of the game.
+
+    Returns:
+        tuple<int, int, bool, int>: The bot index, level index, whether the bot won and the moves used.
+    """
+    bot_index, level_index, seed = job
+    random.seed(seed)
+    name, _, _, moves = _worker["index"][level_index]
+    won, used = play_game(_worker["bots"][bot_index], name, _worker_level(level_index), moves)
+    return bot_index, level_index, won, used
+
+
+def run_tournament(bots, levels, games=GAMES, workers=None, seed=0):
+    """
+    Plays every bot against every level a number of times across a pool of processes.
+
+    Parameters:
+        bots(list<callable>): The bots to play.
+        levels(list<tuple<str, Level, int>>): The name, parsed level and move budget of each level.
+        games(int): The games each bot plays on each level.
+        workers(int): The number of processes, None for one per CPU.
+        seed(int): Seeds the random numbers of the games, so a tournament can be repeated.
+
+    Returns:
+        tuple<dict, float>: The (games, wins, moves used) of each (bot index, level index), and the seconds taken.
+    """
+    block, index = share_levels(levels)
+    jobs = [(b, l, seed * 1000003 + (b * len(levels) + l) * games + g)
+            for b in range(len(bots)) for l in range(len(levels)) for g in range(games)]
+    results = {(b, l): [0, 0, 0] for b in range(len(bots)) for l in range(len(levels))}
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    try:
+        with Pool(workers, _start_worker, (block.name, index, bots)) as pool:
+            chunk = max(1, len(jobs) // (workers * 8))
+            for bot_index, level_index, won, used in pool.imap_unordered(_play, jobs, chunk):
+                result = results[bot_index, level_index]
+                result[0] += 1
+                result[1] += won
+                result[2] += used
+    finally:
+        block.close()
+        block.unlink()
+    return results, time.perf_counter() - started
+
+
+def report(bots, levels, results, seconds) -> str:
+    """
+    Returns a table of the results of a tournament.
+
+    Parameters:
+        bots(list<callable>): The bots that played.
+        levels(list<tuple<str, Level, int>>): The levels played.
+        results(dict): The (games, wins, moves used) of each (bot index, level index), from run_tournament().
+        seconds(float): The time the tournament took.
+    """
+    lines = ["%-12s %-12s %7s %8s %10s" % ("bot", "level", "games", "win rate", "avg moves")]
+    total = 0
+    for (bot_index, level_index), (played, wins, used) in sorted(results.items()):
+        total += played
+        lines.append("%-12s %-12s %7d %7.1f%% %10.2f" % (bots[bot_index].__name__, levels[level_index][0], played,
+                                                           100 * wins / max(1, played), used / max(1, played)))
+    lines.append("%d games in %.2fs: %.0f games/sec" % (total, seconds, total / max(seconds, 1e-9)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bots against Key Cave levels across processes.")
+    parser.add_argument("levels", nargs="*", default=list(GAME_LEVELS), help="level files in GAME_LEVELS")
+    parser.add_argument("--bots", nargs="+", choices=sorted(BOTS), default=sorted(BOTS))
+    parser.add_argument("--games", type=int, default=GAMES, help="games per bot per level")
+    parser.add_argument("--workers", type=int, default=None, help="processes, default one per CPU")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bots = [BOTS[name] for name in args.bots]
+    levels = [(name, Level(load_game(name)), GAME_LEVELS[name]) for name in args.levels]
+    results, seconds = run_tournament(bots, levels, args.games, args.workers, args.seed)
+    print(report(bots, levels, results, seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Tracing of where the game spends its time, exported in the Chrome trace event format.
+
+Modules register the functions worth timing with register(). While tracing is off they are left exactly as they
+are, so tracing costs nothing; enable() swaps in wrappers that record a span for every call into a ring buffer,
+keeping only the most recent spans, and disable() puts the originals back. Blocks inside a function are timed with
+span(), which does nothing while tracing is off.
+
+The spans can be saved as JSON and opened in chrome://tracing or https://ui.perfetto.dev:
+
+    tracing.enable()
+    ...
+    tracing.save("trace.json")
+
+Setting the KEYCAVE_TRACE environment variable to a file name traces a whole run of a3.py.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+TRACE_ENV = "KEYCAVE_TRACE"
+CAPACITY = 100000
+
+_registered = []
+_originals = {}
+_enabled = False
+# The ring buffer of (name, start, end, thread) spans, with times in nanoseconds.
+_spans = deque()
+_NO_SPAN = nullcontext()
+
+
+def register(owner, attribute, name=None):
+    """
+    Registers a function to be timed while tracing is on.
+
+    Parameters:
+        owner: The class or module the function is an attribute of.
+        attribute(str): The name of the function.
+        name(str): The name of its spans, by default "<owner>.<attribute>".
+    """
+    name = name or owner.__name__ + "." + attribute
+    _registered.append((owner, attribute, name))
+    if _enabled:
+        _instrument(owner, attribute, name)
+
+
+def enable(capacity=CAPACITY):
+    """
+    Starts tracing, forgetting any spans already recorded.
+
+    Parameters:
+        capacity(int): The most spans kept; older spans are dropped as new ones are recorded.
+    """
+    global _enabled, _spans
+    _spans = deque(maxlen=capacity)
+    _enabled = True
+    for owner, attribute, name in _registered:
+        _instrument(owner, attribute, name)
+
+
+def disable():
+    """
+    Stops tracing and puts the registered functions back as they were. The spans recorded are kept.
+    """
+    global _enabled
+    _enabled = False
+    for (owner, attribute), original in _originals.items():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    """
+    Returns:
+        bool: True while tracing is on.
+    """
+    return _enabled
+
+
+def span(name):
+    """
+    Returns a context manager that records a span for a block of code while tracing is on.
+
+    Parameters:
+        name(str): The name of the span.
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+class _Span:
+    """
+    Records the time between entering and leaving a with block.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self._name, self._start)
+
+
+def _record(name, start):
+    """
+    Adds a span ending now to the ring buffer.
+
+    Parameters:
+        name(str): The name of the span.
+        start(int): time.perf_counter_ns() when the span started.
+    """
+    _spans.append((name, start, time.perf_counter_ns(), threading.get_ident()))
+
+
+def _instrument(owner, attribute, name):
+    """
+    Replaces a registered function with a wrapper recording a span for every call.
+
+    Parameters:
+        owner: The class or module the function is an attribute of.
+        attribute(str): The name of the function.
+        name(str): The name of its spans.
+    """
+    if (owner, attribute) in _originals:
+        return
+    original = owner.__dict__[attribute]
+
+    @functools.wraps(original)
+    def traced(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            _record(name, start)
+
+    _originals[owner, attribute] = original
+    setattr(owner, attribute, traced)
+
+
+def get_spans() -> list:
+    """
+    Returns:
+        list<tuple<str, int, int, int>>: The name, start and end time in nanoseconds and thread of every span kept,
+            oldest first.
+    """
+    return list(_spans)
+
+
+def to_chrome(spans=None) -> dict:
+    """
+    Converts spans to Chrome trace events.
+
+    Parameters:
+        spans(list<tuple<str, int, int, int>>): The spans to convert, by default every span kept.
+
+    Returns:
+        dict: The trace, ready to be written as JSON.
+    """
+    spans = get_spans() if spans is None else spans
+    pid = os.getpid()
+    events = [{"name": name, "cat": name.split(".")[0], "ph": "X", "ts": start / 1000, "dur": (end - start) / 1000,
+               "pid": pid, "tid": thread} for name, start, end, thread in spans]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def save(path):
+    """
+    Writes the spans kept to a Chrome trace JSON file.
+
+    Parameters:
+        path(str): The file to write.
+    """
+    import json
+
+    with open(path, 'w') as file:
+        json.dump(to_chrome(), file)